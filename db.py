@@ -1,33 +1,17 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, Index
 from sqlalchemy.orm import sessionmaker
 import os
-import importlib.util
 from dotenv import load_dotenv
 
 # Load environment variables ONCE with override=True to ensure our .env file takes precedence
 load_dotenv(override=True)
 
 # Get paths from environment variables
-DESKTOP_APP_PATH = os.getenv("DESKTOP_APP_PATH")
 DB_PATH = os.getenv("DB_PATH")
 
-# Import Base directly from the desktop app
-try:
-    # Import models dynamically from file path
-    desktop_models_path = os.path.join(DESKTOP_APP_PATH, "models.py")
-    if not os.path.exists(desktop_models_path):
-        raise ImportError(f"Models file not found at {desktop_models_path}")
-    
-    spec = importlib.util.spec_from_file_location("desktop_models", desktop_models_path)
-    desktop_models = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(desktop_models)
-    
-    # Use Base directly from the loaded module
-    Base = desktop_models.Base
-    
-except ImportError as e:
-    print(f"Error importing models: {e}")
-    raise
+# Use the Base that models.py loaded from the desktop app, so the desktop models file is
+# executed once and the engine, indexes and mapped classes share one metadata
+from models import Base
 
 # Ensure database directory exists
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
@@ -35,15 +19,59 @@ os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 # Create SQLite database URL with absolute path
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-# Create engine with connection pool
+# Connection pool bounds. Sync endpoints run in the server threadpool, which is sized
+# to POOL_SIZE + MAX_OVERFLOW at startup so a worker thread never waits on checkout.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+
+# Seconds to wait for a pooled connection, and for SQLite's write lock (the same 30
+# seconds the OTP cleanup service waits) before failing with "database is locked"
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Create engine with connection pool. pool_pre_ping/pool_recycle are left off: the
+# database is a local file, so there are no server-side connection drops to detect.
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for FastAPI with SQLite
+    connect_args={
+        "check_same_thread": False,  # Needed for FastAPI with SQLite
+        "timeout": POOL_TIMEOUT
+    },
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Composite indexes for the attendance lookups the API runs on every submission
+# (eligibility, today's status, per-course summaries). The tables belong to the desktop
+# app, so these are only ever added if missing, never altered or dropped.
+ATTENDANCE_INDEXES = {
+    "attendance_logs": [
+        ("ix_attendance_logs_user_course_date", ("user_id", "assigned_course_id", "date")),
+        ("ix_attendance_logs_course_date", ("assigned_course_id", "date")),
+    ],
+    "assigned_course_approvals": [
+        ("ix_assigned_course_approvals_student_course", ("student_id", "assigned_course_id")),
+    ],
+    "schedules": [
+        ("ix_schedules_assigned_course", ("assigned_course_id",)),
+    ],
+}
+
+def ensure_indexes():
+    """Create the API's attendance lookup indexes if the database does not have them yet"""
+    for table_name, indexes in ATTENDANCE_INDEXES.items():
+        table = Base.metadata.tables.get(table_name)
+        if table is None:
+            continue
+        existing = {index.name for index in table.indexes}
+        for name, columns in indexes:
+            if name in existing:
+                continue
+            Index(name, *(table.c[column] for column in columns)).create(bind=engine, checkfirst=True)
+
 # Get database session
 def get_db():
     db = SessionLocal()
@@ -1,22 +1,29 @@
-import traceback
-from fastapi import FastAPI, Depends, Security, HTTPException, File, UploadFile, Form, Body, Header
+import os
+import logging
+from fastapi import FastAPI, Depends, Security, HTTPException, File, UploadFile, Form, Body, Header, BackgroundTasks, Request, Response, Query
 from fastapi.security import HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
 from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
+import anyio.to_thread
 from pydantic import BaseModel, EmailStr
-import base64
 from typing import Optional, Dict, Any, List
 import numpy as np
 import cv2
 import json
+import hashlib
+import orjson
 from starlette.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # Import database components
-from db import get_db, engine
-from models import Base, User, Student, OTP_Request, Program, Section, Course, Assigned_Course, Assigned_Course_Approval, Faculty
+from db import get_db, engine, ensure_indexes, POOL_SIZE, MAX_OVERFLOW
+from models import Base, User, Student, OTP_Request, Program, Section, Course, Assigned_Course, Assigned_Course_Approval
 
 from services.auth.register import (
     register_student, RegisterRequest,
@@ -28,8 +35,16 @@ from services.auth.login import (
     verify_login_otp, LoginOTPVerificationRequest, LoginOTPVerificationResponse
 )
 from services.security.api_key import get_api_key
-from services.face.validator import validate_face_image
+from services.security.rate_limit import (
+    otp_send_limiter, otp_client_limiter, otp_verify_limiter, enforce_rate_limit, limit_by_client
+)
+from services.face.validator import (
+    preload_face_detector, decode_base64_image, downscale_face_image, Base64Image, MAX_FACE_IMAGE_BYTES
+)
+from services.face.pool import start_face_pool, stop_face_pool, validate_face_image_async
+from services.face.face_matcher import warmup_face_model
 from services.otp.service import OTPService
+from services.email.service import EmailService
 from services.otp.cleanup import start_cleanup_service, stop_cleanup_service
 from services.auth.password_reset import (
     validate_forgot_password_email, ForgotPasswordValidationRequest, ForgotPasswordValidationResponse,
@@ -45,41 +60,105 @@ from services.auth.jwt_service import (
 )
 from services.database import db_query
 from services.database.create_db import assign_student_to_section
+from services.database import (
+    attendance_crud, attendance_submission, faculty_attendance_submission,
+    faculty_crud, faculty_course_details, faculty_attendance_crud
+)
+from services.database.dashboard_crud import get_student_dashboard_json, invalidate_student_dashboard
+from services.database.faculty_dashboard_crud import get_faculty_dashboard_json, invalidate_faculty_dashboard
+from services.database.faculty_personal_attendance_crud import get_faculty_personal_attendance_history
+from services.database.faculty_student_status import update_student_enrollment_status
+from services.database.faculty_course_attendance import get_faculty_course_attendance_records
+from services.database.faculty_attendance_update import update_attendance_status_record
 
 #------------------------------------------------------------
 # FastAPI Application Setup
 #------------------------------------------------------------
 
+logger = logging.getLogger("attendanceapp")
+
+# Service loggers propagate to the root logger, so LOG_LEVEL=DEBUG enables their diagnostics
+logging.getLogger().setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
 # Define lifespan context manager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup code
+    # Each step has its own handler, so one failing (e.g. "database is locked" while the
+    # desktop app writes) does not skip the others
+    # Database connection is verified just by creating the app
+    logger.info("Database connection established")
+    
+    # Sync endpoints each hold a pooled session; match the threadpool to the pool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = POOL_SIZE + MAX_OVERFLOW
+    
+    # Add the attendance lookup indexes the API relies on, if the database lacks them
     try:
-        # Database connection is verified just by creating the app
-        print("[OK] Database connection established")
-        
-        # Start OTP cleanup service
-        print("[STARTING] OTP cleanup service...")
+        await run_in_threadpool(ensure_indexes)
+    except Exception as e:
+        logger.warning("Could not create attendance indexes; queries will run without them: %s", e)
+    
+    # Start OTP cleanup service
+    try:
+        logger.info("Starting OTP cleanup service...")
         cleanup_task = await start_cleanup_service()
-        print("[OK] OTP cleanup service started (runs every 15 minutes)")
-        
+        logger.info("OTP cleanup service started (runs every 15 minutes)")
+    except Exception as e:
+        logger.exception("OTP cleanup service failed to start: %s", e)
+    
+    # Start face validation worker processes; without them validation runs in the threadpool
+    try:
+        await start_face_pool()
     except Exception as e:
-        print(f"Database initialization error: {e}")
-        traceback.print_exc()
+        logger.exception("Face validation pool failed to start; validating in-process: %s", e)
     
-    print("[OK] AttendanceApp API is ready to accept requests")
+    # Warm up the in-process detectors and the face_recognition models used for matching
+    try:
+        await run_in_threadpool(preload_face_detector)
+        await run_in_threadpool(warmup_face_model)
+    except Exception as e:
+        logger.warning("Face model warm-up failed; the first submissions will load them: %s", e)
+    
+    logger.info("AttendanceApp API is ready to accept requests")
     yield
     
     # Cleanup code (when shutting down)
-    print("[SHUTDOWN] Shutting down API...")
+    logger.info("Shutting down API...")
     try:
-        print("[CLEANUP] Stopping OTP cleanup service...")
+        logger.info("Stopping OTP cleanup service...")
         await stop_cleanup_service()
-        print("[OK] OTP cleanup service stopped")
+        logger.info("OTP cleanup service stopped")
     except Exception as e:
-        print(f"Error stopping cleanup service: {e}")
+        logger.error("Error stopping cleanup service: %s", e)
+    
+    await stop_face_pool()
+    
+    logger.info("API shutdown complete")
+
+class ORJSONRoute(APIRoute):
+    """
+    Route that parses JSON request bodies with orjson.
     
-    print("[DONE] API shutdown complete")
+    FastAPI reads the body through request.json(), which reuses request._json when it is
+    already set, so pre-filling it swaps the parser without touching the handlers. The
+    attendance and registration bodies carry large base64 face images.
+    """
+    def get_route_handler(self):
+        original_route_handler = super().get_route_handler()
+        
+        async def orjson_route_handler(request: Request):
+            content_type = request.headers.get("content-type", "")
+            if "json" in content_type:
+                body = await request.body()
+                if body:
+                    try:
+                        request._json = orjson.loads(body)
+                    except orjson.JSONDecodeError:
+                        # Leave it to FastAPI's own parser to report the error
+                        pass
+            return await original_route_handler(request)
+        
+        return orjson_route_handler
 
 # Create FastAPI app
 app = FastAPI(
@@ -87,7 +166,10 @@ app = FastAPI(
     description="API for the AttendanceApp attendance tracking system",
     version="0.1.0",
     lifespan=lifespan,
+    # orjson serializes the large course/attendance payloads much faster than json.dumps
+    default_response_class=ORJSONResponse,
 )
+app.router.route_class = ORJSONRoute
 
 # Add CORS middleware to allow cross-origin requests
 app.add_middleware(
@@ -103,6 +185,9 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Compress larger responses (course and attendance lists repeat the same names and statuses)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 #------------------------------------------------------------
 # Exception Handlers
 #------------------------------------------------------------
@@ -117,6 +202,8 @@ async def http_exception_handler(request, exc):
             "message": exc.detail,
             "code": exc.status_code
         },
+        # Keep headers such as Retry-After and WWW-Authenticate
+        headers=getattr(exc, "headers", None),
     )
 
 @app.exception_handler(RequestValidationError)
@@ -135,10 +222,12 @@ async def validation_exception_handler(request, exc):
 #------------------------------------------------------------
 # Data Models
 #------------------------------------------------------------
+# Handlers with a response_model return plain dicts: FastAPI validates the return value
+# against the model, so building the model in the handler would validate it twice.
 
 # Face image validation model
 class FaceValidationRequest(BaseModel):
-    face_image: str  # Base64 encoded image
+    face_image: Base64Image  # Base64 encoded image, decoded to bytes
 
 class FaceValidationResponse(BaseModel):
     is_valid: bool
@@ -148,7 +237,7 @@ class FaceValidationResponse(BaseModel):
 class InitRegistrationRequest(BaseModel):
     """Initial registration request with face validation"""
     registration_data: RegisterRequest
-    face_image: Optional[str] = None  # Base64 encoded image
+    face_image: Optional[Base64Image] = None  # Base64 encoded image, decoded to bytes
 
 class OTPVerificationRequest(BaseModel):
     """OTP verification request"""
@@ -164,7 +253,7 @@ class OTPResponse(BaseModel):
 # Face validation for registration
 class RegistrationFaceValidationRequest(BaseModel):
     """Request model for validating face during registration"""
-    face_image: str  # Base64 encoded image
+    face_image: Base64Image  # Base64 encoded image, decoded to bytes
 
 # Login validation model
 class LoginValidationRequest(BaseModel):
@@ -205,6 +294,222 @@ class SectionAssignmentResponse(BaseModel):
     assigned_courses_count: Optional[int] = None
     approval_records_created: Optional[int] = None
 
+# Shared Response Submodels
+class StudentCoursesStudentInfo(BaseModel):
+    """Student information returned with the student's course list"""
+    user_id: int
+    student_id: int
+    name: str
+    email: str
+    student_number: str
+    current_section_id: Optional[int] = None
+    current_academic_year: Optional[str] = None
+    student_enrollment_year: Optional[int] = None
+    is_graduated: bool = False
+    has_section: bool = False
+
+class StudentAttendanceStudentInfo(BaseModel):
+    """Student information returned with the attendance history"""
+    user_id: int
+    student_id: int
+    name: str
+    email: str
+    student_number: str
+    section_id: Optional[int] = None
+    has_section: bool = False
+
+class CurrentSemesterStudentInfo(BaseModel):
+    """Student information returned with current semester attendance"""
+    user_id: int
+    student_number: Optional[str] = None
+    name: Optional[str] = None
+    section_id: Optional[int] = None
+
+class DashboardStudentInfo(BaseModel):
+    """Student information returned with the student dashboard"""
+    user_id: int
+    name: str
+    email: str
+    student_number: str
+    has_section: bool
+    section_id: Optional[int] = None
+    section_name: Optional[str] = None
+    program_name: Optional[str] = None
+    program_acronym: Optional[str] = None
+    current_academic_year: Optional[str] = None
+    current_semester: Optional[str] = None
+
+class FacultyInfo(BaseModel):
+    """Faculty information shared by the faculty responses"""
+    user_id: Optional[int] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    employee_number: Optional[str] = None
+
+class FacultyCourseFacultyInfo(FacultyInfo):
+    """Faculty information including the faculty record ID"""
+    faculty_id: int
+
+class FacultyPersonalFacultyInfo(FacultyInfo):
+    """Faculty information returned with personal attendance history"""
+    role: str = "Faculty"
+
+class FacultyDashboardFacultyInfo(FacultyInfo):
+    """Faculty information returned with the faculty dashboard"""
+    current_academic_year: Optional[str] = None
+    current_semester: Optional[str] = None
+
+class CourseInfo(BaseModel):
+    """Assigned course information"""
+    assigned_course_id: int
+    course_id: int
+    course_name: str
+    course_code: Optional[str] = None
+    course_description: Optional[str] = None
+    academic_year: Optional[str] = None
+    semester: Optional[str] = None
+    room: Optional[str] = None
+
+class CourseDetailInfo(CourseInfo):
+    """Assigned course information including timestamps"""
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+class CourseStudentsCourseInfo(CourseDetailInfo):
+    """Assigned course information including faculty, section and program"""
+    faculty_id: int
+    faculty_name: str
+    faculty_email: str
+    section_id: int
+    section_name: str
+    program_id: int
+    program_name: str
+    program_acronym: str
+
+class SectionInfo(BaseModel):
+    """Section and program information"""
+    section_id: int
+    section_name: str
+    program_id: int
+    program_name: str
+    program_acronym: str
+
+class CourseStudentsAttendanceSummary(BaseModel):
+    """Attendance statistics across the students of a course"""
+    total_sessions: int
+    students_with_attendance: int
+    average_attendance_percentage: float
+
+class AttendanceHistorySummary(BaseModel):
+    """Overall attendance statistics for an attendance history"""
+    total_sessions: int
+    present_count: int
+    absent_count: int
+    late_count: int
+    attended_sessions: int
+    overall_attendance_percentage: float
+    unique_courses: int
+    unique_academic_years: int
+
+class FacultyAttendanceHistorySummary(AttendanceHistorySummary):
+    """Overall attendance statistics for the faculty attendance history"""
+    unique_students: int
+
+class AttendanceBreakdown(BaseModel):
+    """Attendance counts for a single course, academic year or student"""
+    total_sessions: int
+    present: int
+    absent: int
+    late: int
+    attendance_percentage: float
+
+class CourseAttendanceBreakdown(AttendanceBreakdown):
+    """Attendance counts for a single course"""
+    course_name: str
+    course_code: Optional[str] = None
+    academic_year: Optional[str] = None
+    semester: Optional[str] = None
+
+class FacultyCourseAttendanceBreakdown(CourseAttendanceBreakdown):
+    """Attendance counts for a single course in faculty view"""
+    unique_attendees: int
+
+class FacultyAcademicYearAttendanceBreakdown(AttendanceBreakdown):
+    """Attendance counts for a single academic year in faculty view"""
+    unique_attendees: int
+
+class StudentAttendanceBreakdown(AttendanceBreakdown):
+    """Attendance counts for a single student in faculty view"""
+    user_id: int
+    name: str
+    identifier: str
+    email: str
+
+class SemesterAttendanceSummary(BaseModel):
+    """Attendance statistics for the current semester"""
+    total_sessions: int
+    present_count: int
+    absent_count: int
+    late_count: int
+    attendance_percentage: float
+
+class CourseDetailsAttendanceSummary(BaseModel):
+    """Attendance statistics for faculty course details"""
+    total_records: int
+    total_sessions: int
+    present_count: int
+    late_count: int
+    absent_count: int
+    overall_attendance_rate: float
+
+class CourseAttendanceSummary(BaseModel):
+    """Attendance statistics for faculty course attendance"""
+    total_records: int
+    present_count: int
+    late_count: int
+    absent_count: int
+    attendance_rate: float
+
+class StatusDistribution(BaseModel):
+    """Attendance counts by status"""
+    present: int
+    late: int
+    absent: int
+
+class PersonalAttendanceSummary(BaseModel):
+    """Attendance statistics for faculty personal attendance"""
+    total_records: int
+    present_count: int
+    late_count: int
+    absent_count: int
+    attendance_percentage: float
+    status_distribution: Optional[StatusDistribution] = None
+
+class PersonalCourseSummary(BaseModel):
+    """Per-course attendance summary for faculty personal attendance"""
+    total_courses: int
+    courses: Dict[str, Dict[str, Any]]
+
+class PersonalAcademicYearSummary(BaseModel):
+    """Per-academic-year attendance summary for faculty personal attendance"""
+    total_years: int
+    years: Dict[str, Dict[str, Any]]
+
+class EnrollmentSummary(BaseModel):
+    """Enrollment counts by approval status"""
+    enrolled: int = 0
+    pending: int = 0
+    rejected: int = 0
+    passed: int = 0
+    failed: int = 0
+    total: int = 0
+
+class AvailableFilters(BaseModel):
+    """Available attendance filter values"""
+    years: List[str]
+    months: List[str]
+    days: List[str]
+
 # Student Courses Models
 class StudentCourseInfo(BaseModel):
     """Model for individual course information"""
@@ -236,7 +541,7 @@ class StudentCoursesResponse(BaseModel):
     """Response model for student courses"""
     success: bool
     message: str
-    student_info: Dict[str, Any]
+    student_info: StudentCoursesStudentInfo
     current_courses: List[StudentCourseInfo]
     previous_courses: List[StudentCourseInfo]
     total_current: int
@@ -271,11 +576,12 @@ class CourseStudentsResponse(BaseModel):
     """Response model for course students"""
     success: bool
     message: str
-    course_info: Dict[str, Any]
+    course_info: CourseStudentsCourseInfo
     students: List[CourseStudentInfo]
     total_students: int
+    next_offset: Optional[int] = None
     enrollment_summary: Dict[str, int]
-    attendance_summary: Dict[str, Any]
+    attendance_summary: CourseStudentsAttendanceSummary
 
 # Student Attendance Models
 class StudentAttendanceRecord(BaseModel):
@@ -302,12 +608,13 @@ class StudentAttendanceResponse(BaseModel):
     """Response model for student attendance history"""
     success: bool
     message: str
-    student_info: Dict[str, Any]
+    student_info: StudentAttendanceStudentInfo
     attendance_records: List[StudentAttendanceRecord]
     total_records: int
-    attendance_summary: Dict[str, Any]
-    course_summary: Dict[str, Any]
-    academic_year_summary: Optional[Dict[str, Any]] = None
+    next_cursor: Optional[str] = None
+    attendance_summary: AttendanceHistorySummary
+    course_summary: Dict[str, CourseAttendanceBreakdown]
+    academic_year_summary: Optional[Dict[str, AttendanceBreakdown]] = None
 
 # Current Semester Attendance Models
 class CurrentSemesterAttendanceRecord(BaseModel):
@@ -342,13 +649,13 @@ class CurrentSemesterAttendanceResponse(BaseModel):
     """Response model for current semester attendance"""
     success: bool
     message: str
-    student_info: Dict[str, Any]
+    student_info: CurrentSemesterStudentInfo
     attendance_logs: List[CurrentSemesterAttendanceRecord]
     total_logs: int
     courses: List[CurrentSemesterCourseInfo]
     academic_year: Optional[str] = None
     semester: Optional[str] = None
-    attendance_summary: Dict[str, Any]
+    attendance_summary: SemesterAttendanceSummary
 
 # Dashboard Models
 class DashboardClassInfo(BaseModel):
@@ -391,7 +698,7 @@ class StudentDashboardResponse(BaseModel):
     """Response model for student dashboard"""
     success: bool
     message: str
-    student_info: Dict[str, Any]
+    student_info: DashboardStudentInfo
     current_classes: List[DashboardClassInfo]
     today_schedule: List[DashboardScheduleItem]
     all_schedules: List[DashboardScheduleItem]  # All schedules for calendar filtering
@@ -428,7 +735,7 @@ class FacultyCoursesResponse(BaseModel):
     """Response model for faculty courses endpoint"""
     success: bool
     message: str
-    faculty_info: Dict[str, Any]
+    faculty_info: FacultyCourseFacultyInfo
     current_courses: List[FacultyCourseInfo]
     previous_courses: List[FacultyCourseInfo]
     total_current: int
@@ -474,9 +781,9 @@ class FacultyCourseDetailsResponse(BaseModel):
     """Response model for faculty course details"""
     success: bool
     message: str
-    course_info: Dict[str, Any]
-    section_info: Dict[str, Any]
-    faculty_info: Dict[str, Any]
+    course_info: CourseDetailInfo
+    section_info: SectionInfo
+    faculty_info: FacultyCourseFacultyInfo
     
     # Student enrollment data
     enrolled_students: List[FacultyCourseStudentInfo]
@@ -486,8 +793,8 @@ class FacultyCourseDetailsResponse(BaseModel):
     failed_students: List[FacultyCourseStudentInfo]  # Students who failed the course
     
     # Statistics summary - enrollment statuses: "enrolled", "pending", "rejected", "passed", "failed", "total"
-    enrollment_summary: Dict[str, int]
-    attendance_summary: Dict[str, Any]
+    enrollment_summary: EnrollmentSummary
+    attendance_summary: CourseDetailsAttendanceSummary
     
     # Recent attendance records
     recent_attendance: List[FacultyCourseAttendanceRecord]
@@ -527,13 +834,13 @@ class FacultyAttendanceResponse(BaseModel):
     """Response model for faculty attendance history"""
     success: bool
     message: str
-    faculty_info: Dict[str, Any]
+    faculty_info: FacultyInfo
     attendance_records: List[FacultyAttendanceRecord]
     total_records: int
-    attendance_summary: Dict[str, Any]
-    course_summary: Dict[str, Any]
-    academic_year_summary: Optional[Dict[str, Any]] = None
-    student_summary: Optional[Dict[str, Any]] = None
+    attendance_summary: FacultyAttendanceHistorySummary
+    course_summary: Dict[str, FacultyCourseAttendanceBreakdown]
+    academic_year_summary: Optional[Dict[str, FacultyAcademicYearAttendanceBreakdown]] = None
+    student_summary: Optional[Dict[str, StudentAttendanceBreakdown]] = None
 
 # Faculty Current Semester Attendance Models
 class FacultyCurrentSemesterAttendanceRecord(BaseModel):
@@ -571,13 +878,13 @@ class FacultyCurrentSemesterAttendanceResponse(BaseModel):
     """Response model for faculty current semester attendance"""
     success: bool
     message: str
-    faculty_info: Dict[str, Any]
+    faculty_info: FacultyInfo
     attendance_logs: List[FacultyCurrentSemesterAttendanceRecord]
     total_logs: int
     courses: List[FacultyCurrentSemesterCourseInfo]
     academic_year: Optional[str] = None
     semester: Optional[str] = None
-    attendance_summary: Dict[str, Any]
+    attendance_summary: SemesterAttendanceSummary
 
 # Faculty Course Attendance Models
 class FacultyCourseAttendanceInfo(BaseModel):
@@ -600,16 +907,16 @@ class FacultyCourseAttendanceResponse(BaseModel):
     """Response model for faculty course attendance"""
     success: bool
     message: str
-    course_info: Dict[str, Any]
-    section_info: Dict[str, Any]
-    faculty_info: Dict[str, Any]
+    course_info: CourseInfo
+    section_info: SectionInfo
+    faculty_info: FacultyCourseFacultyInfo
     attendance_records: List[FacultyCourseAttendanceInfo]
     total_records: int
-    attendance_summary: Dict[str, Any]
+    attendance_summary: CourseAttendanceSummary
     academic_year: Optional[str] = None
     semester: Optional[str] = None
     is_current_course: bool
-    available_filters: Dict[str, List[str]]  # Available years, months, days for filtering
+    available_filters: AvailableFilters  # Available years, months, days for filtering
 
 # Faculty Personal Attendance Models
 class FacultyPersonalAttendanceRecord(BaseModel):
@@ -636,12 +943,12 @@ class FacultyPersonalAttendanceResponse(BaseModel):
     """Response model for faculty's personal attendance history"""
     success: bool
     message: str
-    faculty_info: Dict[str, Any]
+    faculty_info: FacultyPersonalFacultyInfo
     attendance_records: List[FacultyPersonalAttendanceRecord]
     total_records: int
-    attendance_summary: Dict[str, Any]
-    course_summary: Dict[str, Any]
-    academic_year_summary: Optional[Dict[str, Any]] = None
+    attendance_summary: PersonalAttendanceSummary
+    course_summary: PersonalCourseSummary
+    academic_year_summary: Optional[PersonalAcademicYearSummary] = None
 
 # Faculty Dashboard Models
 class FacultyDashboardCourseInfo(BaseModel):
@@ -663,6 +970,7 @@ class FacultyDashboardCourseInfo(BaseModel):
     enrolled_students: int
     pending_students: int
     rejected_students: int
+    passed_students: int = 0
 
 class FacultyDashboardScheduleItem(BaseModel):
     """Model for schedule item in faculty dashboard"""
@@ -700,7 +1008,7 @@ class FacultyDashboardResponse(BaseModel):
     """Response model for faculty dashboard"""
     success: bool
     message: str
-    faculty_info: Dict[str, Any]
+    faculty_info: FacultyDashboardFacultyInfo
     current_courses: List[FacultyDashboardCourseInfo]
     previous_courses: List[FacultyDashboardCourseInfo]
     today_schedule: List[FacultyDashboardScheduleItem]
@@ -728,13 +1036,13 @@ def health_check():
 
 # Face validation endpoint
 @app.post("/validate-face", response_model=FaceValidationResponse)
-def validate_face_endpoint(
+async def validate_face_endpoint(
     request: FaceValidationRequest,
     api_key: str = Security(get_api_key)
 ):
     """Validate if the provided image contains a properly visible face"""
     try:
-        is_valid, message = validate_face_image(request.face_image)
+        is_valid, message = await validate_face_image_async(request.face_image)
         return {"is_valid": is_valid, "message": message}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error validating face: {str(e)}")
@@ -765,7 +1073,7 @@ def validate_registration_fields_endpoint(
 
 # Step 1: Validate face image for registration
 @app.post("/registerStudent/validate-face", response_model=FaceValidationResponse)
-def validate_registration_face(
+async def validate_registration_face(
     request: RegistrationFaceValidationRequest,
     api_key: str = Security(get_api_key)
 ):
@@ -778,25 +1086,23 @@ def validate_registration_face(
     Note: Field validation should be done via /registerStudent/validate-fields first
     """
     try:
-        print(f"=== FACE VALIDATION REQUEST DEBUG ===")
-        print(f"Received face validation request for registration")
-        print("====================================")
+        is_valid, message = await validate_face_image_async(request.face_image)
         
-        is_valid, message = validate_face_image(request.face_image)
-        
-        print(f"Face validation result: {is_valid} - {message}")
+        logger.debug("Registration face validation result: %s - %s", is_valid, message)
         
         return {"is_valid": is_valid, "message": message}
     except Exception as e:
-        print(f"Face validation error: {str(e)}")
+        logger.warning("Registration face validation error: %s", e)
         raise HTTPException(status_code=400, detail=f"Error validating face: {str(e)}")
 
 # Step 2: Send OTP for registration
 @app.post("/registerStudent/send-otp", response_model=OTPResponse)
 def send_registration_otp(
     request: InitRegistrationRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
+    api_key: str = Security(get_api_key),
+    rate_limit: None = Depends(limit_by_client(otp_client_limiter, "registration-otp"))
 ):
     """
     Send OTP for registration:
@@ -806,35 +1112,37 @@ def send_registration_otp(
     
     Note: Field and face validation should be completed before this step
     """
+    # Also limit per email, so one address cannot be flooded from many clients
+    enforce_rate_limit(otp_send_limiter, f"registration-otp:email:{request.registration_data.email.lower()}")
+    
     try:
-        print(f"=== SEND OTP REQUEST DEBUG ===")
-        print(f"Sending OTP to: {request.registration_data.email}")
-        print("=============================")
+        logger.debug("Sending registration OTP to %s", request.registration_data.email)
         
-        # Convert registration data to dict for storage
-        reg_dict = request.registration_data.dict()
-        
-        # If face image is provided, include it in registration data
+        # Keep the validated model for storage; a face image sent alongside it replaces its own
+        registration = request.registration_data
         if request.face_image:
-            reg_dict["face_image"] = request.face_image
+            registration = registration.model_copy(update={"face_image": request.face_image})
         
         # Create and send OTP for registration with better error handling
         try:
             success, message, otp_id = OTPService.create_registration_otp(
-                email=request.registration_data.email,
-                first_name=request.registration_data.first_name,
-                registration_data=reg_dict,
-                db=db
+                email=registration.email,
+                first_name=registration.first_name,
+                registration_data=registration,
+                db=db,
+                background_tasks=background_tasks
             )
             
-            print(f"OTP Service result: success={success}, message={message}, otp_id={otp_id}")
+            logger.debug("OTP service result: success=%s, message=%s, otp_id=%s", success, message, otp_id)
             
         except Exception as otp_error:
-            print(f"OTP Service error: {str(otp_error)}")
-            raise HTTPException(status_code=500, detail=f"OTP creation failed: {str(otp_error)}")
+            logger.exception("OTP service error: %s", otp_error)
+            raise HTTPException(status_code=500, detail="Failed to send OTP due to an internal error")
         
         if not success:
-            raise HTTPException(status_code=500, detail=message)
+            # The message can carry raw database or SMTP errors, so it is only logged
+            logger.error("Registration OTP not sent: %s", message)
+            raise HTTPException(status_code=500, detail="Failed to send OTP due to an internal error")
         
         return {
             "success": True,
@@ -843,18 +1151,18 @@ def send_registration_otp(
         }
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Unexpected error in send_registration_otp: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Failed to send OTP: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error in send_registration_otp")
+        raise HTTPException(status_code=500, detail="Failed to send OTP due to an internal error")
 
 # Step 3: Verify OTP and complete registration
 @app.post("/registerStudent/verify", status_code=201)
 def verify_registration(
     request: OTPVerificationRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
+    api_key: str = Security(get_api_key),
+    rate_limit: None = Depends(limit_by_client(otp_verify_limiter, "registration-verify"))
 ):
     """
     Verify OTP and complete the registration process:
@@ -863,9 +1171,7 @@ def verify_registration(
     3. Return the registered student information
     """
     try:
-        print(f"=== VERIFY REGISTRATION DEBUG ===")
-        print(f"Verifying OTP ID: {request.otp_id}, Code: {request.otp_code}")
-        print("================================")
+        logger.debug("Verifying registration OTP ID %s", request.otp_id)
         
         # Verify OTP and get registration data
         is_valid, message_or_data, registration_data = OTPService.verify_otp(
@@ -875,40 +1181,45 @@ def verify_registration(
         )
         
         if not is_valid:
-            print(f"OTP verification failed: {message_or_data}")
+            logger.debug("OTP verification failed: %s", message_or_data)
             raise HTTPException(status_code=400, detail=message_or_data)
         
         if not registration_data:
-            print("No registration data found")
+            logger.debug("No registration data found for OTP ID %s", request.otp_id)
             raise HTTPException(status_code=400, detail="Registration data not found")
         
-        print(f"OTP verified successfully, proceeding with registration")
-        
         # Check if the message_or_data contains user info (already registered case)
         if isinstance(message_or_data, dict) and 'user_id' in message_or_data:
-            print(f"User already registered, returning existing info")
             return {
                 "status": "success",
                 "message": "Registration completed successfully",
                 "user": message_or_data
             }
         
-        # Convert back to RegisterRequest for registration
-        try:
-            register_request = RegisterRequest(**registration_data)
-            print(f"Converted registration data for user: {register_request.email}")
-        except Exception as conversion_error:
-            print(f"Error converting registration data: {conversion_error}")
+        # The RegisterRequest validated when the OTP was sent
+        register_request = registration_data.get("registration")
+        if not isinstance(register_request, RegisterRequest):
+            logger.warning("Unexpected registration data stored for OTP ID %s", request.otp_id)
             raise HTTPException(status_code=400, detail="Invalid registration data format")
         
+        # Fetch the face image stashed apart from the OTP data
+        face_image_key = registration_data.get("face_image_key")
+        if face_image_key:
+            face_image = OTPService.pop_face_image(face_image_key)
+            if face_image is None:
+                if OTPService.face_image_was_evicted(face_image_key):
+                    raise HTTPException(status_code=503, detail="Too many pending registrations to keep your face image. Please register again.")
+                raise HTTPException(status_code=400, detail="Registration face image has expired. Please register again.")
+            register_request = register_request.model_copy(update={"face_image": face_image})
+        
         # Register the student in the main database
         try:
             # Pass is_otp_verified=True since this is after successful OTP verification
             result = register_student(register_request, db, is_otp_verified=True)
-            print(f"Student registered successfully: {result}")
+            logger.info("Registration completed for %s", result["email"])
             
-            # Log successful registration with welcome email sent
-            print(f"🎉 Registration completed for {result['email']} - Welcome email should have been sent")
+            # Send the welcome email after the response instead of holding it on SMTP
+            background_tasks.add_task(EmailService().send_welcome_email, result["email"], register_request.first_name)
             
             # Return the result with the correct structure
             return {
@@ -917,35 +1228,28 @@ def verify_registration(
                 "user": result
             }
                 
+        except HTTPException as reg_error:
+            # Duplicates (409) and bad input (400) keep register_student's status and detail
+            logger.warning("Registration failed: %s", reg_error.detail)
+            raise
         except Exception as reg_error:
-            print(f"Registration failed: {str(reg_error)}")
             # Check if it's a duplicate error
             if "already in use" in str(reg_error).lower():
+                logger.warning("Registration failed: %s", reg_error)
                 raise HTTPException(status_code=409, detail=str(reg_error))
-            else:
-                raise HTTPException(status_code=500, detail=f"Registration failed: {str(reg_error)}")
+            logger.exception("Registration failed: %s", reg_error)
+            raise HTTPException(status_code=500, detail="Registration failed due to an internal error")
             
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Unexpected error in verify_registration: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Registration verification failed: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error in verify_registration")
+        raise HTTPException(status_code=500, detail="Registration verification failed due to an internal error")
 
 
 # Step 3: Verify OTP and complete registration (alternative endpoint name)
-@app.post("/registerStudent/verify-registration", status_code=201)
-def verify_registration_alt(
-    request: OTPVerificationRequest,
-    db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
-):
-    """
-    Alternative endpoint name for OTP verification and registration completion
-    (calls the same logic as /registerStudent/verify)
-    """
-    return verify_registration(request, db, api_key)
+# Served by the same handler as /registerStudent/verify
+app.add_api_route("/registerStudent/verify-registration", verify_registration, methods=["POST"], status_code=201)
 
 #------------------------------------------------------------
 # Legacy/Direct Registration Methods (For Backward Compatibility)
@@ -963,7 +1267,7 @@ def register_student_endpoint(
 
 # Direct registration with face validation endpoint
 @app.post("/register-student-with-face", status_code=201)
-def register_with_face_endpoint(
+async def register_with_face_endpoint(
     registration_data: RegisterRequest,
     db: Session = Depends(get_db),
     api_key: str = Security(get_api_key)
@@ -971,12 +1275,12 @@ def register_with_face_endpoint(
     """Register a student with face validation (legacy method)"""
     # Validate the face image if provided
     if registration_data.face_image:
-        is_valid, message = validate_face_image(registration_data.face_image)
+        is_valid, message = await validate_face_image_async(registration_data.face_image)
         if not is_valid:
             raise HTTPException(status_code=400, detail=message)
     
-    # Process the registration
-    return register_student(registration_data, db)
+    # Process the registration (blocking DB work stays off the event loop)
+    return await run_in_threadpool(register_student, registration_data, db)
 
 #============================================================
 # STUDENT LOGIN ENDPOINTS
@@ -1006,8 +1310,10 @@ def validate_login_fields_endpoint(
 @app.post("/loginStudent/send-login-otp", response_model=LoginOTPResponse)
 def send_login_otp_endpoint(
     request: LoginOTPRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
+    api_key: str = Security(get_api_key),
+    rate_limit: None = Depends(limit_by_client(otp_client_limiter, "login-otp"))
 ):
     """
     Send OTP for login:
@@ -1016,14 +1322,17 @@ def send_login_otp_endpoint(
     3. Generate and send OTP to user's email
     4. Return OTP ID for verification
     """
-    return send_login_otp(request, db)
+    # Also limit per email, so one address cannot be flooded from many clients
+    enforce_rate_limit(otp_send_limiter, f"login-otp:email:{request.email.strip().lower()}")
+    return send_login_otp(request, db, background_tasks)
 
 # Step 3: Verify OTP and finalize login
 @app.post("/loginStudent/verify-login-otp", response_model=LoginOTPVerificationResponse)
 def verify_login_otp_endpoint(
     request: LoginOTPVerificationRequest,
     db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
+    api_key: str = Security(get_api_key),
+    rate_limit: None = Depends(limit_by_client(otp_verify_limiter, "login-verify"))
 ):
     """
     Verify OTP and complete login:
@@ -1063,8 +1372,10 @@ def validate_forgot_password_email_endpoint(
 @app.post("/forgotPassword/send-reset-otp", response_model=ForgotPasswordOTPResponse)
 def send_forgot_password_otp_endpoint(
     request: ForgotPasswordOTPRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
+    api_key: str = Security(get_api_key),
+    rate_limit: None = Depends(limit_by_client(otp_client_limiter, "reset-otp"))
 ):
     """
     Send OTP for password reset:
@@ -1073,14 +1384,17 @@ def send_forgot_password_otp_endpoint(
     3. Generate and send OTP to user's email
     4. Return OTP ID for verification
     """
-    return send_forgot_password_otp(request, db)
+    # Also limit per email, so one address cannot be flooded from many clients
+    enforce_rate_limit(otp_send_limiter, f"reset-otp:email:{request.email.strip().lower()}")
+    return send_forgot_password_otp(request, db, background_tasks)
 
 # Step 3: Verify OTP for password reset
 @app.post("/forgotPassword/verify-otp", response_model=PasswordResetOTPVerificationResponse)
 def verify_password_reset_otp_endpoint(
     request: PasswordResetOTPVerificationRequest,
     db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
+    api_key: str = Security(get_api_key),
+    rate_limit: None = Depends(limit_by_client(otp_verify_limiter, "reset-verify"))
 ):
     """
     Verify OTP for password reset:
@@ -1110,55 +1424,66 @@ def reset_password_endpoint(
 # JWT Helper Dependencies
 #------------------------------------------------------------
 
-# Helper function to create proper JWT dependencies
-def get_jwt_student_dependency():
-    """Create a proper JWT student dependency that works with FastAPI"""
-    def jwt_student_dep(
-        credentials: HTTPAuthorizationCredentials = Depends(JWTService.security),
-        db: Session = Depends(get_db)
-    ) -> Dict[str, Any]:
-        if not credentials:
-            raise HTTPException(status_code=401, detail="Authentication required")
-        
-        user_data = JWTService.get_current_user_from_token(credentials.credentials, db)
-        if not user_data:
-            raise HTTPException(status_code=401, detail="Invalid authentication token")
-        
-        # Check if user is a student
-        if user_data.get("role") != "Student":
-            raise HTTPException(status_code=403, detail="Student access required")
-        
-        # Check if student number exists (confirms it's a student)
-        if not user_data.get("student_number"):
-            raise HTTPException(status_code=403, detail="Student account not found")
-        
-        return user_data
+# JWT dependencies are defined once at import; every endpoint shares the same callables
+def jwt_student_dep(
+    credentials: HTTPAuthorizationCredentials = Depends(JWTService.security),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Authenticate the bearer token and require a student account"""
+    if not credentials:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    
+    user_data = JWTService.get_cached_user_from_token(credentials.credentials, db)
+    if not user_data:
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
+    
+    # Check if user is a student
+    if user_data.get("role") != "Student":
+        raise HTTPException(status_code=403, detail="Student access required")
+    
+    # Check if student number exists (confirms it's a student)
+    if not user_data.get("student_number"):
+        raise HTTPException(status_code=403, detail="Student account not found")
+    
+    return user_data
+
+def jwt_faculty_dep(
+    credentials: HTTPAuthorizationCredentials = Depends(JWTService.security),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Authenticate the bearer token and require a faculty account"""
+    if not credentials:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    
+    user_data = JWTService.get_cached_user_from_token(credentials.credentials, db)
+    if not user_data:
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
     
+    # Check if user is faculty (faculty_id is loaded with the user data)
+    if not user_data.get("faculty_id"):
+        raise HTTPException(status_code=403, detail="Faculty access required")
+    
+    return user_data
+
+def get_jwt_student_dependency():
+    """Return the shared JWT student dependency"""
     return jwt_student_dep
 
-# Helper function to create proper JWT faculty dependency
 def get_jwt_faculty_dependency():
-    """Create a proper JWT faculty dependency"""
-    def jwt_faculty_dep(
-        credentials: HTTPAuthorizationCredentials = Depends(JWTService.security),
-        db: Session = Depends(get_db)
-    ) -> Dict[str, Any]:
-        if not credentials:
-            raise HTTPException(status_code=401, detail="Authentication required")
-        
-        user_data = JWTService.get_current_user_from_token(credentials.credentials, db)
-        if not user_data:
-            raise HTTPException(status_code=401, detail="Invalid authentication token")
-        
-        # Check if user is faculty
-        faculty = db.query(Faculty).filter(Faculty.user_id == user_data["user_id"]).first()
-        if not faculty:
-            raise HTTPException(status_code=403, detail="Faculty access required")
-        
-        return user_data
-    
+    """Return the shared JWT faculty dependency"""
     return jwt_faculty_dep
 
+# HTTP status for a faculty service {"error": ...} result, picked by the first phrase found
+# in the message; anything else is a 500
+FACULTY_READ_ERROR_STATUS_CODES = (("not found", 404), ("permission", 403))
+FACULTY_UPDATE_ERROR_STATUS_CODES = FACULTY_READ_ERROR_STATUS_CODES + (("invalid", 400),)
+
+def raise_service_error(error: str, status_codes=FACULTY_READ_ERROR_STATUS_CODES):
+    """Raise the HTTPException for a service error message"""
+    message = error.lower()
+    status_code = next((code for phrase, code in status_codes if phrase in message), 500)
+    raise HTTPException(status_code=status_code, detail=error)
+
 #============================================================
 # STUDENT ONBOARDING ENDPOINTS
 #============================================================
@@ -1185,37 +1510,41 @@ def check_student_onboarding_status(
     # The current_student is already validated by the dependency
     has_section = current_student.get("has_section", False)
     
-    # Prepare response
-    student_info = {
-        "user_id": current_student["user_id"],
-        "name": current_student["name"],
-        "email": current_student["email"],
-        "student_number": current_student["student_number"],
-        "section_id": current_student.get("section_id"),
-        "has_section": has_section,
-        "verified": current_student.get("verified", 0),
-        "status_id": current_student.get("status_id", 1)
-    }
-    
-    
+    # student_info is precomputed with the cached JWT user data
     if not has_section:
-        return OnboardingCheckResponse(
-            is_onboarded=False,
-            message="Student onboarding incomplete: section not assigned",
-            has_section=False,
-            student_info=student_info
-        )
+        return {
+            "is_onboarded": False,
+            "message": "Student onboarding incomplete: section not assigned",
+            "has_section": False,
+            "student_info": current_student["student_info"]
+        }
     else:
-        return OnboardingCheckResponse(
-        is_onboarded=True,
-        message="Student onboarding complete",
-        has_section=True,
-        student_info=student_info
-    )
+        return {
+            "is_onboarded": True,
+            "message": "Student onboarding complete",
+            "has_section": True,
+            "student_info": current_student["student_info"]
+        }
+
+# Onboarding catalog responses are memoized in db_query; let clients reuse them too.
+# "private" because every response sits behind the student's JWT.
+CATALOG_CACHE_CONTROL = f"private, max-age={db_query.CATALOG_CACHE_TTL_SECONDS}"
+
+def catalog_response(request: Request, response: Response, payload: BaseModel):
+    """Attach Cache-Control/ETag headers, answering 304 when the client's copy is current"""
+    body = json.dumps(payload.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    etag = f'"{hashlib.md5(body.encode()).hexdigest()}"'
+    headers = {"Cache-Control": CATALOG_CACHE_CONTROL, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return payload
 
 # Step 2 : Getting all the available programs where isDeleted = 0
 @app.get("/student/onboarding/programs", response_model=AvailableProgramsResponse)
 def get_available_programs(
+    request: Request,
+    response: Response,
     current_student: Dict[str, Any] = Depends(get_jwt_student_dependency()),
     db: Session = Depends(get_db),
     api_key: str = Security(get_api_key)
@@ -1229,16 +1558,18 @@ def get_available_programs(
     """
     try:
         programs = db_query.get_active_programs(db)
-        return AvailableProgramsResponse(programs=programs)
+        return catalog_response(request, response, AvailableProgramsResponse(programs=programs))
         
     except Exception as e:
-        print(f"Error getting available programs: {e}")
+        logger.error("Error getting available programs: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching programs: {str(e)}")
 
 # Step 3a: Getting all the available sections using program_id where isDeleted = 0
 @app.get("/student/onboarding/sections/{program_id}", response_model=AvailableSectionsResponse)
 def get_available_sections_by_program(
     program_id: int,
+    request: Request,
+    response: Response,
     current_student: Dict[str, Any] = Depends(get_jwt_student_dependency()),
     db: Session = Depends(get_db),
     api_key: str = Security(get_api_key)
@@ -1252,18 +1583,20 @@ def get_available_sections_by_program(
     """
     try:
         sections = db_query.get_sections_by_program(db, program_id, current_student["user_id"])
-        return AvailableSectionsResponse(sections=sections)
+        return catalog_response(request, response, AvailableSectionsResponse(sections=sections))
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        print(f"Error getting available sections for program {program_id}: {e}")
+        logger.error("Error getting available sections for program %s: %s", program_id, e)
         raise HTTPException(status_code=500, detail=f"Error fetching sections: {str(e)}")
 
 # Step 3b: Getting all the assigned_courses using section_id where isDeleted = 0 and specific semester
 @app.get("/student/onboarding/courses/{section_id}", response_model=AvailableCoursesResponse)
 def get_available_assigned_courses_by_section(
     section_id: int,
+    request: Request,
+    response: Response,
     current_student: Dict[str, Any] = Depends(get_jwt_student_dependency()),
     db: Session = Depends(get_db),
     api_key: str = Security(get_api_key)
@@ -1277,12 +1610,12 @@ def get_available_assigned_courses_by_section(
     """
     try:
         courses = db_query.get_assigned_courses_by_section(db, section_id)
-        return AvailableCoursesResponse(courses=courses)
+        return catalog_response(request, response, AvailableCoursesResponse(courses=courses))
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        print(f"Error getting assigned courses for section {section_id}: {e}")
+        logger.error("Error getting assigned courses for section %s: %s", section_id, e)
         raise HTTPException(status_code=500, detail=f"Error fetching assigned courses: {str(e)}")
     
 # Step 4: Assign student to Section and create Assigned_Course_Approval
@@ -1304,12 +1637,14 @@ def assign_student_to_section_endpoint(
     """
     try:
         result = assign_student_to_section(db, current_student, request.section_id)
-        return SectionAssignmentResponse(**result)
+        # Enrollment summary and today's classes change with the new section
+        invalidate_student_dashboard(current_student["user_id"])
+        return result
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        print(f"Error assigning student to section: {e}")
+        logger.error("Error assigning student to section: %s", e)
         raise HTTPException(status_code=500, detail=f"Error assigning section: {str(e)}")
     
 
@@ -1344,10 +1679,10 @@ def get_student_courses(
         # Get student courses using the database service
         courses_data = db_query.get_student_courses(db, current_student)
         
-        return StudentCoursesResponse(**courses_data)
+        return courses_data
         
     except Exception as e:
-        print(f"Error getting student courses: {e}")
+        logger.error("Error getting student courses: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching student courses: {str(e)}")
 
 
@@ -1359,6 +1694,8 @@ def get_student_courses(
 @app.get("/student/courses/{assigned_course_id}/students", response_model=CourseStudentsResponse)
 def get_course_students(
     assigned_course_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    offset: int = Query(0, ge=0),
     current_student: Dict[str, Any] = Depends(get_jwt_student_dependency()),
     db: Session = Depends(get_db),
     api_key: str = Security(get_api_key)
@@ -1371,16 +1708,18 @@ def get_course_students(
     2D. Summarize attendance data for each student
     2E. Return course information along with student list and attendance summary
     
+    Pass limit/offset to page the student list; next_offset is set while more remain.
+    
     Requires: Authorization header with Bearer JWT token
     """
     try:
-        course_students_data = db_query.get_course_students(db, assigned_course_id)
-        return CourseStudentsResponse(**course_students_data)
+        course_students_data = db_query.get_course_students(db, assigned_course_id, limit, offset)
+        return course_students_data
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        print(f"Error getting course students: {e}")
+        logger.error("Error getting course students: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching course students: {str(e)}")
     
 
@@ -1392,6 +1731,8 @@ def get_course_students(
 # 1. Get attendance all attendace log for the authenticated student
 @app.get("/student/attendance", response_model=StudentAttendanceResponse)
 def get_student_attendance(
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = None,
     current_student: Dict[str, Any] = Depends(get_jwt_student_dependency()),
     db: Session = Depends(get_db),
     api_key: str = Security(get_api_key)
@@ -1403,20 +1744,25 @@ def get_student_attendance(
     1C. Provide attendance summary statistics
     1D. Group by academic year and course
     
+    Pass limit to page the records newest first, then send back next_cursor as
+    cursor for the following page. Summaries always cover the full history.
+    
     Requires: Authorization header with Bearer JWT token
     """
     try:
         # Get student attendance using the database service
-        attendance_data = db_query.get_student_attendance_history(db, current_student)
+        attendance_data = db_query.get_student_attendance_history(db, current_student, limit, cursor)
         
-        return StudentAttendanceResponse(**attendance_data)
+        return attendance_data
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"Error getting student attendance: {e}")
+        logger.error("Error getting student attendance: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching student attendance: {str(e)}")
 
 # 2. Get current semester attendance logs based on enrolled courses
-@app.get("/student/attendance/current-semester", response_model=CurrentSemesterAttendanceResponse)
+@app.get("/student/attendance/current-semester", responses={200: {"model": CurrentSemesterAttendanceResponse}})
 def get_current_semester_attendance(
     current_student: Dict[str, Any] = Depends(get_jwt_student_dependency()),
     db: Session = Depends(get_db),
@@ -1432,21 +1778,18 @@ def get_current_semester_attendance(
     Requires: Authorization header with Bearer JWT token
     """
     try:
-        # Import the new function
-        from services.database.attendance_crud import get_current_semester_attendance
-        
         # Get current semester attendance data
-        attendance_data = get_current_semester_attendance(db, current_student)
+        attendance_data = attendance_crud.get_current_semester_attendance(db, current_student)
         
         if "error" in attendance_data:
             raise HTTPException(status_code=500, detail=attendance_data["error"])
         
-        return CurrentSemesterAttendanceResponse(**attendance_data)
+        return ORJSONResponse(attendance_data)
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting current semester attendance: {e}")
+        logger.error("Error getting current semester attendance: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching current semester attendance: {str(e)}")
 
 #============================================================
@@ -1454,11 +1797,9 @@ def get_current_semester_attendance(
 #============================================================
 # Uses the JWT dependency to ensure the student is authenticated and authorized
 
-# Import the dashboard service
-from services.database.dashboard_crud import get_student_dashboard_data
 
 # 1. Get the current class and dashboard data for the authenticated student
-@app.get("/student/dashboard", response_model=StudentDashboardResponse)
+@app.get("/student/dashboard", responses={200: {"model": StudentDashboardResponse}})
 def get_student_dashboard(
     current_student: Dict[str, Any] = Depends(get_jwt_student_dependency()),
     db: Session = Depends(get_db),
@@ -1475,15 +1816,15 @@ def get_student_dashboard(
     Requires: Authorization header with Bearer JWT token
     """
     try:
-        # Get dashboard data using the database service
-        dashboard_data = get_student_dashboard_data(db, current_student)
+        # Get dashboard data using the database service (cached for the current minute)
+        dashboard_json = get_student_dashboard_json(db, current_student)
         
-        return StudentDashboardResponse(**dashboard_data)
+        return Response(content=dashboard_json, media_type="application/json")
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        print(f"Error getting student dashboard: {e}")
+        logger.error("Error getting student dashboard: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching dashboard data: {str(e)}")
     
 #=============================================================
@@ -1495,7 +1836,7 @@ def get_student_dashboard(
 class AttendanceSubmissionRequest(BaseModel):
     """Request model for attendance submission"""
     assigned_course_id: int
-    face_image: str  # Base64 encoded image
+    face_image: Base64Image  # Base64 encoded image, decoded to bytes
     latitude: Optional[float] = None  # Note: Currently not stored in database
     longitude: Optional[float] = None  # Note: Currently not stored in database
 
@@ -1537,45 +1878,87 @@ def validate_attendance_submission(
     Requires: Authorization header with Bearer JWT token
     """
     try:
-        # Import the validation function
-        from services.database.attendance_submission import validate_attendance_eligibility
-        
         # Validate attendance eligibility
-        validation_result = validate_attendance_eligibility(
+        validation_result = attendance_submission.validate_attendance_eligibility(
             db, current_student, request.assigned_course_id
         )
         
-        return AttendanceValidationResponse(**validation_result)
+        return validation_result
         
     except Exception as e:
-        print(f"Error validating attendance submission: {e}")
+        logger.warning("Error validating attendance submission: %s", e)
         raise HTTPException(status_code=500, detail=f"Error validating attendance submission: {str(e)}")
 
-# 2. Submit attendance with face validation
-@app.post("/student/attendance/submit", response_model=AttendanceSubmissionResponse)
-def submit_attendance(
-    request: AttendanceSubmissionRequest,
-    current_student: Dict[str, Any] = Depends(get_jwt_student_dependency()),
-    db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
+def check_eligibility_and_release(eligibility_check, db: Session, current_user: Dict[str, Any], assigned_course_id: int):
+    """
+    Run an attendance eligibility check as its own short transaction
+
+    The transaction is ended before returning so the session hands its pooled connection
+    back while the caller awaits the face work; the submission checks one out again.
+    The eligibility result is a plain dict, so nothing loaded here is needed afterwards.
+    """
+    try:
+        return eligibility_check(db, current_user, assigned_course_id)
+    finally:
+        db.rollback()
+
+async def process_attendance_submission(
+    db: Session,
+    current_student: Dict[str, Any],
+    assigned_course_id: int,
+    face_image,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None
 ):
     """
-    Submit attendance for the authenticated student:
-    2A. Validate face image using face validation service
-    2B. Verify face against stored profile image (if available)
-    2C. Validate attendance submission eligibility
-    2D. Create attendance record with face image
-    2E. Determine attendance status (present/late) based on schedule
+    Validate the face image and submit a student's attendance; face_image may be base64 text or raw bytes
 
-    Requires: Authorization header with Bearer JWT token
+    Face validation goes through the face pool and the database work runs in the threadpool,
+    so the event loop keeps parsing other requests while this one waits. The database work
+    is split into short transactions around the face work, so no pooled connection is
+    held across an await.
     """
     try:
-        print(f"Attendance submission: {current_student.get('name')} -> Course {request.assigned_course_id}")
+        logger.debug("Attendance submission: %s -> Course %s", current_student.get('name'), assigned_course_id)
+
+        # Check eligibility before any image work; the result is handed to the submission
+        # service so the checks run once per submission
+        eligibility = await run_in_threadpool(
+            check_eligibility_and_release,
+            attendance_submission.validate_attendance_eligibility, db, current_student, assigned_course_id
+        )
+        if not eligibility.get("can_submit", False):
+            logger.debug("Attendance submission not eligible: %s", eligibility.get("message"))
+            return AttendanceSubmissionResponse(
+                success=False,
+                message=eligibility.get("message", "Cannot submit attendance"),
+                attendance_id=None,
+                status=None,
+                submitted_at=None,
+                course_info=None
+            )
+
+        # Request models and uploads already hand over bytes; Base64 text is decoded once here.
+        # Validation, face matching and storage all reuse the bytes
+        try:
+            face_image = decode_base64_image(face_image)
+        except ValueError as e:
+            return AttendanceSubmissionResponse(
+                success=False,
+                message=f"Invalid face image format: {str(e)}",
+                attendance_id=None,
+                status=None,
+                submitted_at=None,
+                course_info=None
+            )
+
+        # Scale down once so detection, face matching and storage share the smaller image
+        face_image = await run_in_threadpool(downscale_face_image, face_image)
 
         # 1. Validate face image first
-        is_valid_face, face_message = validate_face_image(request.face_image)
+        is_valid_face, face_message = await validate_face_image_async(face_image)
         if not is_valid_face:
-            print(f"Face validation failed: {face_message}")
+            logger.debug("Face validation failed: %s", face_message)
             return AttendanceSubmissionResponse(
                 success=False,
                 message=f"Face validation failed: {face_message}",
@@ -1585,20 +1968,19 @@ def submit_attendance(
                 course_info=None
             )
 
-        print("Face validation passed")
+        logger.debug("Face validation passed")
         
         # 2. Submit attendance (includes face verification)
-        from services.database.attendance_submission import submit_student_attendance
-        
-        submission_result = submit_student_attendance(
-            db, current_student, request.assigned_course_id, 
-            request.face_image, request.latitude, request.longitude
+        submission_result = await run_in_threadpool(
+            attendance_submission.submit_student_attendance,
+            db, current_student, assigned_course_id, 
+            face_image, latitude, longitude, eligibility
         )
         
         # Handle error responses
         if "error" in submission_result:
             error_message = submission_result["error"]
-            print(f"Submission failed: {error_message}")
+            logger.debug("Submission failed: %s", error_message)
             
             return AttendanceSubmissionResponse(
                 success=False,
@@ -1619,14 +2001,14 @@ def submit_attendance(
             "course_info": submission_result.get("course_info")
         }
         
-        print(f"Attendance submitted: {submission_result.get('status')} - ID: {submission_result.get('attendance_id')}")
-        return AttendanceSubmissionResponse(**response_data)
+        logger.debug("Attendance submitted: %s - ID: %s", submission_result.get('status'), submission_result.get('attendance_id'))
+        return response_data
         
     except HTTPException:
         raise
     except Exception as e:
         error_message = f"Error submitting attendance: {str(e)}"
-        print(f"Attendance submission error: {error_message}")
+        logger.warning("Attendance submission error: %s", error_message)
         
         return AttendanceSubmissionResponse(
             success=False,
@@ -1637,6 +2019,66 @@ def submit_attendance(
             course_info=None
         )
 
+# 2. Submit attendance with face validation
+@app.post("/student/attendance/submit", response_model=AttendanceSubmissionResponse)
+async def submit_attendance(
+    request: AttendanceSubmissionRequest,
+    current_student: Dict[str, Any] = Depends(get_jwt_student_dependency()),
+    db: Session = Depends(get_db),
+    api_key: str = Security(get_api_key)
+):
+    """
+    Submit attendance for the authenticated student:
+    2A. Validate face image using face validation service
+    2B. Verify face against stored profile image (if available)
+    2C. Validate attendance submission eligibility
+    2D. Create attendance record with face image
+    2E. Determine attendance status (present/late) based on schedule
+
+    Requires: Authorization header with Bearer JWT token
+    """
+    return await process_attendance_submission(
+        db, current_student, request.assigned_course_id,
+        request.face_image, request.latitude, request.longitude
+    )
+
+async def read_face_upload(face_image: UploadFile) -> bytes:
+    """
+    Read an uploaded face image, rejecting it before it is fully loaded if it is too large
+
+    The upload stays in Starlette's spooled temporary file (on disk past 1 MB) until this
+    reads it; at most MAX_FACE_IMAGE_BYTES + 1 bytes are pulled into memory.
+    """
+    face_bytes = await face_image.read(MAX_FACE_IMAGE_BYTES + 1)
+    if len(face_bytes) > MAX_FACE_IMAGE_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Face image is too large (maximum {MAX_FACE_IMAGE_BYTES // (1024 * 1024)} MB)"
+        )
+    return face_bytes
+
+# 2b. Submit attendance with the face image uploaded as a file
+@app.post("/student/attendance/submit-upload", response_model=AttendanceSubmissionResponse)
+async def submit_attendance_upload(
+    face_image: UploadFile = File(...),
+    assigned_course_id: int = Form(...),
+    latitude: Optional[float] = Form(None),
+    longitude: Optional[float] = Form(None),
+    current_student: Dict[str, Any] = Depends(get_jwt_student_dependency()),
+    db: Session = Depends(get_db),
+    api_key: str = Security(get_api_key)
+):
+    """
+    Same as the JSON submit endpoint, but takes the face image as a multipart/form-data
+    file so clients send raw JPEG/PNG bytes instead of base64 text.
+
+    Requires: Authorization header with Bearer JWT token
+    """
+    face_bytes = await read_face_upload(face_image)
+    return await process_attendance_submission(
+        db, current_student, assigned_course_id, face_bytes, latitude, longitude
+    )
+
 # 3. Get student's attendance status for today
 @app.get("/student/attendance/today")
 def get_today_attendance_status(
@@ -1653,14 +2095,12 @@ def get_today_attendance_status(
     Requires: Authorization header with Bearer JWT token
     """
     try:
-        from services.database.attendance_submission import get_today_attendance_status
-        
-        status_result = get_today_attendance_status(db, current_student)
+        status_result = attendance_submission.get_today_attendance_status(db, current_student)
         
         return status_result
         
     except Exception as e:
-        print(f"Error getting today's attendance status: {e}")
+        logger.warning("Error getting today's attendance status: %s", e)
         raise HTTPException(status_code=500, detail=f"Error getting today's attendance status: {str(e)}")
 
 
@@ -1684,7 +2124,7 @@ class FacultyAttendanceValidationResponse(BaseModel):
 class FacultyAttendanceSubmissionRequest(BaseModel):
     """Request model for faculty attendance submission"""
     assigned_course_id: int
-    face_image: str  # Base64 encoded image
+    face_image: Base64Image  # Base64 encoded image, decoded to bytes
     latitude: Optional[float] = None
     longitude: Optional[float] = None
 
@@ -1715,56 +2155,78 @@ def validate_faculty_attendance_submission(
     Requires: Authorization header with Bearer JWT token (Faculty role)
     """
     try:
-        # Import the faculty validation function
-        from services.database.faculty_attendance_submission import validate_faculty_attendance_eligibility
-        
         # Validate faculty attendance eligibility
-        validation_result = validate_faculty_attendance_eligibility(
+        validation_result = faculty_attendance_submission.validate_faculty_attendance_eligibility(
             db, current_faculty, request.assigned_course_id
         )
         
-        return FacultyAttendanceValidationResponse(**validation_result)
+        return validation_result
         
     except Exception as e:
-        print(f"Error validating faculty attendance submission: {e}")
+        logger.warning("Error validating faculty attendance submission: %s", e)
         raise HTTPException(status_code=500, detail=f"Error validating faculty attendance submission: {str(e)}")
 
-# 2. Submit faculty attendance with face validation
-@app.post("/faculty/attendance/submit", response_model=FacultyAttendanceSubmissionResponse)
-def submit_faculty_attendance(
-    request: FacultyAttendanceSubmissionRequest,
-    current_faculty: Dict[str, Any] = Depends(get_jwt_faculty_dependency()),
-    db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
+async def process_faculty_attendance_submission(
+    db: Session,
+    current_faculty: Dict[str, Any],
+    assigned_course_id: int,
+    face_image,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None
 ):
     """
-    Submit attendance for the authenticated faculty:
-    2A. Validate face image using face validation service
-    2B. Verify face against stored profile image (if available)
-    2C. Validate faculty attendance submission eligibility
-    2D. Create attendance record with face image
-    2E. Determine attendance status (present/late) based on schedule
+    Validate the face image and submit a faculty member's attendance; face_image may be base64 text or raw bytes
 
-    Requires: Authorization header with Bearer JWT token (Faculty role)
+    Face validation goes through the face pool and the database work runs in the threadpool,
+    so the event loop keeps parsing other requests while this one waits. The database work
+    is split into short transactions around the face work, so no pooled connection is
+    held across an await.
     """
     try:
-        print(f"=== FACULTY ATTENDANCE ENDPOINT DEBUG ===")
-        print(f"Request received from: {current_faculty.get('name')} (ID: {current_faculty.get('user_id')})")
-        print(f"Course ID: {request.assigned_course_id}")
-        print(f"Face image provided: {bool(request.face_image)}")
-        print(f"Face image length: {len(request.face_image) if request.face_image else 0}")
-        print(f"Latitude: {request.latitude}")
-        print(f"Longitude: {request.longitude}")
-        print(f"Current faculty data: {current_faculty}")
-        print("========================================")
+        logger.debug("Faculty attendance request from user %s for course %s (image: %s bytes, location: %s, %s)",
+                     current_faculty.get('user_id'), assigned_course_id, len(face_image) if face_image else 0, latitude, longitude)
+
+        # Check eligibility before any image work; the result is handed to the submission
+        # service so the checks run once per submission
+        eligibility = await run_in_threadpool(
+            check_eligibility_and_release,
+            faculty_attendance_submission.validate_faculty_attendance_eligibility, db, current_faculty, assigned_course_id
+        )
+        if not eligibility.get("can_submit", False):
+            logger.debug("Faculty attendance submission not eligible: %s", eligibility.get("message"))
+            return FacultyAttendanceSubmissionResponse(
+                success=False,
+                message=eligibility.get("message", "Cannot submit attendance"),
+                attendance_id=None,
+                status=None,
+                submitted_at=None,
+                course_info=None
+            )
+
+        # Request models and uploads already hand over bytes; Base64 text is decoded once here.
+        # Validation, face matching and storage all reuse the bytes
+        try:
+            face_image = decode_base64_image(face_image)
+        except ValueError as e:
+            return FacultyAttendanceSubmissionResponse(
+                success=False,
+                message=f"Invalid face image format: {str(e)}",
+                attendance_id=None,
+                status=None,
+                submitted_at=None,
+                course_info=None
+            )
+
+        # Scale down once so detection, face matching and storage share the smaller image
+        face_image = await run_in_threadpool(downscale_face_image, face_image)
 
         # 1. Validate face image first
-        print("Step 1: Validating face image...")
-        is_valid_face, face_message = validate_face_image(request.face_image)
-        print(f"Face validation result: {is_valid_face} - {face_message}")
+        logger.debug("Step 1: Validating face image...")
+        is_valid_face, face_message = await validate_face_image_async(face_image)
+        logger.debug("Face validation result: %s - %s", is_valid_face, face_message)
         
         if not is_valid_face:
-            print(f"Faculty face validation failed: {face_message}")
+            logger.debug("Faculty face validation failed: %s", face_message)
             return FacultyAttendanceSubmissionResponse(
                 success=False,
                 message=f"Face validation failed: {face_message}",
@@ -1774,23 +2236,22 @@ def submit_faculty_attendance(
                 course_info=None
             )
 
-        print("Faculty face validation passed")
+        logger.debug("Faculty face validation passed")
         
         # 2. Submit faculty attendance
-        print("Step 2: Calling faculty attendance submission service...")
-        from services.database.faculty_attendance_submission import submit_faculty_attendance
-        
-        submission_result = submit_faculty_attendance(
-            db, current_faculty, request.assigned_course_id, 
-            request.face_image, request.latitude, request.longitude
+        logger.debug("Step 2: Calling faculty attendance submission service...")
+        submission_result = await run_in_threadpool(
+            faculty_attendance_submission.submit_faculty_attendance,
+            db, current_faculty, assigned_course_id, 
+            face_image, latitude, longitude, eligibility
         )
         
-        print(f"Submission service result: {submission_result}")
+        logger.debug("Submission service result: %s", submission_result)
         
         # Handle error responses
         if "error" in submission_result:
             error_message = submission_result["error"]
-            print(f"Faculty submission failed: {error_message}")
+            logger.debug("Faculty submission failed: %s", error_message)
             
             return FacultyAttendanceSubmissionResponse(
                 success=False,
@@ -1811,21 +2272,18 @@ def submit_faculty_attendance(
             "course_info": submission_result.get("course_info")
         }
         
-        print(f"Faculty attendance submitted successfully:")
-        print(f"- Attendance ID: {submission_result.get('attendance_id')}")
-        print(f"- Status: {submission_result.get('status')}")
-        print(f"- Course: {submission_result.get('course_info', {}).get('course_name', 'Unknown')}")
-        print("========================================")
+        logger.debug("Faculty attendance submitted successfully:")
+        logger.debug("- Attendance ID: %s", submission_result.get('attendance_id'))
+        logger.debug("- Status: %s", submission_result.get('status'))
+        logger.debug("- Course: %s", submission_result.get('course_info', {}).get('course_name', 'Unknown'))
         
-        return FacultyAttendanceSubmissionResponse(**response_data)
+        return response_data
         
     except HTTPException:
         raise
     except Exception as e:
         error_message = f"Error submitting faculty attendance: {str(e)}"
-        print(f"Faculty attendance submission error: {error_message}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Faculty attendance submission error: %s", error_message)
         
         return FacultyAttendanceSubmissionResponse(
             success=False,
@@ -1836,6 +2294,51 @@ def submit_faculty_attendance(
             course_info=None
         )
 
+# 2. Submit faculty attendance with face validation
+@app.post("/faculty/attendance/submit", response_model=FacultyAttendanceSubmissionResponse)
+async def submit_faculty_attendance(
+    request: FacultyAttendanceSubmissionRequest,
+    current_faculty: Dict[str, Any] = Depends(get_jwt_faculty_dependency()),
+    db: Session = Depends(get_db),
+    api_key: str = Security(get_api_key)
+):
+    """
+    Submit attendance for the authenticated faculty:
+    2A. Validate face image using face validation service
+    2B. Verify face against stored profile image (if available)
+    2C. Validate faculty attendance submission eligibility
+    2D. Create attendance record with face image
+    2E. Determine attendance status (present/late) based on schedule
+
+    Requires: Authorization header with Bearer JWT token (Faculty role)
+    """
+    return await process_faculty_attendance_submission(
+        db, current_faculty, request.assigned_course_id,
+        request.face_image, request.latitude, request.longitude
+    )
+
+# 2b. Submit faculty attendance with the face image uploaded as a file
+@app.post("/faculty/attendance/submit-upload", response_model=FacultyAttendanceSubmissionResponse)
+async def submit_faculty_attendance_upload(
+    face_image: UploadFile = File(...),
+    assigned_course_id: int = Form(...),
+    latitude: Optional[float] = Form(None),
+    longitude: Optional[float] = Form(None),
+    current_faculty: Dict[str, Any] = Depends(get_jwt_faculty_dependency()),
+    db: Session = Depends(get_db),
+    api_key: str = Security(get_api_key)
+):
+    """
+    Same as the JSON submit endpoint, but takes the face image as a multipart/form-data
+    file so clients send raw JPEG/PNG bytes instead of base64 text.
+
+    Requires: Authorization header with Bearer JWT token
+    """
+    face_bytes = await read_face_upload(face_image)
+    return await process_faculty_attendance_submission(
+        db, current_faculty, assigned_course_id, face_bytes, latitude, longitude
+    )
+
 # 3. Get faculty's attendance status for today
 @app.get("/faculty/attendance/today")
 def get_faculty_today_attendance_status(
@@ -1852,14 +2355,12 @@ def get_faculty_today_attendance_status(
     Requires: Authorization header with Bearer JWT token (Faculty role)
     """
     try:
-        from services.database.faculty_attendance_submission import get_faculty_today_attendance_status
-        
-        status_result = get_faculty_today_attendance_status(db, current_faculty)
+        status_result = faculty_attendance_submission.get_faculty_today_attendance_status(db, current_faculty)
         
         return status_result
         
     except Exception as e:
-        print(f"Error getting faculty today's attendance status: {e}")
+        logger.warning("Error getting faculty today's attendance status: %s", e)
         raise HTTPException(status_code=500, detail=f"Error getting faculty today's attendance status: {str(e)}")
 
 
@@ -1870,7 +2371,7 @@ def get_faculty_today_attendance_status(
 
 # 1A. Get all courses assigned to the faculty
 # 1B. Group them by academic year and semester
-@app.get("/faculty/courses", response_model=FacultyCoursesResponse)
+@app.get("/faculty/courses", responses={200: {"model": FacultyCoursesResponse}})
 def get_faculty_courses(
     current_faculty: Dict[str, Any] = Depends(get_jwt_faculty_dependency()),
     db: Session = Depends(get_db),
@@ -1884,20 +2385,22 @@ def get_faculty_courses(
     Requires: Authorization header with Bearer JWT token
     """
     try:
-        # Import the faculty courses service
-        from services.database.faculty_crud import get_faculty_courses
-        
         # Get faculty courses data
-        courses_data = get_faculty_courses(db, current_faculty)
+        courses_data = faculty_crud.get_faculty_courses(db, current_faculty)
+        
+        if "error" in courses_data:
+            raise HTTPException(status_code=500, detail=courses_data["error"])
         
-        return FacultyCoursesResponse(**courses_data)
+        return ORJSONResponse(courses_data)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error getting faculty courses: {e}")
+        logger.error("Error getting faculty courses: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching faculty courses: {str(e)}")
 
 # 2. Get detailed information about a specific course including students and attendance
-@app.get("/faculty/courses/{assigned_course_id}/details", response_model=FacultyCourseDetailsResponse)
+@app.get("/faculty/courses/{assigned_course_id}/details", responses={200: {"model": FacultyCourseDetailsResponse}})
 def get_faculty_course_details(
     assigned_course_id: int,
     current_faculty: Dict[str, Any] = Depends(get_jwt_faculty_dependency()),
@@ -1915,35 +2418,32 @@ def get_faculty_course_details(
     Requires: Authorization header with Bearer JWT token
     """
     try:
-        # Import the faculty course details service
-        from services.database.faculty_course_details import get_faculty_course_details
-        
         # Get comprehensive course details
-        course_details = get_faculty_course_details(db, current_faculty, assigned_course_id)
+        course_details = faculty_course_details.get_faculty_course_details(db, current_faculty, assigned_course_id)
         
         if "error" in course_details:
-            if "not found" in course_details["error"].lower():
-                raise HTTPException(status_code=404, detail=course_details["error"])
-            elif "permission" in course_details["error"].lower():
-                raise HTTPException(status_code=403, detail=course_details["error"])
-            else:
-                raise HTTPException(status_code=500, detail=course_details["error"])
+            raise_service_error(course_details["error"])
         
-        return FacultyCourseDetailsResponse(**course_details)
+        return ORJSONResponse(course_details)
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting faculty course details: {e}")
+        logger.error("Error getting faculty course details: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching course details: {str(e)}")
 
 #=============================================================
 # FACULTY ATTENDANCE HISTORY ENDPOINTS
 #=============================================================
 # Uses the JWT dependency to ensure the faculty is authenticated
+# The read endpoints return the service dicts as ORJSONResponse; the response models
+# are only used for the OpenAPI docs, so the large attendance lists are not validated
+# and re-encoded on every request
 
 # 1. Get all attendance records for the faculty member's own attendance
-@app.get("/faculty/attendance", response_model=FacultyPersonalAttendanceResponse)
+# (/faculty/attendance/personal is the same endpoint, kept for backward compatibility)
+@app.get("/faculty/attendance", responses={200: {"model": FacultyPersonalAttendanceResponse}})
+@app.get("/faculty/attendance/personal", responses={200: {"model": FacultyPersonalAttendanceResponse}})
 def get_faculty_attendance(
     current_faculty: Dict[str, Any] = Depends(get_jwt_faculty_dependency()),
     db: Session = Depends(get_db),
@@ -1962,20 +2462,17 @@ def get_faculty_attendance(
     Requires: Authorization header with Bearer JWT token (Faculty role)
     """
     try:
-        # Import the faculty personal attendance service
-        from services.database.faculty_personal_attendance_crud import get_faculty_personal_attendance_history
-        
         # Get faculty's personal attendance using the database service
         attendance_data = get_faculty_personal_attendance_history(db, current_faculty)
         
-        return FacultyPersonalAttendanceResponse(**attendance_data)
+        return ORJSONResponse(attendance_data)
         
     except Exception as e:
-        print(f"Error getting faculty personal attendance: {e}")
+        logger.error("Error getting faculty personal attendance: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching faculty personal attendance: {str(e)}")
 
 # 2. Get current semester attendance logs for faculty's assigned courses
-@app.get("/faculty/attendance/current-semester", response_model=FacultyCurrentSemesterAttendanceResponse)
+@app.get("/faculty/attendance/current-semester", responses={200: {"model": FacultyCurrentSemesterAttendanceResponse}})
 def get_faculty_current_semester_attendance(
     current_faculty: Dict[str, Any] = Depends(get_jwt_faculty_dependency()),
     db: Session = Depends(get_db),
@@ -1991,21 +2488,18 @@ def get_faculty_current_semester_attendance(
     Requires: Authorization header with Bearer JWT token (Faculty role)
     """
     try:
-        # Import the faculty attendance service
-        from services.database.faculty_attendance_crud import get_faculty_current_semester_attendance
-        
         # Get current semester attendance data
-        attendance_data = get_faculty_current_semester_attendance(db, current_faculty)
+        attendance_data = faculty_attendance_crud.get_faculty_current_semester_attendance(db, current_faculty)
         
         if "error" in attendance_data:
             raise HTTPException(status_code=500, detail=attendance_data["error"])
         
-        return FacultyCurrentSemesterAttendanceResponse(**attendance_data)
+        return ORJSONResponse(attendance_data)
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting faculty current semester attendance: {e}")
+        logger.error("Error getting faculty current semester attendance: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching faculty current semester attendance: {str(e)}")
 
 # Faculty Student Status Update Models
@@ -2026,7 +2520,7 @@ class StudentStatusUpdateResponse(BaseModel):
     student_info: Optional[Dict[str, Any]] = None
 
 # 3. Update student enrollment status in a specific course
-@app.put("/faculty/courses/{assigned_course_id}/students/{student_id}/status", response_model=StudentStatusUpdateResponse)
+@app.put("/faculty/courses/{assigned_course_id}/students/{student_id}/status", responses={200: {"model": StudentStatusUpdateResponse}})
 def update_student_status(
     assigned_course_id: int,
     student_id: int,
@@ -2045,42 +2539,33 @@ def update_student_status(
     Requires: Authorization header with Bearer JWT token (Faculty role)
     """
     try:
-        print(f"=== ENDPOINT REQUEST DEBUG ===")
-        print(f"Request status: {request.status}")
-        print(f"Request rejection_reason: {repr(request.rejection_reason)}")
-        print(f"Request rejection_reason type: {type(request.rejection_reason)}")
-        print("==============================")
-        
-        # Import the student status update service
-        from services.database.faculty_student_status import update_student_enrollment_status
-        
-               
-        # Update student status
+        # Update student status (the service checks the status and rejection reason
+        # before it queries anything)
         update_result = update_student_enrollment_status(
             db, current_faculty, assigned_course_id, student_id, 
             request.status, request.rejection_reason
         )
 
         if "error" in update_result:
-            if "not found" in update_result["error"].lower():
-                raise HTTPException(status_code=404, detail=update_result["error"])
-            elif "permission" in update_result["error"].lower():
-                raise HTTPException(status_code=403, detail=update_result["error"])
-            elif "invalid" in update_result["error"].lower():
-                raise HTTPException(status_code=400, detail=update_result["error"])
-            else:
-                raise HTTPException(status_code=500, detail=update_result["error"])
+            raise_service_error(update_result["error"], FACULTY_UPDATE_ERROR_STATUS_CODES)
         
-        return StudentStatusUpdateResponse(**update_result)
+        # The counts and recent attendance on this faculty's dashboard are now out of date,
+        # as is the student's own enrollment summary
+        invalidate_faculty_dashboard(current_faculty["user_id"])
+        if update_result.get("student_info"):
+            invalidate_student_dashboard(update_result["student_info"]["user_id"])
+        
+        # The service result is already shaped like the response; skip re-validating it
+        return StudentStatusUpdateResponse.model_construct(**update_result)
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error updating student status: {e}")
+        logger.error("Error updating student status: %s", e)
         raise HTTPException(status_code=500, detail=f"Error updating student status: {str(e)}")
 
 # 4. Get attendance records for a specific course with optional filtering
-@app.get("/faculty/courses/{assigned_course_id}/attendance", response_model=FacultyCourseAttendanceResponse)
+@app.get("/faculty/courses/{assigned_course_id}/attendance", responses={200: {"model": FacultyCourseAttendanceResponse}})
 def get_faculty_course_attendance(
     assigned_course_id: int,
     academic_year: Optional[str] = None,
@@ -2106,28 +2591,20 @@ def get_faculty_course_attendance(
     Requires: Authorization header with Bearer JWT token (Faculty role)
     """
     try:
-        # Import the faculty course attendance service
-        from services.database.faculty_course_attendance import get_faculty_course_attendance_records
-        
         # Get course attendance records
         attendance_data = get_faculty_course_attendance_records(
             db, current_faculty, assigned_course_id, academic_year, month, day
         )
         
         if "error" in attendance_data:
-            if "not found" in attendance_data["error"].lower():
-                raise HTTPException(status_code=404, detail=attendance_data["error"])
-            elif "permission" in attendance_data["error"].lower():
-                raise HTTPException(status_code=403, detail=attendance_data["error"])
-            else:
-                raise HTTPException(status_code=500, detail=attendance_data["error"])
+            raise_service_error(attendance_data["error"])
         
-        return FacultyCourseAttendanceResponse(**attendance_data)
+        return ORJSONResponse(attendance_data)
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting faculty course attendance: {e}")
+        logger.error("Error getting faculty course attendance: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching course attendance: {str(e)}")
 
 # Faculty Attendance Update Models
@@ -2147,7 +2624,7 @@ class AttendanceStatusUpdateResponse(BaseModel):
     course_info: Optional[Dict[str, Any]] = None
 
 # 5. Update attendance status for a specific attendance record
-@app.put("/faculty/courses/{assigned_course_id}/attendance/{attendance_id}/status", response_model=AttendanceStatusUpdateResponse)
+@app.put("/faculty/courses/{assigned_course_id}/attendance/{attendance_id}/status", responses={200: {"model": AttendanceStatusUpdateResponse}})
 def update_attendance_status(
     assigned_course_id: int,
     attendance_id: int,
@@ -2167,68 +2644,34 @@ def update_attendance_status(
     Requires: Authorization header with Bearer JWT token (Faculty role)
     """
     try:
-        # Import the attendance update service
-        from services.database.faculty_attendance_update import update_attendance_status_record
-        
-        # Update attendance status
+        # Update attendance status (the service checks the status before it queries anything)
         update_result = update_attendance_status_record(
             db, current_faculty, assigned_course_id, attendance_id, request.status
         )
 
         if "error" in update_result:
-            if "not found" in update_result["error"].lower():
-                raise HTTPException(status_code=404, detail=update_result["error"])
-            elif "permission" in update_result["error"].lower():
-                raise HTTPException(status_code=403, detail=update_result["error"])
-            elif "invalid" in update_result["error"].lower():
-                raise HTTPException(status_code=400, detail=update_result["error"])
-            else:
-                raise HTTPException(status_code=500, detail=update_result["error"])
+            raise_service_error(update_result["error"], FACULTY_UPDATE_ERROR_STATUS_CODES)
         
-        return AttendanceStatusUpdateResponse(**update_result)
+        # The counts and recent attendance on this faculty's dashboard are now out of date
+        invalidate_faculty_dashboard(current_faculty["user_id"])
+        
+        # The service result is already shaped like the response; skip re-validating it
+        return AttendanceStatusUpdateResponse.model_construct(**update_result)
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error updating attendance status: {e}")
+        logger.error("Error updating attendance status: %s", e)
         raise HTTPException(status_code=500, detail=f"Error updating attendance status: {str(e)}")
 
-# 6. Faculty Personal Attendance Endpoint (alternative endpoint)
-@app.get("/faculty/attendance/personal", response_model=FacultyPersonalAttendanceResponse)
-def get_faculty_personal_attendance(
-    current_faculty: Dict[str, Any] = Depends(get_jwt_faculty_dependency()),
-    db: Session = Depends(get_db),
-    api_key: str = Security(get_api_key)
-):
-    """
-    Alternative endpoint for faculty's own personal attendance records:
-    (Same functionality as /faculty/attendance - kept for backward compatibility)
-    
-    Requires: Authorization header with Bearer JWT token (Faculty role)
-    """
-    try:
-        # Import the faculty personal attendance service
-        from services.database.faculty_personal_attendance_crud import get_faculty_personal_attendance_history
-        
-        # Get faculty's personal attendance using the database service
-        attendance_data = get_faculty_personal_attendance_history(db, current_faculty)
-        
-        return FacultyPersonalAttendanceResponse(**attendance_data)
-        
-    except Exception as e:
-        print(f"Error getting faculty personal attendance: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching faculty personal attendance: {str(e)}")
-
 #=============================================================
 # FACULTY DASHBOARD ENDPOINTS
 #=============================================================
 # Uses the JWT dependency to ensure the faculty is authenticated
 
-# Import the faculty dashboard service
-from services.database.faculty_dashboard_crud import get_faculty_dashboard_data
 
 # 1. Get comprehensive dashboard data for the authenticated faculty
-@app.get("/faculty/dashboard", response_model=FacultyDashboardResponse)
+@app.get("/faculty/dashboard", responses={200: {"model": FacultyDashboardResponse}})
 def get_faculty_dashboard(
     current_faculty: Dict[str, Any] = Depends(get_jwt_faculty_dependency()),
     db: Session = Depends(get_db),
@@ -2247,13 +2690,13 @@ def get_faculty_dashboard(
     Requires: Authorization header with Bearer JWT token (Faculty role)
     """
     try:
-        # Get dashboard data using the database service
-        dashboard_data = get_faculty_dashboard_data(db, current_faculty)
+        # Get dashboard data using the database service (cached for the current minute)
+        dashboard_json = get_faculty_dashboard_json(db, current_faculty)
         
-        return FacultyDashboardResponse(**dashboard_data)
+        return Response(content=dashboard_json, media_type="application/json")
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        print(f"Error getting faculty dashboard: {e}")
+        logger.error("Error getting faculty dashboard: %s", e)
         raise HTTPException(status_code=500, detail=f"Error fetching faculty dashboard data: {str(e)}")
\ No newline at end of file
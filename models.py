@@ -3,6 +3,7 @@ This file imports models from the desktop application.
 All model definitions come directly from the desktop application.
 """
 import os
+import sys
 import importlib.util
 from dotenv import load_dotenv
 
@@ -18,9 +19,18 @@ try:
     if not os.path.exists(desktop_models_path):
         raise ImportError(f"Models file not found at {desktop_models_path}")
     
-    spec = importlib.util.spec_from_file_location("desktop_models", desktop_models_path)
-    desktop_models = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(desktop_models)
+    # Registered in sys.modules so a re-import of this module reuses the loaded models
+    # instead of executing the file again and defining a second set of tables
+    desktop_models = sys.modules.get("desktop_models")
+    if desktop_models is None:
+        spec = importlib.util.spec_from_file_location("desktop_models", desktop_models_path)
+        desktop_models = importlib.util.module_from_spec(spec)
+        sys.modules["desktop_models"] = desktop_models
+        try:
+            spec.loader.exec_module(desktop_models)
+        except BaseException:
+            del sys.modules["desktop_models"]
+            raise
     
     # Re-export all models and classes from desktop_models
     Base = desktop_models.Base
@@ -1,5 +1,6 @@
 import uvicorn
 import os
+import importlib.util
 from dotenv import load_dotenv
 
 # Load environment variables with override=True to ensure consistency
@@ -15,10 +16,21 @@ api_key_name = os.getenv("API_KEY_NAME", "AttendanceApp-API-Key")
 # Determine reload setting based on environment
 reload_enabled = env.lower() == "development"
 
+# Prefer uvloop + httptools when installed (uvloop is not available on Windows)
+loop_impl = os.getenv("API_LOOP") or ("uvloop" if importlib.util.find_spec("uvloop") else "asyncio")
+http_impl = os.getenv("API_HTTP") or ("httptools" if importlib.util.find_spec("httptools") else "h11")
+
+# Worker processes (ignored when reload is enabled). Pending OTP registrations
+# are kept in process memory, so keep this at 1 unless that state is shared.
+workers = int(os.getenv("API_WORKERS", "1"))
+
+log_level = os.getenv("LOG_LEVEL", "info").lower()
+
 if __name__ == "__main__":
     print("────────────────────────────────────────────────────")
     print(f"✓ Environment: {env}")
     print(f"✓ API server: http://{host}:{port}")
+    print(f"✓ Event loop: {loop_impl}, HTTP parser: {http_impl}")
     print(f"✓ Documentation: http://{host}:{port}/docs")
     print(f"✓ Registration Flow:")
     print(f"  • Step 1: http://{host}:{port}/registerStudent/validate-fields")
@@ -53,5 +65,8 @@ if __name__ == "__main__":
         host=host, 
         port=port, 
         reload=reload_enabled,
-        log_level="info"
+        workers=None if reload_enabled else workers,
+        loop=loop_impl,
+        http=http_impl,
+        log_level=log_level
     )
@@ -1,4 +1,9 @@
 import jwt
+import hashlib
+import logging
+import threading
+import time
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from fastapi import HTTPException, Header, Depends
@@ -10,6 +15,8 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 class JWTService:
     """Service for JWT token generation and validation"""
     
@@ -18,6 +25,14 @@ class JWTService:
     ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_HOURS = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_HOURS", "24"))
     
+    # Short-lived cache of verified user data, keyed by token digest
+    USER_CACHE_TTL_SECONDS = int(os.getenv("JWT_USER_CACHE_TTL_SECONDS", "60"))
+    _user_cache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL_SECONDS)
+    _user_cache_lock = threading.Lock()
+    
+    # User data by user_id, so a new token for the same user also skips the queries
+    _user_data_cache = TTLCache(maxsize=5_000, ttl=USER_CACHE_TTL_SECONDS)
+    
     security = HTTPBearer()
     
     @classmethod
@@ -57,12 +72,12 @@ class JWTService:
             # Generate token
             token = jwt.encode(payload, cls.SECRET_KEY, algorithm=cls.ALGORITHM)
             
-            print(f"✅ JWT token generated for user {user_data.get('email')} (expires in {cls.ACCESS_TOKEN_EXPIRE_HOURS} hours)")
+            logger.debug("JWT token generated for user %s (expires in %s hours)", user_data.get('email'), cls.ACCESS_TOKEN_EXPIRE_HOURS)
             
             return token
             
         except Exception as e:
-            print(f"Error generating JWT token: {e}")
+            logger.warning("Error generating JWT token: %s", e)
             raise HTTPException(status_code=500, detail="Could not generate authentication token")
     
     @classmethod
@@ -82,28 +97,28 @@ class JWTService:
             
             # Check if token type is correct
             if payload.get("type") != "access_token":
-                print(f"Invalid token type: {payload.get('type')}")
+                logger.debug("Invalid token type: %s", payload.get('type'))
                 return None
             
             # Check if token has required fields
             required_fields = ["user_id", "email", "exp"]
             for field in required_fields:
                 if field not in payload:
-                    print(f"Missing required field in token: {field}")
+                    logger.debug("Missing required field in token: %s", field)
                     return None
             
             # Token is valid
-            print(f"✅ JWT token validated for user {payload.get('email')} (ID: {payload.get('user_id')})")
+            logger.debug("JWT token validated for user %s (ID: %s)", payload.get('email'), payload.get('user_id'))
             return payload
             
         except jwt.ExpiredSignatureError:
-            print("JWT token has expired")
+            logger.debug("JWT token has expired")
             return None
         except jwt.InvalidTokenError as e:
-            print(f"Invalid JWT token: {e}")
+            logger.debug("Invalid JWT token: %s", e)
             return None
         except Exception as e:
-            print(f"Error validating JWT token: {e}")
+            logger.warning("Error validating JWT token: %s", e)
             return None
     
     @classmethod
@@ -161,53 +176,165 @@ class JWTService:
             if not payload:
                 return None
             
-            user_id = payload.get("user_id")
-            if not user_id:
-                return None
-            
-            # Verify user still exists in database
-            from models import User as UserModel, Student as StudentModel
+            return cls._load_user_data(payload, db)
             
-            user = db.query(UserModel).filter(UserModel.id == user_id).first()
-            if not user:
-                print(f"User {user_id} not found in database")
-                return None
+        except Exception as e:
+            logger.warning("Error getting current user from token: %s", e)
+            return None
+    
+    @classmethod
+    def get_cached_user_from_token(cls, token: str, db: Session) -> Optional[Dict[str, Any]]:
+        """
+        Get current user data from JWT token, reusing a recent database lookup
+        
+        Entries live for USER_CACHE_TTL_SECONDS and never past the token's own
+        expiry, so a cache hit skips both the JWT decode and the user queries.
+        A token that is not cached yet still reuses the user data loaded for
+        another token of the same user.
+        
+        Args:
+            token: JWT token string
+            db: Database session
             
-            # Check if user is deleted
-            if hasattr(user, 'isDeleted') and user.isDeleted:
-                print(f"User {user_id} is deleted")
+        Returns:
+            Copy of the user data if valid, None otherwise
+        """
+        key = cls._token_cache_key(token)
+        with cls._user_cache_lock:
+            entry = cls._user_cache.get(key)
+        
+        if entry is not None:
+            user_data, expires_at = entry
+            if time.time() < expires_at:
+                return dict(user_data)
+            with cls._user_cache_lock:
+                cls._user_cache.pop(key, None)
+            return None
+        
+        try:
+            payload = cls.validate_token(token)
+            if not payload:
                 return None
             
-            # Get student data if user is a student
-            student = db.query(StudentModel).filter(StudentModel.user_id == user.id).first()
-            
-            # Prepare user data
-            user_data = {
-                "user_id": user.id,
-                "email": user.email,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "name": f"{user.first_name} {user.last_name}",
-                "role": user.role,
-                "verified": getattr(user, 'verified', 0),
-                "status_id": getattr(user, 'status_id', 1)
-            }
-            
-            # Add middle name if exists
-            if hasattr(user, 'middle_name') and user.middle_name:
-                user_data["middle_name"] = user.middle_name
+            user_id = payload.get("user_id")
+            with cls._user_cache_lock:
+                user_data = cls._user_data_cache.get(user_id)
             
-            # Add student-specific data
-            if student:
-                user_data["student_number"] = student.student_number
-                user_data["section_id"] = student.section
-                user_data["has_section"] = student.section is not None
+            if user_data is None:
+                user_data = cls._load_user_data(payload, db)
+                if not user_data:
+                    return None
+                # Only store on a miss; re-assigning a hit would reset its TTL and keep stale data alive
+                with cls._user_cache_lock:
+                    cls._user_data_cache[user_id] = user_data
             
-            return user_data
+            with cls._user_cache_lock:
+                cls._user_cache[key] = (user_data, payload["exp"])
+            return dict(user_data)
             
         except Exception as e:
-            print(f"Error getting current user from token: {e}")
+            logger.warning("Error getting current user from token: %s", e)
+            return None
+    
+    @classmethod
+    def invalidate_cached_user(cls, user_id: int) -> None:
+        """
+        Drop cached user data for a user whose stored details changed
+        
+        Args:
+            user_id: ID of the user to drop from the cache
+        """
+        with cls._user_cache_lock:
+            cls._user_data_cache.pop(user_id, None)
+            stale_keys = [
+                key for key, (user_data, _) in cls._user_cache.items()
+                if user_data.get("user_id") == user_id
+            ]
+            for key in stale_keys:
+                cls._user_cache.pop(key, None)
+    
+    @staticmethod
+    def _token_cache_key(token: str) -> bytes:
+        """Digest used as the user cache key so raw tokens are not kept in memory"""
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    @classmethod
+    def _load_user_data(cls, payload: Dict[str, Any], db: Session) -> Optional[Dict[str, Any]]:
+        """
+        Load user data for a validated token payload from the database
+        
+        Args:
+            payload: Validated JWT payload
+            db: Database session
+            
+        Returns:
+            User data if the user exists and is active, None otherwise
+        """
+        user_id = payload.get("user_id")
+        if not user_id:
+            return None
+        
+        # Verify user still exists in database, loading student/faculty rows and the status name
+        # in the same query
+        from models import User as UserModel, Student as StudentModel, Faculty as FacultyModel, Status as StatusModel
+        
+        result = db.query(UserModel, StudentModel, FacultyModel, StatusModel.name).outerjoin(
+            StudentModel, StudentModel.user_id == UserModel.id
+        ).outerjoin(
+            FacultyModel, FacultyModel.user_id == UserModel.id
+        ).outerjoin(
+            StatusModel, StatusModel.id == UserModel.status_id
+        ).filter(UserModel.id == user_id).first()
+        if not result:
+            logger.debug("User %s not found in database", user_id)
             return None
+        
+        user, student, faculty, status_name = result
+        
+        # Check if user is deleted
+        if hasattr(user, 'isDeleted') and user.isDeleted:
+            logger.debug("User %s is deleted", user_id)
+            return None
+        
+        # Prepare user data
+        user_data = {
+            "user_id": user.id,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "name": f"{user.first_name} {user.last_name}",
+            "role": user.role,
+            "verified": getattr(user, 'verified', 0),
+            "status_id": getattr(user, 'status_id', 1),
+            "status_name": status_name
+        }
+        
+        # Add middle name if exists
+        if hasattr(user, 'middle_name') and user.middle_name:
+            user_data["middle_name"] = user.middle_name
+        
+        # Add student-specific data
+        if student:
+            user_data["student_number"] = student.student_number
+            user_data["section_id"] = student.section
+            user_data["has_section"] = student.section is not None
+            # Onboarding status projection, built once and reused from the user cache
+            user_data["student_info"] = {
+                "user_id": user_data["user_id"],
+                "name": user_data["name"],
+                "email": user_data["email"],
+                "student_number": user_data["student_number"],
+                "section_id": user_data["section_id"],
+                "has_section": user_data["has_section"],
+                "verified": user_data["verified"],
+                "status_id": user_data["status_id"]
+            }
+        
+        # Add faculty-specific data
+        if faculty:
+            user_data["faculty_id"] = faculty.id
+        
+        return user_data
 
 # Create properly configured dependency functions
 def create_get_current_user_dependency():
@@ -1,10 +1,13 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 import bcrypt
 from datetime import datetime
 from pydantic import BaseModel
 from models import User as UserModel, Student as StudentModel
 from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 class LoginValidationRequest(BaseModel):
     """Request model for validating login fields"""
@@ -53,9 +56,7 @@ def validate_login_fields(request: LoginValidationRequest, db: Session):
     try:
         import re
         
-        print(f"=== LOGIN VALIDATION REQUEST DEBUG ===")
-        print(f"Validating login fields for email: {request.email}")
-        print("=====================================")
+        logger.debug("Validating login fields for email: %s", request.email)
         
         errors = []
         
@@ -109,23 +110,23 @@ def validate_login_fields(request: LoginValidationRequest, db: Session):
                                     if not student and not faculty:
                                         errors.append("Account not found. Neither student nor faculty account exists.")
                             except Exception as pwd_error:
-                                print(f"Password verification error: {pwd_error}")
+                                logger.warning("Password verification error: %s", pwd_error)
                                 errors.append("Invalid email or password.")
                                 
             except Exception as db_error:
-                print(f"Database validation error: {db_error}")
+                logger.warning("Database validation error: %s", db_error)
                 errors.append("Database error during validation.")
         
         # Return validation result
         if errors:
-            print(f"Login validation failed with errors: {errors}")
+            logger.debug("Login validation failed with errors: %s", errors)
             return LoginValidationResponse(
                 is_valid=False,
                 message="Validation failed",
                 errors=errors
             )
         
-        print("Login fields and credentials are valid")
+        logger.debug("Login fields and credentials are valid")
         return LoginValidationResponse(
             is_valid=True,
             message="Login credentials are valid",
@@ -133,14 +134,14 @@ def validate_login_fields(request: LoginValidationRequest, db: Session):
         )
         
     except Exception as e:
-        print(f"Unexpected error in login validation: {e}")
+        logger.error("Unexpected error in login validation: %s", e)
         return LoginValidationResponse(
             is_valid=False,
             message=f"Validation failed: {str(e)}",
             errors=[f"Server error: {str(e)}"]
         )
 
-def send_login_otp(request: LoginOTPRequest, db: Session):
+def send_login_otp(request: LoginOTPRequest, db: Session, background_tasks: Optional[BackgroundTasks] = None):
     """
     Send OTP for login
     
@@ -154,9 +155,7 @@ def send_login_otp(request: LoginOTPRequest, db: Session):
     try:
         import re
         
-        print(f"=== SEND LOGIN OTP REQUEST DEBUG ===")
-        print(f"Sending login OTP to: {request.email}")
-        print("===================================")
+        logger.debug("Sending login OTP to: %s", request.email)
         
         # 1. Basic email validation
         if not request.email or not request.email.strip():
@@ -227,7 +226,8 @@ def send_login_otp(request: LoginOTPRequest, db: Session):
             email=user.email,
             first_name=user.first_name,
             login_data=login_data,
-            db=db
+            db=db,
+            background_tasks=background_tasks
         )
         
         if not success:
@@ -237,7 +237,7 @@ def send_login_otp(request: LoginOTPRequest, db: Session):
                 otp_id=None
             )
         
-        print(f"✅ Login OTP sent successfully to {user.email} (OTP ID: {otp_id})")
+        logger.debug("Login OTP sent successfully to %s (OTP ID: %s)", user.email, otp_id)
         
         return LoginOTPResponse(
             success=True,
@@ -246,9 +246,7 @@ def send_login_otp(request: LoginOTPRequest, db: Session):
         )
         
     except Exception as e:
-        print(f"Unexpected error in send_login_otp: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Unexpected error in send_login_otp: %s", e)
         return LoginOTPResponse(
             success=False,
             message=f"Failed to send login OTP: {str(e)}",
@@ -267,9 +265,7 @@ def verify_login_otp(request: LoginOTPVerificationRequest, db: Session):
         LoginOTPVerificationResponse with success status, user data, and token
     """
     try:
-        print(f"=== VERIFY LOGIN OTP REQUEST DEBUG ===")
-        print(f"Verifying login OTP ID: {request.otp_id}, Code: {request.otp_code}")
-        print("=====================================")
+        logger.debug("Verifying login OTP ID: %s", request.otp_id)
         
         # Verify OTP and get login data
         from services.otp.service import OTPService
@@ -281,7 +277,7 @@ def verify_login_otp(request: LoginOTPVerificationRequest, db: Session):
         )
         
         if not is_valid:
-            print(f"OTP verification failed: {message_or_data}")
+            logger.debug("OTP verification failed: %s", message_or_data)
             return LoginOTPVerificationResponse(
                 success=False,
                 message=message_or_data,
@@ -290,7 +286,7 @@ def verify_login_otp(request: LoginOTPVerificationRequest, db: Session):
             )
         
         if not login_data:
-            print("No login data found")
+            logger.debug("No login data found")
             return LoginOTPVerificationResponse(
                 success=False,
                 message="Login data not found",
@@ -298,7 +294,7 @@ def verify_login_otp(request: LoginOTPVerificationRequest, db: Session):
                 token=None
             )
         
-        print(f"OTP verified successfully, proceeding with login")
+        logger.debug("OTP verified successfully, proceeding with login")
         
         # Get user information from the database
         user_id = login_data.get('user_id')
@@ -369,7 +365,7 @@ def verify_login_otp(request: LoginOTPVerificationRequest, db: Session):
         try:
             auth_token = JWTService.generate_token(user_data)
         except Exception as token_error:
-            print(f"Error generating JWT token: {token_error}")
+            logger.error("Error generating JWT token: %s", token_error)
             return LoginOTPVerificationResponse(
                 success=False,
                 message="Failed to generate authentication token",
@@ -377,7 +373,7 @@ def verify_login_otp(request: LoginOTPVerificationRequest, db: Session):
                 token=None
             )
         
-        print(f"✅ Login successful for: {user.email} (ID: {user.id})")
+        logger.debug("Login successful for: %s (ID: %s)", user.email, user.id)
         
         return LoginOTPVerificationResponse(
             success=True,
@@ -387,9 +383,7 @@ def verify_login_otp(request: LoginOTPVerificationRequest, db: Session):
         )
         
     except Exception as e:
-        print(f"Unexpected error in verify_login_otp: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Unexpected error in verify_login_otp: %s", e)
         return LoginOTPVerificationResponse(
             success=False,
             message=f"Login verification failed: {str(e)}",
@@ -3,8 +3,11 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from models import User as UserModel, Student as StudentModel
 from typing import Optional
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 class OnboardingCheckRequest(BaseModel):
     """Request model for checking student onboarding status"""
     pass  # No body needed, auth token comes from header
@@ -34,7 +37,7 @@ def validate_auth_token(auth_token: str) -> Optional[int]:
         return user_id
         
     except Exception as e:
-        print(f"Error validating auth token: {e}")
+        logger.error("Error validating auth token: %s", e)
         return None
 
 def check_student_onboarding(
@@ -52,9 +55,7 @@ def check_student_onboarding(
         OnboardingCheckResponse with onboarding status
     """
     try:
-        print(f"=== STUDENT ONBOARDING CHECK DEBUG ===")
-        print(f"Checking onboarding status with JWT token...")
-        print("=====================================")
+        logger.debug("Checking onboarding status with JWT token...")
         
         # 1. Validate authentication token
         if not auth_token:
@@ -77,7 +78,7 @@ def check_student_onboarding(
                 student_info=None
             )
         
-        print(f"Token validated for user ID: {user_data['user_id']}")
+        logger.debug("Token validated for user ID: %s", user_data['user_id'])
         
         # 2. Check if user is a student (should be handled by JWT validation, but double-check)
         if user_data.get("role") != "Student":
@@ -113,7 +114,7 @@ def check_student_onboarding(
         
         # 4. Determine onboarding status
         if not has_section:
-            print(f"Student {user_data['email']} has no section assigned - onboarding incomplete")
+            logger.debug("Student %s has no section assigned - onboarding incomplete", user_data['email'])
             return OnboardingCheckResponse(
                 is_onboarded=False,
                 message="Student onboarding incomplete: section not assigned",
@@ -121,7 +122,7 @@ def check_student_onboarding(
                 student_info=student_info
             )
         
-        print(f"Student {user_data['email']} has section assigned - onboarding complete")
+        logger.debug("Student %s has section assigned - onboarding complete", user_data['email'])
         return OnboardingCheckResponse(
             is_onboarded=True,
             message="Student onboarding complete",
@@ -130,7 +131,7 @@ def check_student_onboarding(
         )
         
     except Exception as e:
-        print(f"Error checking student onboarding: {e}")
+        logger.error("Error checking student onboarding: %s", e)
         return OnboardingCheckResponse(
             is_onboarded=False,
             message=f"Error checking onboarding status: {str(e)}",
@@ -164,5 +165,5 @@ def get_current_student_from_token(auth_token: str, db: Session) -> Optional[dic
         return user_data
         
     except Exception as e:
-        print(f"Error getting current student from token: {e}")
+        logger.error("Error getting current student from token: %s", e)
         return None
@@ -1,4 +1,4 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 import bcrypt
 from datetime import datetime
@@ -124,7 +124,7 @@ def validate_forgot_password_email(request: ForgotPasswordValidationRequest, db:
             errors=[f"Server error: {str(e)}"]
         )
 
-def send_forgot_password_otp(request: ForgotPasswordOTPRequest, db: Session):
+def send_forgot_password_otp(request: ForgotPasswordOTPRequest, db: Session, background_tasks: Optional[BackgroundTasks] = None):
     """
     Send OTP for forgot password
     
@@ -221,7 +221,8 @@ def send_forgot_password_otp(request: ForgotPasswordOTPRequest, db: Session):
             email=user.email,
             first_name=user.first_name,
             password_reset_data=password_reset_data,
-            db=db
+            db=db,
+            background_tasks=background_tasks
         )
         
         if not success:
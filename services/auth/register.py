@@ -1,11 +1,16 @@
 from fastapi import HTTPException
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 import bcrypt
 from datetime import datetime
 from pydantic import BaseModel, EmailStr
 from models import User as UserModel, Student as StudentModel
+from services.face.validator import Base64Image
 from typing import Optional
-import base64
+import logging
+
+logger = logging.getLogger(__name__)
 
 class RegisterRequest(BaseModel):
     first_name: str
@@ -16,7 +21,7 @@ class RegisterRequest(BaseModel):
     birthday: str  # Format: "YYYY-MM-DD"
     contact_number: str
     middle_name: str | None = None
-    face_image: Optional[str] = None  # Base64 encoded image
+    face_image: Optional[Base64Image] = None  # Base64 encoded image, decoded to bytes
 
 class RegistrationValidationRequest(BaseModel):
     """Request model for validating registration fields"""
@@ -49,10 +54,7 @@ def validate_registration_fields(request: RegistrationValidationRequest, db: Ses
         import re
         from datetime import datetime, date
         
-        print(f"=== VALIDATION REQUEST DEBUG ===")
-        print(f"Received request from frontend: {request}")
-        print(f"Time: {datetime.now().strftime('%I:%M %p')}")
-        print("================================")
+        logger.debug("Validating registration fields for %s", request.email)
         
         errors = []
         
@@ -87,52 +89,57 @@ def validate_registration_fields(request: RegistrationValidationRequest, db: Ses
             if len(clean_contact) != 11:
                 errors.append("Contact number must be exactly 11 digits.")
         
-        # 5. Student number validation (required and no duplicates)
-        if not request.student_number or not request.student_number.strip():
-            errors.append("Student number is required.")
-        else:
+        # Look up accounts that already use the student number or email in one query
+        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+        check_student_number = bool(request.student_number and request.student_number.strip())
+        check_email = bool(request.email and request.email.strip() and re.match(email_pattern, request.email))
+        existing_accounts = []
+        lookup_failed = False
+        if check_student_number or check_email:
+            conditions = []
+            if check_student_number:
+                conditions.append(StudentModel.student_number == request.student_number)
+            if check_email:
+                conditions.append(UserModel.email == request.email)
             try:
-                existing_student = db.query(StudentModel).filter(
-                    StudentModel.student_number == request.student_number
-                ).first()
-                if existing_student:
-                    existing_user = db.query(UserModel).filter(
-                        UserModel.id == existing_student.user_id
-                    ).first()
-                    if (
-                        existing_user
-                        and getattr(existing_user, "isDeleted", 0) != 1
-                        and getattr(existing_user, "role", None) == "Student"
-                    ):
-                        errors.append("Student number is already in use.")
+                existing_accounts = db.query(
+                    UserModel.email, UserModel.role, StudentModel.student_number
+                ).outerjoin(
+                    StudentModel, StudentModel.user_id == UserModel.id
+                ).filter(
+                    UserModel.isDeleted != 1,
+                    or_(*conditions)
+                ).all()
             except Exception as e:
-                print(f"[DEBUG] Error checking student number: {e}")
-                errors.append("Database error checking student number.")
+                logger.warning("Error checking existing accounts: %s", e)
+                lookup_failed = True
+        
+        # 5. Student number validation (required and no duplicates)
+        if not check_student_number:
+            errors.append("Student number is required.")
+        elif lookup_failed:
+            errors.append("Database error checking student number.")
+        elif any(
+            account.student_number == request.student_number and account.role == "Student"
+            for account in existing_accounts
+        ):
+            errors.append("Student number is already in use.")
         
         # 6. Email validation (required, domain check, no duplicates)
         if not request.email or not request.email.strip():
             errors.append("Email is required.")
+        elif not check_email:
+            errors.append("Invalid email format.")
         else:
-            # Basic email format validation
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, request.email):
-                errors.append("Invalid email format.")
-            else:
-                # Check PUP domain
-                if not request.email.endswith("@iskolarngbayan.pup.edu.ph"):
-                    errors.append("Email must be a valid PUP email address (@iskolarngbayan.pup.edu.ph).")
-                
-                # Check for duplicates
-                try:
-                    existing_user = db.query(UserModel).filter(
-                        UserModel.email == request.email,
-                        getattr(UserModel, "isDeleted", 0) != 1
-                    ).first()
-                    if existing_user:
-                        errors.append("Email is already in use.")
-                except Exception as e:
-                    print(f"Error checking email: {e}")
-                    errors.append("Database error checking email.")
+            # Check PUP domain
+            if not request.email.endswith("@iskolarngbayan.pup.edu.ph"):
+                errors.append("Email must be a valid PUP email address (@iskolarngbayan.pup.edu.ph).")
+            
+            # Check for duplicates
+            if lookup_failed:
+                errors.append("Database error checking email.")
+            elif any(account.email == request.email for account in existing_accounts):
+                errors.append("Email is already in use.")
         
         # 7. Password validation
         if not request.password or not request.password.strip():
@@ -157,14 +164,14 @@ def validate_registration_fields(request: RegistrationValidationRequest, db: Ses
         
         # Return validation result
         if errors:
-            print(f"Validation failed with errors: {errors}")
+            logger.debug("Validation failed with errors: %s", errors)
             return RegistrationValidationResponse(
                 is_valid=False,
                 message="Validation failed",
                 errors=errors
             )
         
-        print("All fields are valid")
+        logger.debug("All fields are valid")
         return RegistrationValidationResponse(
             is_valid=True,
             message="All fields are valid",
@@ -172,60 +179,45 @@ def validate_registration_fields(request: RegistrationValidationRequest, db: Ses
         )
         
     except Exception as e:
-        print(f"Unexpected error in validation: {e}")
+        logger.error("Unexpected error in validation: %s", e)
         return RegistrationValidationResponse(
             is_valid=False,
             message=f"Validation failed: {str(e)}",
             errors=[f"Server error: {str(e)}"]
         )
 
+def duplicate_registration_detail(error: IntegrityError) -> str:
+    """Map a UNIQUE constraint failure on users.email / students.student_number to a message"""
+    message = str(error.orig).lower()
+    if "email" in message:
+        return "Email is already in use"
+    if "student_number" in message:
+        return "Student number is already in use"
+    return "Email or student number is already in use"
+
 def register_student(request: RegisterRequest, db: Session, is_otp_verified: bool = False):
+    # Duplicate emails and student numbers are rejected by the UNIQUE constraints on
+    # users.email and students.student_number when the rows are written, instead of
+    # being looked up first
     try:
-        # Check if email is already in use
-        existing_user = db.query(UserModel).filter(UserModel.email == request.email).first()
-        if existing_user:
-            raise HTTPException(status_code=409, detail="Email is already in use")
-            
-        # Check if student number is already in use
-        existing_student = db.query(StudentModel).filter(StudentModel.student_number == request.student_number).first()
-        if existing_student:
-            raise HTTPException(status_code=409, detail="Student number is already in use")
-
         # Hash password and prepare user data
         hashed_pw = bcrypt.hashpw(request.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
         birthday_date = datetime.strptime(request.birthday, "%Y-%m-%d").date()
 
-        # Handle face image - decode base64 to bytes for database storage with better error handling
+        # Handle face image - already decoded from base64 by the request model
         face_image_data = None
         if request.face_image:
             try:
-                print(f"=== FACE IMAGE PROCESSING DEBUG ===")
-                print(f"Original face_image length: {len(request.face_image)}")
-                print(f"Face image starts with: {request.face_image[:50]}")
-                
-                # Handle data URI format
-                face_image_b64 = request.face_image
-                if face_image_b64.startswith('data:image'):
-                    print("DEBUG: Removing data URI prefix")
-                    face_image_b64 = face_image_b64.split(',')[1]
-                
-                # Handle base64 padding
-                padding = len(face_image_b64) % 4
-                if padding > 0:
-                    face_image_b64 += '=' * (4 - padding)
-                    print(f"DEBUG: Added {4 - padding} padding characters")
-                
-                # Decode to binary
-                face_image_data = base64.b64decode(face_image_b64)
-                print(f"DEBUG: Decoded to {len(face_image_data)} bytes")
+                face_image_data = request.face_image
+                logger.debug("Decoded to %s bytes", len(face_image_data))
                 
                 # Verify it's a valid image by checking headers
                 if face_image_data[:2] == b'\xff\xd8':
-                    print("DEBUG: Valid JPEG image detected")
+                    logger.debug("Valid JPEG image detected")
                 elif face_image_data[:8] == b'\x89PNG\r\n\x1a\n':
-                    print("DEBUG: Valid PNG image detected")
+                    logger.debug("Valid PNG image detected")
                 else:
-                    print(f"DEBUG: Unknown image format, header: {face_image_data[:10].hex()}")
+                    logger.debug("Unknown image format, header: %s", face_image_data[:10].hex())
                 
                 # Test if we can decode it with OpenCV
                 import numpy as np
@@ -234,16 +226,13 @@ def register_student(request: RegisterRequest, db: Session, is_otp_verified: boo
                 test_image = cv2.imdecode(test_array, cv2.IMREAD_COLOR)
                 
                 if test_image is None:
-                    print("DEBUG: OpenCV cannot decode the processed image")
+                    logger.warning("OpenCV cannot decode the processed image")
                     raise ValueError("Processed image cannot be decoded by OpenCV")
                 else:
-                    print(f"DEBUG: OpenCV validation passed, image shape: {test_image.shape}")
-                
-                print("================================")
+                    logger.debug("OpenCV validation passed, image shape: %s", test_image.shape)
                 
             except Exception as e:
-                print(f"Error processing face image: {e}")
-                print(f"Face image preview: {request.face_image[:100]}")
+                logger.error("Error processing face image: %s", e)
                 raise HTTPException(status_code=400, detail=f"Invalid face image format: {str(e)}")
 
         # Use default status_id = 1 (assuming this is the default student status)
@@ -287,17 +276,16 @@ def register_student(request: RegisterRequest, db: Session, is_otp_verified: boo
         db.commit()
         db.refresh(user)
 
-        # After successful user creation, log the stored face image info
-        if face_image_data:
-            print(f"=== STORED FACE IMAGE VERIFICATION ===")
-            print(f"Stored face image size: {len(face_image_data)} bytes")
-            print(f"Stored image header: {face_image_data[:10].hex()}")
+        # After successful user creation, log the stored face image info (debug only)
+        if face_image_data and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Stored face image size: %s bytes", len(face_image_data))
+            logger.debug("Stored image header: %s", face_image_data[:10].hex())
             
             # Verify we can read it back from the database
             db.refresh(user)
             if user.face_image:
-                print(f"Database stored size: {len(user.face_image)} bytes")
-                print(f"Database header: {user.face_image[:10].hex()}")
+                logger.debug("Database stored size: %s bytes", len(user.face_image))
+                logger.debug("Database header: %s", user.face_image[:10].hex())
                 
                 # Test if we can decode what was stored
                 try:
@@ -307,15 +295,14 @@ def register_student(request: RegisterRequest, db: Session, is_otp_verified: boo
                     db_test_image = cv2.imdecode(db_test_array, cv2.IMREAD_COLOR)
                     
                     if db_test_image is not None:
-                        print(f"✅ Database image verification passed: {db_test_image.shape}")
+                        logger.debug("Database image verification passed: %s", db_test_image.shape)
                     else:
-                        print("❌ WARNING: Database image cannot be decoded!")
+                        logger.warning("Database image cannot be decoded!")
                         
                 except Exception as verify_error:
-                    print(f"❌ Database verification error: {verify_error}")
+                    logger.error("Database verification error: %s", verify_error)
             else:
-                print("❌ WARNING: No face image found in database after storage!")
-            print("====================================")
+                logger.warning("No face image found in database after storage!")
         
         # Return structure that matches the reference implementation
         return {
@@ -327,6 +314,9 @@ def register_student(request: RegisterRequest, db: Session, is_otp_verified: boo
         }
     except HTTPException:
         raise
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=duplicate_registration_detail(e))
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error during registration: {str(e)}")
\ No newline at end of file
@@ -3,6 +3,9 @@ from sqlalchemy import and_, func
 from datetime import datetime, time
 from typing import Dict, Any, List, Optional
 from models import Schedule, Assigned_Course, Course, User
+import logging
+
+logger = logging.getLogger(__name__)
 
 def get_student_schedule(db: Session, student_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -213,15 +216,15 @@ def get_current_semester_attendance(db: Session, student_data: Dict[str, Any]) -
         student_id = student_data.get("user_id")
         section_id = student_data.get("section_id")
         
-        print(f"DEBUG: Current semester attendance - Student ID: {student_id}, Section ID: {section_id}")
+        logger.debug("Current semester attendance - Student ID: %s, Section ID: %s", student_id, section_id)
         
         # Get student record
         student_record = db.query(Student).filter(Student.user_id == student_id).first()
         if not student_record:
-            print(f"DEBUG: Student record not found for user_id: {student_id}")
+            logger.debug("Student record not found for user_id: %s", student_id)
             return {"error": "Student record not found"}
         
-        print(f"DEBUG: Student record found - ID: {student_record.id}")
+        logger.debug("Student record found - ID: %s", student_record.id)
         
         # Get enrolled courses for current semester
         enrolled_courses = db.query(
@@ -245,12 +248,12 @@ def get_current_semester_attendance(db: Session, student_data: Dict[str, Any]) -
             )
         ).all()
         
-        print(f"DEBUG: Found {len(enrolled_courses)} enrolled courses")
+        logger.debug("Found %s enrolled courses", len(enrolled_courses))
         for course in enrolled_courses:
-            print(f"DEBUG: Enrolled course - ID: {course.assigned_course_id}, Name: {course.course_name}, Academic Year: {course.academic_year}, Semester: {course.semester}")
+            logger.debug("Enrolled course - ID: %s, Name: %s, Academic Year: %s, Semester: %s", course.assigned_course_id, course.course_name, course.academic_year, course.semester)
         
         if not enrolled_courses:
-            print("DEBUG: No enrolled courses found")
+            logger.debug("No enrolled courses found")
             return {
                 "success": True,
                 "message": "No enrolled courses found for current semester",
@@ -278,11 +281,11 @@ def get_current_semester_attendance(db: Session, student_data: Dict[str, Any]) -
         current_academic_year = enrolled_courses[0].academic_year
         current_semester = enrolled_courses[0].semester
         
-        print(f"DEBUG: Current academic year: {current_academic_year}, Current semester: {current_semester}")
+        logger.debug("Current academic year: %s, Current semester: %s", current_academic_year, current_semester)
         
         # Get assigned course IDs for enrolled courses
         assigned_course_ids = [course.assigned_course_id for course in enrolled_courses]
-        print(f"DEBUG: Assigned course IDs: {assigned_course_ids}")
+        logger.debug("Assigned course IDs: %s", assigned_course_ids)
         
         # Get attendance logs for current semester
         attendance_logs = db.query(
@@ -317,17 +320,19 @@ def get_current_semester_attendance(db: Session, student_data: Dict[str, Any]) -
             )
         ).order_by(AttendanceLog.date.desc()).all()
         
-        print(f"DEBUG: Found {len(attendance_logs)} attendance logs")
+        logger.debug("Found %s attendance logs", len(attendance_logs))
         for log in attendance_logs[:3]:  # Show first 3 logs for debugging
-            print(f"DEBUG: Attendance log - ID: {log.attendance_id}, Date: {log.attendance_date}, Status: {log.status}, Course: {log.course_name}")
-        
-        # Also check if there are ANY attendance logs for this student
-        all_student_logs = db.query(AttendanceLog).filter(AttendanceLog.user_id == student_id).all()
-        print(f"DEBUG: Total attendance logs for student across all courses: {len(all_student_logs)}")
+            logger.debug("Attendance log - ID: %s, Date: %s, Status: %s, Course: %s", log.attendance_id, log.attendance_date, log.status, log.course_name)
         
-        # Check if there are attendance logs for any of these courses (regardless of student)
-        course_logs = db.query(AttendanceLog).filter(AttendanceLog.assigned_course_id.in_(assigned_course_ids)).all()
-        print(f"DEBUG: Total attendance logs for enrolled courses (all students): {len(course_logs)}")
+        # These counts are only for debugging, so skip the queries unless they are logged
+        if logger.isEnabledFor(logging.DEBUG):
+            # Also check if there are ANY attendance logs for this student
+            all_student_logs = db.query(AttendanceLog).filter(AttendanceLog.user_id == student_id).count()
+            logger.debug("Total attendance logs for student across all courses: %s", all_student_logs)
+            
+            # Check if there are attendance logs for any of these courses (regardless of student)
+            course_logs = db.query(AttendanceLog).filter(AttendanceLog.assigned_course_id.in_(assigned_course_ids)).count()
+            logger.debug("Total attendance logs for enrolled courses (all students): %s", course_logs)
         
         # Process attendance logs
         processed_logs = []
@@ -371,7 +376,7 @@ def get_current_semester_attendance(db: Session, student_data: Dict[str, Any]) -
         
         attendance_percentage = (present_count / total_logs * 100) if total_logs > 0 else 0
         
-        print(f"DEBUG: Attendance summary - Total: {total_logs}, Present: {present_count}, Absent: {absent_count}, Late: {late_count}")
+        logger.debug("Attendance summary - Total: %s, Present: %s, Absent: %s, Late: %s", total_logs, present_count, absent_count, late_count)
         
         return {
             "success": True,
@@ -397,7 +402,5 @@ def get_current_semester_attendance(db: Session, student_data: Dict[str, Any]) -
         }
         
     except Exception as e:
-        print(f"ERROR in get_current_semester_attendance: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_current_semester_attendance: %s", e)
         return {"error": str(e)}
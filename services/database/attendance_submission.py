@@ -1,12 +1,75 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
 from datetime import datetime, time, timedelta
-from typing import Dict, Any, List, Optional
-import base64  # Ensure base64 is imported at module level
+from typing import Dict, Any, List, Optional, NamedTuple
+from cachetools import TTLCache
+import pybase64
+import logging
+import threading
 from models import (
     Student, Assigned_Course_Approval, AttendanceLog, 
     Assigned_Course, Course, Schedule, User
 )
+from services.face.face_matcher import verify_face_against_profile
+
+logger = logging.getLogger(__name__)
+
+class ScheduleSnapshot(NamedTuple):
+    """Detached copy of a Schedule row that can be shared between sessions"""
+    id: int
+    assigned_course_id: int
+    day_of_week: str
+    start_time: Any
+    end_time: Any
+
+# Schedules are edited from the desktop app, which cannot invalidate this process's cache,
+# so entries only live for a few minutes
+SCHEDULE_CACHE_TTL_SECONDS = 300
+_schedule_cache = TTLCache(maxsize=4096, ttl=SCHEDULE_CACHE_TTL_SECONDS)
+_schedule_cache_lock = threading.Lock()
+_NO_SCHEDULE = object()
+
+def get_course_schedule_for_day(
+    db: Session, assigned_course_id: int, day: str, match_substring: bool = False
+) -> Optional[ScheduleSnapshot]:
+    """
+    Get a course's schedule for a weekday, reusing recent lookups
+    
+    Args:
+        db: Database session
+        assigned_course_id: ID of the assigned course
+        day: Weekday name, e.g. "Monday"
+        match_substring: Match day_of_week containing the day instead of equal to it
+        
+    Returns:
+        The first matching schedule, or None if the course does not meet that day
+    """
+    key = (assigned_course_id, day.lower(), match_substring)
+    with _schedule_cache_lock:
+        cached = _schedule_cache.get(key)
+    if cached is not None:
+        return None if cached is _NO_SCHEDULE else cached
+    
+    day_filter = Schedule.day_of_week.ilike(f"%{day}%" if match_substring else day)
+    schedule = db.query(Schedule).filter(
+        and_(
+            Schedule.assigned_course_id == assigned_course_id,
+            day_filter
+        )
+    ).first()
+    snapshot = ScheduleSnapshot(
+        schedule.id, schedule.assigned_course_id, schedule.day_of_week,
+        schedule.start_time, schedule.end_time
+    ) if schedule else None
+    
+    with _schedule_cache_lock:
+        _schedule_cache[key] = snapshot if snapshot else _NO_SCHEDULE
+    return snapshot
+
+def clear_schedule_cache() -> None:
+    """Drop cached schedule lookups"""
+    with _schedule_cache_lock:
+        _schedule_cache.clear()
 
 def validate_attendance_eligibility(
     db: Session, student_data: Dict[str, Any], assigned_course_id: int
@@ -67,12 +130,7 @@ def validate_attendance_eligibility(
         current_day = current_datetime.strftime("%A")
         today_date = current_datetime.date()
         
-        schedule = db.query(Schedule).filter(
-            and_(
-                Schedule.assigned_course_id == assigned_course_id,
-                Schedule.day_of_week.ilike(current_day)
-            )
-        ).first()
+        schedule = get_course_schedule_for_day(db, assigned_course_id, current_day)
         
         if not schedule:
             return {
@@ -152,7 +210,7 @@ def validate_attendance_eligibility(
                 }
             elif existing_attendance.status == "absent":
                 # Has absent status - can update to present/late
-                print(f"DEBUG: Student has 'absent' status, allowing attendance submission to update")
+                logger.debug("Student has 'absent' status, allowing attendance submission to update")
                 # Continue to allow submission (don't return here)
                 pass
             else:
@@ -190,7 +248,7 @@ def validate_attendance_eligibility(
         }
         
     except Exception as e:
-        print(f"Error validating attendance eligibility: {e}")
+        logger.warning("Error validating attendance eligibility: %s", e)
         return {
             "can_submit": False,
             "message": f"Error validating attendance: {str(e)}"
@@ -198,15 +256,19 @@ def validate_attendance_eligibility(
 
 def submit_student_attendance(
     db: Session, student_data: Dict[str, Any], assigned_course_id: int,
-    face_image: str, latitude: Optional[float] = None, longitude: Optional[float] = None
+    face_image: bytes, latitude: Optional[float] = None, longitude: Optional[float] = None,
+    eligibility: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Submit attendance for the student with class-wide attendance management
+    
+    eligibility is a validate_attendance_eligibility result the caller already has;
+    when given, the eligibility checks are not run a second time.
     """
     try:
         student_id = student_data.get("user_id")
         
-        print(f"DEBUG: Starting attendance submission for student {student_id}, course {assigned_course_id}")
+        logger.debug("Starting attendance submission for student %s, course %s", student_id, assigned_course_id)
         
         # Check if this is a faculty member or student
         # First check if this user is the faculty for this course
@@ -218,25 +280,25 @@ def submit_student_attendance(
         ).first()
         
         is_faculty = faculty_check is not None
-        print(f"DEBUG: User is faculty for this course: {is_faculty}")
+        logger.debug("User is faculty for this course: %s", is_faculty)
         
         if is_faculty:
             # Handle faculty attendance submission
             return submit_faculty_attendance(db, student_data, assigned_course_id, face_image, latitude, longitude)
         else:
             # Handle student attendance submission (existing logic)
-            return submit_regular_student_attendance(db, student_data, assigned_course_id, face_image, latitude, longitude)
+            return submit_regular_student_attendance(
+                db, student_data, assigned_course_id, face_image, latitude, longitude, eligibility
+            )
             
     except Exception as e:
         db.rollback()
-        print(f"ERROR in submit_student_attendance: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in submit_student_attendance: %s", e)
         return {"error": f"Error submitting attendance: {str(e)}"}
 
 def submit_faculty_attendance(
     db: Session, faculty_data: Dict[str, Any], assigned_course_id: int,
-    face_image: str, latitude: Optional[float] = None, longitude: Optional[float] = None
+    face_image: bytes, latitude: Optional[float] = None, longitude: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Submit attendance for faculty member
@@ -244,7 +306,7 @@ def submit_faculty_attendance(
     try:
         faculty_id = faculty_data.get("user_id")
         
-        print(f"DEBUG: Starting faculty attendance submission for faculty {faculty_id}, course {assigned_course_id}")
+        logger.debug("Starting faculty attendance submission for faculty %s, course %s", faculty_id, assigned_course_id)
         
         # Verify this user is actually the faculty for this course
         faculty_course = db.query(Assigned_Course).filter(
@@ -263,60 +325,31 @@ def submit_faculty_attendance(
         if not faculty_user:
             return {"error": "Faculty user record not found"}
         
-        print(f"DEBUG: Faculty user: {faculty_user.first_name} {faculty_user.last_name} (ID: {faculty_user.id})")
+        logger.debug("Faculty user: %s %s (ID: %s)", faculty_user.first_name, faculty_user.last_name, faculty_user.id)
         
         # Face verification (same as student)
         if faculty_user.face_image:
-            print(f"Verifying face for faculty: {faculty_user.first_name} {faculty_user.last_name}")
-            print(f"DEBUG: Faculty stored face image size: {len(faculty_user.face_image)} bytes")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Verifying face for faculty %s: stored image %s bytes, header %s",
+                             faculty_user.id, len(faculty_user.face_image), faculty_user.face_image[:10].hex())
             
-            # JPEG debugging for faculty too
             try:
-                header_check = faculty_user.face_image[:10]
-                print(f"DEBUG: Faculty image header: {[hex(b) for b in header_check]}")
-                
-                if faculty_user.face_image[:2] == b'\xff\xd8':
-                    print("DEBUG: Faculty image is JPEG format")
-                elif faculty_user.face_image[:8] == b'\x89PNG\r\n\x1a\n':
-                    print("DEBUG: Faculty image is PNG format")
-                else:
-                    print("DEBUG: Faculty image format unknown")
-                    
-            except Exception as header_error:
-                print(f"DEBUG: Header check failed: {header_error}")
-            
-            try:
-                # Test if we can decode the stored image first
-                import numpy as np
-                import cv2
-                test_array = np.frombuffer(faculty_user.face_image, np.uint8)
-                test_image = cv2.imdecode(test_array, cv2.IMREAD_COLOR)
-                
-                if test_image is None:
-                    print("DEBUG: Cannot decode faculty stored face image")
-                    return {"error": "Profile face image is corrupted. Please re-upload your profile picture."}
-                
-                print(f"DEBUG: Faculty stored image validation passed, shape: {test_image.shape}")
-                
-                # Now proceed with face verification
-                from services.face.face_matcher import verify_face_against_profile
+                # The stored image is only decoded when its profile encoding is not cached
                 is_verified, verification_message = verify_face_against_profile(
                     faculty_user.face_image, face_image
                 )
                 
                 if not is_verified:
-                    print(f"Faculty face verification failed: {verification_message}")
+                    logger.debug("Faculty face verification failed: %s", verification_message)
                     return {"error": f"Face verification failed: {verification_message}"}
                 
-                print("Faculty face verification successful")
+                logger.debug("Faculty face verification successful")
                 
             except Exception as face_error:
-                print(f"Faculty face verification error: {str(face_error)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Faculty face verification error: %s", face_error)
                 return {"error": f"Face verification failed due to technical error: {str(face_error)}"}
         else:
-            print("No faculty profile face image found")
+            logger.debug("No faculty profile face image found")
             return {"error": "No profile face image found. Please upload a profile picture to enable attendance submission."}
         
         # Get schedule information
@@ -324,12 +357,7 @@ def submit_faculty_attendance(
         current_day = current_datetime.strftime("%A")
         today_date = current_datetime.date()
         
-        schedule = db.query(Schedule).filter(
-            and_(
-                Schedule.assigned_course_id == assigned_course_id,
-                Schedule.day_of_week.ilike(current_day)
-            )
-        ).first()
+        schedule = get_course_schedule_for_day(db, assigned_course_id, current_day)
         
         if not schedule:
             return {"error": f"No schedule found for {current_day}"}
@@ -343,14 +371,6 @@ def submit_faculty_attendance(
             )
         ).first()
         
-        # Convert face image to binary
-        try:
-            if face_image.startswith('data:image'):
-                face_image = face_image.split(',')[1]
-            face_image_binary = base64.b64decode(face_image)
-        except Exception as e:
-            return {"error": f"Invalid face image format: {str(e)}"}
-        
         # Faculty is always marked as "present" (no late threshold for faculty)
         attendance_status = "present"
         
@@ -360,15 +380,15 @@ def submit_faculty_attendance(
                 return {"error": "Faculty attendance already submitted for today. Cannot submit again."}
             else:
                 # Update from "absent" to "present"
-                print(f"DEBUG: Updating faculty attendance from {existing_faculty_attendance.status} to {attendance_status}")
+                logger.debug("Updating faculty attendance from %s to %s", existing_faculty_attendance.status, attendance_status)
                 existing_faculty_attendance.status = attendance_status
-                existing_faculty_attendance.image = face_image_binary
+                existing_faculty_attendance.image = face_image
                 existing_faculty_attendance.updated_at = current_datetime
                 
                 try:
                     db.commit()
                     db.refresh(existing_faculty_attendance)
-                    print(f"DEBUG: Faculty attendance record updated with ID: {existing_faculty_attendance.id}")
+                    logger.debug("Faculty attendance record updated with ID: %s", existing_faculty_attendance.id)
                 except Exception as db_error:
                     db.rollback()
                     return {"error": f"Database error: {str(db_error)}"}
@@ -391,7 +411,7 @@ def submit_faculty_attendance(
                 assigned_course_id=assigned_course_id,
                 date=current_datetime,
                 status=attendance_status,
-                image=face_image_binary,
+                image=face_image,
                 created_at=current_datetime,
                 updated_at=current_datetime
             )
@@ -400,7 +420,7 @@ def submit_faculty_attendance(
                 db.add(faculty_record)
                 db.commit()
                 db.refresh(faculty_record)
-                print(f"DEBUG: Faculty attendance record created with ID: {faculty_record.id}")
+                logger.debug("Faculty attendance record created with ID: %s", faculty_record.id)
             except Exception as db_error:
                 db.rollback()
                 return {"error": f"Database error: {str(db_error)}"}
@@ -419,14 +439,13 @@ def submit_faculty_attendance(
         
     except Exception as e:
         db.rollback()
-        print(f"ERROR in submit_faculty_attendance: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in submit_faculty_attendance: %s", e)
         return {"error": f"Error submitting faculty attendance: {str(e)}"}
 
 def submit_regular_student_attendance(
     db: Session, student_data: Dict[str, Any], assigned_course_id: int,
-    face_image: str, latitude: Optional[float] = None, longitude: Optional[float] = None
+    face_image: bytes, latitude: Optional[float] = None, longitude: Optional[float] = None,
+    eligibility: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Submit attendance for regular student (renamed from original function)
@@ -434,11 +453,11 @@ def submit_regular_student_attendance(
     try:
         student_id = student_data.get("user_id")
         
-        # First validate eligibility
-        validation_result = validate_attendance_eligibility(db, student_data, assigned_course_id)
+        # First validate eligibility, unless the caller already did
+        validation_result = eligibility or validate_attendance_eligibility(db, student_data, assigned_course_id)
         if not validation_result.get("can_submit", False):
             error_msg = validation_result.get("message", "Cannot submit attendance")
-            print(f"DEBUG: Validation failed: {error_msg}")
+            logger.debug("Validation failed: %s", error_msg)
             return {"error": error_msg}
         
         # Get student record
@@ -450,133 +469,58 @@ def submit_regular_student_attendance(
         from models import User as UserModel
         logged_in_user = db.query(UserModel).filter(UserModel.id == student_id).first()
         if not logged_in_user:
-            print(f"DEBUG: Logged-in user record not found for user_id {student_id}")
+            logger.debug("Logged-in user record not found for user_id %s", student_id)
             return {"error": "User record not found"}
         
-        print(f"DEBUG: Logged-in user: {logged_in_user.first_name} {logged_in_user.last_name} (ID: {logged_in_user.id})")
+        logger.debug("Logged-in user: %s %s (ID: %s)", logged_in_user.first_name, logged_in_user.last_name, logged_in_user.id)
         
         # Verify face against the logged-in user's stored profile image
         if logged_in_user.face_image:
-            print(f"Verifying face for: {logged_in_user.first_name} {logged_in_user.last_name}")
-            print(f"DEBUG: Stored face image size: {len(logged_in_user.face_image)} bytes")
-            
-            # DETAILED ANALYSIS OF THE STORED IMAGE PROBLEM
-            print(f"=== STORED IMAGE ANALYSIS ===")
-            print(f"Image length: {len(logged_in_user.face_image)}")
-            print(f"First 20 bytes (raw): {logged_in_user.face_image[:20]}")
-            print(f"First 20 bytes (hex): {logged_in_user.face_image[:20].hex()}")
-            print(f"First 50 chars (repr): {repr(logged_in_user.face_image[:50])}")
-            
-            # Check if it looks like text/base64
-            try:
-                first_chars = logged_in_user.face_image[:100].decode('utf-8', errors='ignore')
-                print(f"As UTF-8 text: {repr(first_chars)}")
-                if 'PNG' in first_chars or 'JPEG' in first_chars or 'data:' in first_chars:
-                    print("WARNING: Stored image appears to be text/base64, not binary!")
-            except:
-                print("Cannot decode as UTF-8 - likely binary data")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Verifying face for user %s: stored image %s bytes, header %s, as text %r",
+                             logged_in_user.id, len(logged_in_user.face_image), logged_in_user.face_image[:20].hex(),
+                             logged_in_user.face_image[:50].decode('utf-8', errors='ignore'))
             
             # Check for common image signatures
             if logged_in_user.face_image.startswith(b'data:image'):
-                print("ERROR: Stored image is a data URI! Should be binary.")
+                logger.warning("ERROR: Stored image is a data URI! Should be binary.")
                 return {"error": "Profile image corrupted - stored as text instead of binary. Please re-upload your profile picture."}
             elif logged_in_user.face_image.startswith(b'/9j/'):
-                print("ERROR: Stored image is base64 encoded! Should be binary.")
+                logger.warning("ERROR: Stored image is base64 encoded! Should be binary.")
                 return {"error": "Profile image corrupted - stored as base64 instead of binary. Please re-upload your profile picture."}
-            elif logged_in_user.face_image[:2] == b'\xff\xd8':
-                print("OK: JPEG binary signature detected")
-                image_format = "JPEG"
-            elif logged_in_user.face_image[:8] == b'\x89PNG\r\n\x1a\n':
-                print("OK: PNG binary signature detected")
-                image_format = "PNG"
-            else:
-                print(f"UNKNOWN: Unrecognized image format")
+            elif not (logged_in_user.face_image[:2] == b'\xff\xd8'
+                      or logged_in_user.face_image[:8] == b'\x89PNG\r\n\x1a\n'):
+                logger.debug("Unrecognized stored image format for user %s", logged_in_user.id)
                 # Try to see if it's corrupted base64 or text
                 try:
                     # Maybe it's corrupted base64 without proper padding
-                    test_decode = base64.b64decode(logged_in_user.face_image + b'==')
-                    print(f"Could be corrupted base64 - decoded size: {len(test_decode)}")
+                    test_decode = pybase64.b64decode(logged_in_user.face_image + b'==')
+                    logger.debug("Could be corrupted base64 - decoded size: %s", len(test_decode))
                     if test_decode[:2] == b'\xff\xd8' or test_decode[:8] == b'\x89PNG\r\n\x1a\n':
-                        print("FOUND: Image was stored as base64 text instead of binary!")
+                        logger.debug("FOUND: Image was stored as base64 text instead of binary!")
                         return {"error": "Profile image corrupted - stored as base64 text. Please re-upload your profile picture."}
                 except:
                     pass
                 
                 return {"error": "Profile image format not recognized. Please re-upload your profile picture in JPEG or PNG format."}
-            print(f"========================")
             
             try:
-                # Test decoding with multiple methods and better error handling
-                import numpy as np
-                import cv2
-                test_array = np.frombuffer(logged_in_user.face_image, np.uint8)
-                test_image = cv2.imdecode(test_array, cv2.IMREAD_COLOR)
-                
-                if test_image is None:
-                    print(f"DEBUG: Primary decode failed for {image_format}, trying alternatives...")
-                    # Try with different flags
-                    test_image = cv2.imdecode(test_array, cv2.IMREAD_UNCHANGED)
-                    if test_image is not None:
-                        print(f"DEBUG: Alternative decode succeeded for {image_format}")
-                        # Handle different channel configurations
-                        if len(test_image.shape) == 3:
-                            if test_image.shape[2] == 4:
-                                test_image = cv2.cvtColor(test_image, cv2.COLOR_RGBA2BGR)
-                                print("DEBUG: Converted RGBA to BGR")
-                            elif test_image.shape[2] == 3:
-                                print("DEBUG: 3-channel image, keeping as-is")
-                        elif len(test_image.shape) == 2:
-                            test_image = cv2.cvtColor(test_image, cv2.COLOR_GRAY2BGR)
-                            print("DEBUG: Converted grayscale to BGR")
-                    else:
-                        # Try base64 decode (in case of double encoding)
-                        try:
-                            decoded_bytes = base64.b64decode(logged_in_user.face_image)
-                            alt_array = np.frombuffer(decoded_bytes, np.uint8)
-                            test_image = cv2.imdecode(alt_array, cv2.IMREAD_COLOR)
-                            if test_image is not None:
-                                print("DEBUG: Base64 decode succeeded - image was double-encoded")
-                        except Exception as b64_error:
-                            print(f"DEBUG: Base64 decode failed: {b64_error}")
-                        
-                        # Try PIL as last resort
-                        if test_image is None:
-                            try:
-                                from PIL import Image
-                                import io
-                                pil_image = Image.open(io.BytesIO(logged_in_user.face_image))
-                                test_image = np.array(pil_image)
-                                if len(test_image.shape) == 3 and test_image.shape[2] == 3:
-                                    test_image = cv2.cvtColor(test_image, cv2.COLOR_RGB2BGR)
-                                print(f"DEBUG: PIL decode succeeded for {image_format}")
-                            except Exception as pil_error:
-                                print(f"DEBUG: PIL decode failed: {pil_error}")
-                
-                if test_image is None:
-                    print(f"DEBUG: All decode attempts failed for {image_format} - image corrupted")
-                    return {"error": f"Profile face image is corrupted or in unsupported format ({image_format}). Please re-upload your profile picture as JPEG or PNG."}
-                
-                print(f"DEBUG: Stored {image_format} image validation passed, shape: {test_image.shape}, dtype: {test_image.dtype}")
-                
-                # Now proceed with face verification
-                from services.face.face_matcher import verify_face_against_profile
+                # The stored image is only decoded when its profile encoding is not cached
                 is_verified, verification_message = verify_face_against_profile(
                     logged_in_user.face_image, face_image
                 )
                 
                 if not is_verified:
-                    print(f"Face verification failed: {verification_message}")
+                    logger.debug("Face verification failed: %s", verification_message)
                     return {"error": f"Face verification failed: {verification_message}"}
                 
-                print("Face verification successful")
+                logger.debug("Face verification successful")
                 
             except Exception as face_error:
-                print(f"Face verification error: {str(face_error)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Face verification error: %s", face_error)
                 return {"error": f"Face verification failed due to technical error: {str(face_error)}"}
         else:
-            print("No profile face image found")
+            logger.debug("No profile face image found")
             return {"error": "No profile face image found. Please upload a profile picture with your face to enable attendance submission."}
         
         # Get course and schedule information
@@ -584,15 +528,10 @@ def submit_regular_student_attendance(
         current_day = current_datetime.strftime("%A")
         today_date = current_datetime.date()
         
-        schedule = db.query(Schedule).filter(
-            and_(
-                Schedule.assigned_course_id == assigned_course_id,
-                Schedule.day_of_week.ilike(current_day)
-            )
-        ).first()
+        schedule = get_course_schedule_for_day(db, assigned_course_id, current_day)
         
         if not schedule:
-            print(f"DEBUG: No schedule found for course {assigned_course_id} on {current_day}")
+            logger.debug("No schedule found for course %s on %s", assigned_course_id, current_day)
             return {"error": f"No schedule found for {current_day}"}
         
         # Extract time from schedule
@@ -619,17 +558,7 @@ def submit_regular_student_attendance(
         else:
             attendance_status = "late"
         
-        print(f"DEBUG: Attendance status determined: {attendance_status}")
-        
-        # Convert face image to binary
-        try:
-            if face_image.startswith('data:image'):
-                face_image = face_image.split(',')[1]
-            face_image_binary = base64.b64decode(face_image)
-            print(f"DEBUG: Face image converted to binary, size: {len(face_image_binary)} bytes")
-        except Exception as e:
-            print(f"DEBUG: Face image conversion failed: {str(e)}")
-            return {"error": f"Invalid face image format: {str(e)}"}
+        logger.debug("Attendance status determined: %s", attendance_status)
         
         # Check if current user already has attendance record
         user_existing_attendance = db.query(AttendanceLog).filter(
@@ -649,18 +578,18 @@ def submit_regular_student_attendance(
                 }
             elif user_existing_attendance.status == "absent":
                 # Update from "absent" to current status (classmate scenario)
-                print(f"DEBUG: Classmate updating attendance from 'absent' to {attendance_status}")
+                logger.debug("Classmate updating attendance from 'absent' to %s", attendance_status)
                 user_existing_attendance.status = attendance_status
-                user_existing_attendance.image = face_image_binary
+                user_existing_attendance.image = face_image
                 user_existing_attendance.updated_at = current_datetime
                 
                 try:
                     db.commit()
                     db.refresh(user_existing_attendance)
-                    print(f"DEBUG: Classmate attendance record updated with ID: {user_existing_attendance.id}")
+                    logger.debug("Classmate attendance record updated with ID: %s", user_existing_attendance.id)
                 except Exception as db_error:
                     db.rollback()
-                    print(f"DEBUG: Database error updating classmate attendance: {str(db_error)}")
+                    logger.warning("Database error updating classmate attendance: %s", str(db_error))
                     return {"error": f"Database error: {str(db_error)}"}
                 
                 # Get course information for response
@@ -695,11 +624,11 @@ def submit_regular_student_attendance(
                 }
             else:
                 # Some other status - shouldn't happen but handle gracefully
-                print(f"DEBUG: Unexpected attendance status: {user_existing_attendance.status}")
+                logger.debug("Unexpected attendance status: %s", user_existing_attendance.status)
                 return {"error": f"Unexpected attendance status: {user_existing_attendance.status}"}
         
         # No existing attendance record - create new one
-        print("DEBUG: No existing attendance record found, creating new record")
+        logger.debug("No existing attendance record found, creating new record")
         
         # Check if any attendance records exist for this course today
         existing_attendance_count = db.query(AttendanceLog).filter(
@@ -709,11 +638,11 @@ def submit_regular_student_attendance(
             )
         ).count()
         
-        print(f"DEBUG: Total existing attendance records for today: {existing_attendance_count}")
+        logger.debug("Total existing attendance records for today: %s", existing_attendance_count)
         
         if existing_attendance_count == 0:
             # This is the FIRST submission for the day - create records for everyone
-            print("DEBUG: First attendance submission for today - creating records for all participants")
+            logger.debug("First attendance submission for today - creating records for all participants")
             
             # Get all ENROLLED students for this course
             enrolled_students = db.query(
@@ -741,7 +670,7 @@ def submit_regular_student_attendance(
                 User, Assigned_Course.faculty_id == User.id
             ).filter(Assigned_Course.id == assigned_course_id).first()
             
-            print(f"DEBUG: Found {len(enrolled_students)} enrolled students and 1 faculty for course {assigned_course_id}")
+            logger.debug("Found %s enrolled students and 1 faculty for course %s", len(enrolled_students), assigned_course_id)
             
             attendance_records = []
             submitter_record = None
@@ -755,12 +684,12 @@ def submit_regular_student_attendance(
                         assigned_course_id=assigned_course_id,
                         date=current_datetime,
                         status=attendance_status,
-                        image=face_image_binary,
+                        image=face_image,
                         created_at=current_datetime,
                         updated_at=current_datetime
                     )
                     submitter_record = record
-                    print(f"DEBUG: Creating submitter record for {enrollment.first_name} {enrollment.last_name} (user_id: {enrollment.user_id}) - Status: {attendance_status}")
+                    logger.debug("Creating submitter record for %s %s (user_id: %s) - Status: %s", enrollment.first_name, enrollment.last_name, enrollment.user_id, attendance_status)
                 else:
                     # Other enrolled students - set to absent with no image (they can update this later)
                     record = AttendanceLog(
@@ -772,7 +701,7 @@ def submit_regular_student_attendance(
                         created_at=current_datetime,
                         updated_at=current_datetime
                     )
-                    print(f"DEBUG: Creating absent record for {enrollment.first_name} {enrollment.last_name} (user_id: {enrollment.user_id}) - Can be updated later")
+                    logger.debug("Creating absent record for %s %s (user_id: %s) - Can be updated later", enrollment.first_name, enrollment.last_name, enrollment.user_id)
                 attendance_records.append(record)
             
             # Create attendance record for faculty (always set to absent initially)
@@ -787,35 +716,35 @@ def submit_regular_student_attendance(
                     updated_at=current_datetime
                 )
                 attendance_records.append(faculty_record)
-                print(f"DEBUG: Creating absent record for faculty {faculty_info.faculty_first_name} {faculty_info.faculty_last_name} (user_id: {faculty_info.faculty_id})")
+                logger.debug("Creating absent record for faculty %s %s (user_id: %s)", faculty_info.faculty_first_name, faculty_info.faculty_last_name, faculty_info.faculty_id)
             
             # Bulk insert all attendance records
             try:
                 db.add_all(attendance_records)
                 db.commit()
-                print(f"DEBUG: Successfully created {len(attendance_records)} attendance records")
-                print(f"DEBUG: Submitter's attendance record ID: {submitter_record.id if submitter_record else 'Not found'}")
+                logger.debug("Successfully created %s attendance records", len(attendance_records))
+                logger.debug("Submitter's attendance record ID: %s", submitter_record.id if submitter_record else 'Not found')
             except Exception as db_error:
                 db.rollback()
-                print(f"DEBUG: Database error creating bulk attendance: {str(db_error)}")
+                logger.warning("Database error creating bulk attendance: %s", str(db_error))
                 return {"error": f"Database error: {str(db_error)}"}
             
             # Verify submitter record was created
             if not submitter_record:
-                print(f"ERROR: Submitter record not found in enrolled students!")
+                logger.warning("ERROR: Submitter record not found in enrolled students!")
                 return {"error": "Submitter is not enrolled in this course"}
             
         else:
             # Attendance records already exist but this student doesn't have one yet
             # This shouldn't happen if the first submission created records for everyone,
             # but handle it gracefully
-            print("DEBUG: Attendance records exist but student doesn't have one - creating individual record")
+            logger.debug("Attendance records exist but student doesn't have one - creating individual record")
             submitter_record = AttendanceLog(
                 user_id=student_id,
                 assigned_course_id=assigned_course_id,
                 date=current_datetime,
                 status=attendance_status,
-                image=face_image_binary,
+                image=face_image,
                 created_at=current_datetime,
                 updated_at=current_datetime
             )
@@ -824,10 +753,10 @@ def submit_regular_student_attendance(
                 db.add(submitter_record)
                 db.commit()
                 db.refresh(submitter_record)
-                print(f"DEBUG: Individual attendance record created with ID: {submitter_record.id}")
+                logger.debug("Individual attendance record created with ID: %s", submitter_record.id)
             except Exception as db_error:
                 db.rollback()
-                print(f"DEBUG: Database error creating individual attendance: {str(db_error)}")
+                logger.warning("Database error creating individual attendance: %s", str(db_error))
                 return {"error": f"Database error: {str(db_error)}"}
         
         # Get course information for response
@@ -843,7 +772,7 @@ def submit_regular_student_attendance(
             User, Assigned_Course.faculty_id == User.id
         ).filter(Assigned_Course.id == assigned_course_id).first()
         
-        print(f"DEBUG: Attendance submission successful for {logged_in_user.first_name} {logged_in_user.last_name}")
+        logger.debug("Attendance submission successful for %s %s", logged_in_user.first_name, logged_in_user.last_name)
         
         return {
             "success": True,
@@ -865,9 +794,7 @@ def submit_regular_student_attendance(
         
     except Exception as e:
         db.rollback()
-        print(f"ERROR in submit_student_attendance: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in submit_student_attendance: %s", e)
         return {"error": f"Error submitting attendance: {str(e)}"}
 
 def get_today_attendance_status(db: Session, student_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -905,25 +832,42 @@ def get_today_attendance_status(db: Session, student_data: Dict[str, Any]) -> Di
             )
         ).all()
         
-        courses_status = []
-        
-        for course in enrolled_courses:
-            # Check for today's schedule
-            schedule = db.query(Schedule).filter(
+        # Load today's schedules and attendance for all enrolled courses in one query each,
+        # keeping the first row per course
+        course_ids = [course.assigned_course_id for course in enrolled_courses]
+        schedules_by_course = {}
+        attendance_by_course = {}
+        if course_ids:
+            todays_schedules = db.query(Schedule).filter(
                 and_(
-                    Schedule.assigned_course_id == course.assigned_course_id,
+                    Schedule.assigned_course_id.in_(course_ids),
                     Schedule.day_of_week.ilike(current_day)
                 )
-            ).first()
+            ).order_by(Schedule.id).all()
+            for schedule in todays_schedules:
+                schedules_by_course.setdefault(schedule.assigned_course_id, schedule)
             
-            # Check attendance status
-            attendance = db.query(AttendanceLog).filter(
+            # Only the columns used below, so the stored images are not loaded
+            todays_attendance = db.query(
+                AttendanceLog.id,
+                AttendanceLog.assigned_course_id,
+                AttendanceLog.status,
+                AttendanceLog.created_at
+            ).filter(
                 and_(
                     AttendanceLog.user_id == student_id,
-                    AttendanceLog.assigned_course_id == course.assigned_course_id,
+                    AttendanceLog.assigned_course_id.in_(course_ids),
                     func.date(AttendanceLog.date) == today_date
                 )
-            ).first()
+            ).order_by(AttendanceLog.id).all()
+            for attendance in todays_attendance:
+                attendance_by_course.setdefault(attendance.assigned_course_id, attendance)
+        
+        courses_status = []
+        
+        for course in enrolled_courses:
+            schedule = schedules_by_course.get(course.assigned_course_id)
+            attendance = attendance_by_course.get(course.assigned_course_id)
             
             course_status = {
                 "assigned_course_id": course.assigned_course_id,
@@ -977,5 +921,5 @@ def get_today_attendance_status(db: Session, student_data: Dict[str, Any]) -> Di
         }
         
     except Exception as e:
-        print(f"Error getting today's attendance status: {e}")
+        logger.warning("Error getting today's attendance status: %s", e)
         return {"error": f"Error getting today's attendance status: {str(e)}"}
@@ -2,9 +2,14 @@
 Database creation operations for AttendanceApp API
 Contains database modification and creation operations
 """
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 from models import Student, Section, Assigned_Course, Assigned_Course_Approval
+from services.auth.jwt_service import JWTService
+import logging
+
+logger = logging.getLogger(__name__)
 
 def assign_student_to_section(
     db: Session, 
@@ -67,25 +72,36 @@ def assign_student_to_section(
                 latest_academic_year = max(valid_years, key=lambda x: x[1])[0]
         filtered_courses = [ac for ac in assigned_courses if ac.academic_year == latest_academic_year]
 
-        # Create Assigned_Course_Approval records for each course in latest academic_year
-        approval_records_created = 0
-        for assigned_course in filtered_courses:
-            # Check if approval already exists
-            existing_approval = db.query(Assigned_Course_Approval).filter(
-                Assigned_Course_Approval.assigned_course_id == assigned_course.id,
-                Assigned_Course_Approval.student_id == student.id
-            ).first()
-            if not existing_approval:
-                approval = Assigned_Course_Approval(
-                    assigned_course_id=assigned_course.id,
-                    student_id=student.id,
-                    status="pending"
-                )
-                db.add(approval)
-                approval_records_created += 1
+        # Courses the student already has an approval record for, in one query
+        existing_course_ids = set()
+        if filtered_courses:
+            existing_course_ids = {
+                row.assigned_course_id
+                for row in db.query(Assigned_Course_Approval.assigned_course_id).filter(
+                    Assigned_Course_Approval.assigned_course_id.in_([ac.id for ac in filtered_courses]),
+                    Assigned_Course_Approval.student_id == student.id
+                ).all()
+            }
+
+        # Create Assigned_Course_Approval records for each course in latest academic_year,
+        # as one executemany insert instead of one INSERT per course
+        approval_rows = [
+            {
+                "assigned_course_id": assigned_course.id,
+                "student_id": student.id,
+                "status": "pending"
+            }
+            for assigned_course in filtered_courses
+            if assigned_course.id not in existing_course_ids
+        ]
+        if approval_rows:
+            db.execute(insert(Assigned_Course_Approval), approval_rows)
+        approval_records_created = len(approval_rows)
         # Commit the transaction
         db.commit()
         db.refresh(student)
+        # Section is part of the cached JWT user data
+        JWTService.invalidate_cached_user(student.user_id)
         return {
             "success": True,
             "message": f"Student successfully assigned to section {section.name}",
@@ -98,5 +114,5 @@ def assign_student_to_section(
         
     except Exception as e:
         db.rollback()
-        print(f"Error assigning student to section: {e}")
+        logger.warning("Error assigning student to section: %s", e)
         raise
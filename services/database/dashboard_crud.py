@@ -6,6 +6,18 @@ from models import (
     User, Student, Assigned_Course, Assigned_Course_Approval, 
     Course, Section, Program, Faculty, Schedule
 )
+from cachetools import TTLCache
+import logging
+import orjson
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Current and next class only change at minute granularity and enrollment changes are
+# invalidated explicitly, so clients polling the dashboard reuse this minute's response
+DASHBOARD_CACHE_TTL_SECONDS = 60
+_dashboard_cache = TTLCache(maxsize=5000, ttl=DASHBOARD_CACHE_TTL_SECONDS)
+_dashboard_cache_lock = threading.Lock()
 
 def get_student_dashboard_data(db: Session, current_student: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -89,9 +101,9 @@ def get_student_dashboard_data(db: Session, current_student: Dict[str, Any]) ->
         if latest_semester_query:
             current_academic_year = latest_semester_query.academic_year
             current_semester = latest_semester_query.semester
-            print(f"DEBUG: Latest academic year: {current_academic_year}, semester: {current_semester}")
+            logger.debug("Latest academic year: %s, semester: %s", current_academic_year, current_semester)
         else:
-            print("DEBUG: No enrolled courses found for student")
+            logger.debug("No enrolled courses found for student")
         
         # Find the latest academic year with enrolled courses
         enrolled_approvals = db.query(
@@ -175,7 +187,7 @@ def get_student_dashboard_data(db: Session, current_student: Dict[str, Any]) ->
         )
         enrolled_courses = enrolled_courses_query.all() if current_academic_year and current_semester else []
         
-        print(f"DEBUG: Found {len(enrolled_courses)} enrolled courses for current semester ({current_academic_year} {current_semester})")
+        logger.debug("Found %s enrolled courses for current semester (%s %s)", len(enrolled_courses), current_academic_year, current_semester)
         
         # Get pending approvals count (all pending, not just current semester)
         pending_count = db.query(Assigned_Course_Approval).filter(
@@ -215,12 +227,12 @@ def get_student_dashboard_data(db: Session, current_student: Dict[str, Any]) ->
         
         # Check if we have any assigned course IDs to work with
         if not assigned_course_ids:
-            print("DEBUG: No enrolled courses found for current semester")
+            logger.debug("No enrolled courses found for current semester")
             # If no enrolled courses for current semester, don't show any schedules
             all_section_schedules = []
         
         if assigned_course_ids:
-            print(f"DEBUG: Getting schedules for {len(assigned_course_ids)} enrolled courses")
+            logger.debug("Getting schedules for %s enrolled courses", len(assigned_course_ids))
             # Get ALL schedules for enrolled courses (for calendar filtering)
             all_schedules_query = db.query(
                 Schedule.id.label("schedule_id"),
@@ -243,7 +255,7 @@ def get_student_dashboard_data(db: Session, current_student: Dict[str, Any]) ->
                 Schedule.assigned_course_id.in_(assigned_course_ids)
             ).order_by(Schedule.day_of_week, Schedule.start_time).all()
             
-            print(f"DEBUG: Found {len(all_schedules_query)} total schedules for enrolled courses")
+            logger.debug("Found %s total schedules for enrolled courses", len(all_schedules_query))
             
             # Process all schedules for enrolled courses
             for schedule in all_schedules_query:
@@ -306,7 +318,7 @@ def get_student_dashboard_data(db: Session, current_student: Dict[str, Any]) ->
                 if is_today:
                     today_schedule.append(schedule_item)
         
-        print(f"DEBUG: Today's schedule has {len(today_schedule)} classes")
+        logger.debug("Today's schedule has %s classes", len(today_schedule))
         
         # Find current and next class from today's schedule
         current_class = None
@@ -390,5 +402,36 @@ def get_student_dashboard_data(db: Session, current_student: Dict[str, Any]) ->
         return dashboard_data
         
     except Exception as e:
-        print(f"Error getting student dashboard data: {e}")
+        logger.warning("Error getting student dashboard data: %s", e)
         raise
+
+def get_student_dashboard_json(db: Session, current_student: Dict[str, Any]) -> bytes:
+    """
+    Get the student dashboard as encoded JSON, reusing this minute's response
+    
+    Args:
+        db: Database session
+        current_student: Current student data from JWT
+        
+    Returns:
+        The get_student_dashboard_data payload encoded with orjson
+    """
+    key = (current_student["user_id"], datetime.now().replace(second=0, microsecond=0))
+    with _dashboard_cache_lock:
+        cached = _dashboard_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    dashboard_json = orjson.dumps(
+        get_student_dashboard_data(db, current_student),
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+    with _dashboard_cache_lock:
+        _dashboard_cache[key] = dashboard_json
+    return dashboard_json
+
+def invalidate_student_dashboard(student_user_id: int) -> None:
+    """Drop a student's cached dashboard after their section or enrollment changes"""
+    with _dashboard_cache_lock:
+        for key in [key for key in _dashboard_cache.keys() if key[0] == student_user_id]:
+            _dashboard_cache.pop(key, None)
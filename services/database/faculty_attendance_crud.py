@@ -6,6 +6,9 @@ from models import (
     User, Faculty, Assigned_Course, Course, Section, Program,
     Assigned_Course_Approval, AttendanceLog, Status, Student
 )
+import logging
+
+logger = logging.getLogger(__name__)
 
 def get_faculty_attendance_history(db: Session, faculty_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -30,7 +33,7 @@ def get_faculty_attendance_history(db: Session, faculty_data: Dict[str, Any]) ->
             raise ValueError("Faculty record not found for this user")
         
         # Get all attendance logs for courses assigned to this faculty
-        print(f"Fetching attendance records for faculty user_id: {user_id}")
+        logger.debug("Fetching attendance records for faculty user_id: %s", user_id)
         attendance_query = db.query(
             AttendanceLog,
             Assigned_Course,
@@ -60,7 +63,7 @@ def get_faculty_attendance_history(db: Session, faculty_data: Dict[str, Any]) ->
             )
         ).order_by(AttendanceLog.date.desc()).all()
         
-        print(f"Found {len(attendance_query)} attendance records for faculty")
+        logger.debug("Found %s attendance records for faculty", len(attendance_query))
         
         # Process attendance records
         attendance_records = []
@@ -222,7 +225,7 @@ def get_faculty_attendance_history(db: Session, faculty_data: Dict[str, Any]) ->
             "employee_number": faculty.employee_number
         }
         
-        print(f"Successfully retrieved {total_sessions} attendance records across {len(course_summary)} courses")
+        logger.debug("Successfully retrieved %s attendance records across %s courses", total_sessions, len(course_summary))
         
         return {
             "success": True,
@@ -237,9 +240,7 @@ def get_faculty_attendance_history(db: Session, faculty_data: Dict[str, Any]) ->
         }
         
     except Exception as e:
-        print(f"Error getting faculty attendance history: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error getting faculty attendance history: %s", e)
         raise
 
 def get_faculty_current_semester_attendance(db: Session, faculty_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -256,15 +257,15 @@ def get_faculty_current_semester_attendance(db: Session, faculty_data: Dict[str,
     try:
         user_id = faculty_data.get("user_id")
         
-        print(f"DEBUG: Faculty current semester attendance - Faculty ID: {user_id}")
+        logger.debug("Faculty current semester attendance - Faculty ID: %s", user_id)
         
         # Get faculty record
         faculty = db.query(Faculty).filter(Faculty.user_id == user_id).first()
         if not faculty:
-            print(f"DEBUG: Faculty record not found for user_id: {user_id}")
+            logger.debug("Faculty record not found for user_id: %s", user_id)
             return {"error": "Faculty record not found"}
         
-        print(f"DEBUG: Faculty record found - ID: {faculty.id}")
+        logger.debug("Faculty record found - ID: %s", faculty.id)
         
         # Get current semester courses assigned to this faculty
         current_courses = db.query(
@@ -287,12 +288,12 @@ def get_faculty_current_semester_attendance(db: Session, faculty_data: Dict[str,
             Assigned_Course.semester.desc()
         ).all()
         
-        print(f"DEBUG: Found {len(current_courses)} courses assigned to faculty")
+        logger.debug("Found %s courses assigned to faculty", len(current_courses))
         for course in current_courses:
-            print(f"DEBUG: Assigned course - ID: {course.assigned_course_id}, Name: {course.course_name}, Academic Year: {course.academic_year}, Semester: {course.semester}")
+            logger.debug("Assigned course - ID: %s, Name: %s, Academic Year: %s, Semester: %s", course.assigned_course_id, course.course_name, course.academic_year, course.semester)
         
         if not current_courses:
-            print("DEBUG: No courses assigned to faculty")
+            logger.debug("No courses assigned to faculty")
             return {
                 "success": True,
                 "message": "No courses assigned to faculty for current semester",
@@ -320,7 +321,7 @@ def get_faculty_current_semester_attendance(db: Session, faculty_data: Dict[str,
         current_academic_year = current_courses[0].academic_year
         current_semester = current_courses[0].semester
         
-        print(f"DEBUG: Current academic year: {current_academic_year}, Current semester: {current_semester}")
+        logger.debug("Current academic year: %s, Current semester: %s", current_academic_year, current_semester)
         
         # Filter courses to current semester only
         current_semester_courses = [c for c in current_courses 
@@ -329,7 +330,7 @@ def get_faculty_current_semester_attendance(db: Session, faculty_data: Dict[str,
         
         # Get assigned course IDs for current semester
         assigned_course_ids = [course.assigned_course_id for course in current_semester_courses]
-        print(f"DEBUG: Current semester assigned course IDs: {assigned_course_ids}")
+        logger.debug("Current semester assigned course IDs: %s", assigned_course_ids)
         
         # Get attendance logs for current semester courses
         attendance_logs = db.query(
@@ -364,9 +365,9 @@ def get_faculty_current_semester_attendance(db: Session, faculty_data: Dict[str,
             AttendanceLog.assigned_course_id.in_(assigned_course_ids)
         ).order_by(AttendanceLog.date.desc()).all()
         
-        print(f"DEBUG: Found {len(attendance_logs)} attendance logs for current semester")
+        logger.debug("Found %s attendance logs for current semester", len(attendance_logs))
         for log in attendance_logs[:3]:  # Show first 3 logs for debugging
-            print(f"DEBUG: Attendance log - ID: {log.attendance_id}, Date: {log.attendance_date}, Status: {log.status}, Course: {log.course_name}, Attendee: {log.attendee_first_name} {log.attendee_last_name}")
+            logger.debug("Attendance log - ID: %s, Date: %s, Status: %s, Course: %s, Attendee: %s %s", log.attendance_id, log.attendance_date, log.status, log.course_name, log.attendee_first_name, log.attendee_last_name)
         
         # Process attendance logs
         processed_logs = []
@@ -417,7 +418,7 @@ def get_faculty_current_semester_attendance(db: Session, faculty_data: Dict[str,
         
         attendance_percentage = (present_count / total_logs * 100) if total_logs > 0 else 0
         
-        print(f"DEBUG: Attendance summary - Total: {total_logs}, Present: {present_count}, Absent: {absent_count}, Late: {late_count}")
+        logger.debug("Attendance summary - Total: %s, Present: %s, Absent: %s, Late: %s", total_logs, present_count, absent_count, late_count)
         
         # Get faculty user info
         faculty_user = db.query(User).filter(User.id == user_id).first()
@@ -446,7 +447,5 @@ def get_faculty_current_semester_attendance(db: Session, faculty_data: Dict[str,
         }
         
     except Exception as e:
-        print(f"ERROR in get_faculty_current_semester_attendance: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_faculty_current_semester_attendance: %s", e)
         return {"error": str(e)}
@@ -2,12 +2,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, func, desc
 from datetime import datetime, date, time, timedelta
 from typing import Dict, Any, Optional
-import base64
-
+import logging
 from models import (
     User, Faculty, Assigned_Course, Course, Section, Program, 
     Schedule, AttendanceLog, Assigned_Course_Approval, Student
 )
+from services.database.attendance_submission import get_course_schedule_for_day
+
+logger = logging.getLogger(__name__)
 
 def validate_faculty_attendance_eligibility(
     db: Session, 
@@ -26,20 +28,14 @@ def validate_faculty_attendance_eligibility(
         Dictionary containing validation result
     """
     try:
-        print(f"=== FACULTY ATTENDANCE VALIDATION DEBUG ===")
-        print(f"Faculty user ID: {current_faculty.get('user_id')}")
-        print(f"Faculty name: {current_faculty.get('name')}")
-        print(f"Assigned course ID: {assigned_course_id}")
-        
         faculty_user_id = current_faculty.get("user_id")
         current_datetime = datetime.now()
         current_date = current_datetime.date()
         current_time = current_datetime.time()
         current_day = current_datetime.strftime("%A")
         
-        print(f"Current datetime: {current_datetime}")
-        print(f"Current date: {current_date}")
-        print(f"Current day: {current_day}")
+        logger.debug("Validating faculty attendance for user %s, course %s on %s %s",
+                     faculty_user_id, assigned_course_id, current_day, current_datetime)
         
         # 1. Check if faculty is assigned to teach this course
         assigned_course = db.query(Assigned_Course).filter(
@@ -50,12 +46,12 @@ def validate_faculty_attendance_eligibility(
             )
         ).first()
         
-        print(f"Assigned course found: {assigned_course is not None}")
+        logger.debug("Assigned course found: %s", assigned_course is not None)
         if assigned_course:
-            print(f"Assigned course details: ID={assigned_course.id}, faculty_id={assigned_course.faculty_id}, course_id={assigned_course.course_id}")
+            logger.debug("Assigned course details: ID=%s, faculty_id=%s, course_id=%s", assigned_course.id, assigned_course.faculty_id, assigned_course.course_id)
         
         if not assigned_course:
-            print("ERROR: Faculty not authorized for this course")
+            logger.debug("Faculty not authorized for this course")
             return {
                 "can_submit": False,
                 "message": "You are not authorized to submit attendance for this course",
@@ -64,7 +60,7 @@ def validate_faculty_attendance_eligibility(
             }
         
         # 2. Get course information
-        print("Getting course information...")
+        logger.debug("Getting course information...")
         course_info = db.query(
             Course.name.label("course_name"),
             Course.code.label("course_code"),
@@ -81,14 +77,14 @@ def validate_faculty_attendance_eligibility(
             Assigned_Course.id == assigned_course_id
         ).first()
         
-        print(f"Course info found: {course_info is not None}")
+        logger.debug("Course info found: %s", course_info is not None)
         if course_info:
-            print(f"Course details: {course_info.course_name} ({course_info.course_code})")
-            print(f"Section: {course_info.section_name}")
-            print(f"Program: {course_info.program_name} ({course_info.program_acronym})")
+            logger.debug("Course details: %s (%s)", course_info.course_name, course_info.course_code)
+            logger.debug("Section: %s", course_info.section_name)
+            logger.debug("Program: %s (%s)", course_info.program_name, course_info.program_acronym)
         
         # 3. Check for existing attendance today
-        print("Checking for existing attendance...")
+        logger.debug("Checking for existing attendance...")
         existing_attendance = db.query(AttendanceLog).filter(
             and_(
                 AttendanceLog.user_id == faculty_user_id,
@@ -97,9 +93,9 @@ def validate_faculty_attendance_eligibility(
             )
         ).first()
         
-        print(f"Existing attendance found: {existing_attendance is not None}")
+        logger.debug("Existing attendance found: %s", existing_attendance is not None)
         if existing_attendance:
-            print(f"Existing attendance: ID={existing_attendance.id}, status={existing_attendance.status}")
+            logger.debug("Existing attendance: ID=%s, status=%s", existing_attendance.id, existing_attendance.status)
             return {
                 "can_submit": False,
                 "message": f"You have already submitted attendance for {course_info.course_name} today",
@@ -112,22 +108,17 @@ def validate_faculty_attendance_eligibility(
             }
         
         # 4. Check if there's a schedule for today
-        print("Checking for today's schedule...")
-        schedule_query = db.query(Schedule).filter(
-            and_(
-                Schedule.assigned_course_id == assigned_course_id,
-                Schedule.day_of_week.ilike(f"%{current_day}%")
-            )
-        ).first()
+        logger.debug("Checking for today's schedule...")
+        schedule_query = get_course_schedule_for_day(db, assigned_course_id, current_day, match_substring=True)
         
-        print(f"Schedule found for {current_day}: {schedule_query is not None}")
+        logger.debug("Schedule found for %s: %s", current_day, schedule_query is not None)
         if schedule_query:
-            print(f"Schedule details: ID={schedule_query.id}, day={schedule_query.day_of_week}")
-            print(f"Start time: {schedule_query.start_time}")
-            print(f"End time: {schedule_query.end_time}")
+            logger.debug("Schedule details: ID=%s, day=%s", schedule_query.id, schedule_query.day_of_week)
+            logger.debug("Start time: %s", schedule_query.start_time)
+            logger.debug("End time: %s", schedule_query.end_time)
         
         if not schedule_query:
-            print(f"ERROR: No class scheduled for {current_day}")
+            logger.debug("No class scheduled for %s", current_day)
             return {
                 "can_submit": False,
                 "message": f"No class scheduled for {current_day} in {course_info.course_name}",
@@ -139,8 +130,8 @@ def validate_faculty_attendance_eligibility(
         start_datetime = schedule_query.start_time if isinstance(schedule_query.start_time, datetime) else schedule_query.start_time
         end_datetime = schedule_query.end_time if isinstance(schedule_query.end_time, datetime) else schedule_query.end_time
         
-        print(f"Start datetime type: {type(start_datetime)}, value: {start_datetime}")
-        print(f"End datetime type: {type(end_datetime)}, value: {end_datetime}")
+        logger.debug("Start datetime type: %s, value: %s", type(start_datetime), start_datetime)
+        logger.debug("End datetime type: %s, value: %s", type(end_datetime), end_datetime)
         
         # Extract time portion
         if isinstance(start_datetime, datetime):
@@ -153,27 +144,27 @@ def validate_faculty_attendance_eligibility(
         else:
             end_time = end_datetime
         
-        print(f"Extracted start time: {start_time}")
-        print(f"Extracted end time: {end_time}")
+        logger.debug("Extracted start time: %s", start_time)
+        logger.debug("Extracted end time: %s", end_time)
         
         # Create datetime objects for comparison
         today_start = datetime.combine(current_date, start_time)
         today_end = datetime.combine(current_date, end_time)
         
-        print(f"Today start: {today_start}")
-        print(f"Today end: {today_end}")
+        logger.debug("Today start: %s", today_start)
+        logger.debug("Today end: %s", today_end)
         
         # Handle overnight classes
         if end_time < start_time:
             today_end = today_end + timedelta(days=1)
-            print(f"Overnight class detected, adjusted end time: {today_end}")
+            logger.debug("Overnight class detected, adjusted end time: %s", today_end)
         
         # Allow submission from 15 minutes before class until 30 minutes after class ends
         submission_start = today_start - timedelta(minutes=15)
         submission_end = today_end + timedelta(minutes=30)
         
-        print(f"Submission window: {submission_start} to {submission_end}")
-        print(f"Current time within window: {submission_start <= current_datetime <= submission_end}")
+        logger.debug("Submission window: %s to %s", submission_start, submission_end)
+        logger.debug("Current time within window: %s", submission_start <= current_datetime <= submission_end)
         
         schedule_info = {
             "schedule_id": schedule_query.id,
@@ -188,7 +179,7 @@ def validate_faculty_attendance_eligibility(
         }
         
         if current_datetime < submission_start:
-            print("ERROR: Too early to submit")
+            logger.debug("Too early to submit")
             return {
                 "can_submit": False,
                 "message": f"Attendance submission for {course_info.course_name} will open 15 minutes before class starts at {start_time.strftime('%H:%M')}",
@@ -197,7 +188,7 @@ def validate_faculty_attendance_eligibility(
             }
         
         if current_datetime > submission_end:
-            print("ERROR: Too late to submit")
+            logger.debug("Too late to submit")
             return {
                 "can_submit": False,
                 "message": f"Attendance submission window for {course_info.course_name} has closed (ended 30 minutes after class)",
@@ -210,9 +201,8 @@ def validate_faculty_attendance_eligibility(
         if current_datetime > today_end:
             status = "late"
         
-        print(f"Determined status: {status}")
-        print("SUCCESS: Can submit attendance")
-        print("==========================================")
+        logger.debug("Determined status: %s", status)
+        logger.debug("SUCCESS: Can submit attendance")
         
         return {
             "can_submit": True,
@@ -222,9 +212,7 @@ def validate_faculty_attendance_eligibility(
         }
         
     except Exception as e:
-        print(f"ERROR in faculty attendance validation: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in faculty attendance validation: %s", e)
         return {
             "can_submit": False,
             "message": f"Error validating attendance eligibility: {str(e)}",
@@ -236,12 +224,16 @@ def submit_faculty_attendance(
     db: Session,
     current_faculty: Dict[str, Any],
     assigned_course_id: int,
-    face_image: str,
+    face_image: bytes,
     latitude: Optional[float] = None,
-    longitude: Optional[float] = None
+    longitude: Optional[float] = None,
+    eligibility: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Submit faculty attendance for a specific course (with first-time submission logic)
+    
+    eligibility is a validate_faculty_attendance_eligibility result the caller already
+    has; when given, the eligibility checks are not run a second time.
     """
     try:
         faculty_user_id = current_faculty.get("user_id")
@@ -249,8 +241,8 @@ def submit_faculty_attendance(
         current_date = current_datetime.date()
         current_day = current_datetime.strftime("%A")
 
-        # Validate eligibility
-        validation_result = validate_faculty_attendance_eligibility(db, current_faculty, assigned_course_id)
+        # Validate eligibility, unless the caller already did
+        validation_result = eligibility or validate_faculty_attendance_eligibility(db, current_faculty, assigned_course_id)
         if not validation_result.get("can_submit", False):
             return {"error": validation_result.get("message", "Cannot submit attendance")}
 
@@ -266,12 +258,7 @@ def submit_faculty_attendance(
             return {"error": "Course assignment not found"}
 
         # Get schedule for today
-        schedule_query = db.query(Schedule).filter(
-            and_(
-                Schedule.assigned_course_id == assigned_course_id,
-                Schedule.day_of_week.ilike(f"%{current_day}%")
-            )
-        ).first()
+        schedule_query = get_course_schedule_for_day(db, assigned_course_id, current_day, match_substring=True)
         if not schedule_query:
             return {"error": f"No schedule found for {current_day}"}
 
@@ -290,14 +277,6 @@ def submit_faculty_attendance(
         # Determine status
         status = "present" if current_datetime <= today_end else "late"
 
-        # Convert face image to binary
-        try:
-            if face_image.startswith('data:image'):
-                face_image = face_image.split(',')[1]
-            face_image_binary = base64.b64decode(face_image)
-        except Exception as e:
-            return {"error": f"Invalid face image format: {str(e)}"}
-
         # Check if any attendance records exist for this course today
         existing_attendance_count = db.query(AttendanceLog).filter(
             and_(
@@ -338,7 +317,7 @@ def submit_faculty_attendance(
                 assigned_course_id=assigned_course_id,
                 date=current_datetime,
                 status=status,
-                image=face_image_binary,
+                image=face_image,
                 created_at=current_datetime,
                 updated_at=current_datetime
             )
@@ -366,7 +345,7 @@ def submit_faculty_attendance(
                 assigned_course_id=assigned_course_id,
                 date=current_datetime,
                 status=status,
-                image=face_image_binary,
+                image=face_image,
                 created_at=current_datetime,
                 updated_at=current_datetime
             )
@@ -416,8 +395,7 @@ def submit_faculty_attendance(
         }
     except Exception as e:
         db.rollback()
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error submitting faculty attendance: %s", e)
         return {"error": f"Failed to submit attendance: {str(e)}"}
 
 def get_faculty_today_attendance_status(
@@ -470,7 +448,10 @@ def get_faculty_today_attendance_status(
         # Get today's schedules for these courses
         assigned_course_ids = [course.assigned_course_id for course in assigned_courses_query]
         
+        course_info_by_id = {course.assigned_course_id: course for course in assigned_courses_query}
+        
         today_schedules = []
+        today_attendance = []
         if assigned_course_ids:
             schedules_query = db.query(Schedule).filter(
                 and_(
@@ -481,10 +462,7 @@ def get_faculty_today_attendance_status(
             
             for schedule in schedules_query:
                 # Find corresponding course info
-                course_info = next(
-                    (c for c in assigned_courses_query if c.assigned_course_id == schedule.assigned_course_id), 
-                    None
-                )
+                course_info = course_info_by_id.get(schedule.assigned_course_id)
                 
                 if course_info:
                     today_schedules.append({
@@ -501,14 +479,20 @@ def get_faculty_today_attendance_status(
                         "semester": course_info.semester
                     })
         
-        # Get today's attendance records for faculty
-        today_attendance = db.query(AttendanceLog).filter(
-            and_(
-                AttendanceLog.user_id == faculty_user_id,
-                AttendanceLog.assigned_course_id.in_(assigned_course_ids) if assigned_course_ids else False,
-                func.date(AttendanceLog.date) == current_date
-            )
-        ).all()
+            # Get today's attendance records for faculty (only the columns used below,
+            # so the stored images are not loaded)
+            today_attendance = db.query(
+                AttendanceLog.id,
+                AttendanceLog.assigned_course_id,
+                AttendanceLog.status,
+                AttendanceLog.created_at
+            ).filter(
+                and_(
+                    AttendanceLog.user_id == faculty_user_id,
+                    AttendanceLog.assigned_course_id.in_(assigned_course_ids),
+                    func.date(AttendanceLog.date) == current_date
+                )
+            ).all()
         
         # Map attendance to courses
         attendance_by_course = {att.assigned_course_id: att for att in today_attendance}
@@ -538,9 +522,11 @@ def get_faculty_today_attendance_status(
             
             courses_status.append(course_status)
         
-        # Prepare faculty info
-        faculty_user = db.query(User).filter(User.id == faculty_user_id).first()
-        faculty_record = db.query(Faculty).filter(Faculty.user_id == faculty_user_id).first()
+        # Prepare faculty info (user and faculty rows in one query)
+        faculty_row = db.query(User, Faculty).outerjoin(
+            Faculty, Faculty.user_id == User.id
+        ).filter(User.id == faculty_user_id).first()
+        faculty_user, faculty_record = faculty_row if faculty_row else (None, None)
         
         faculty_info = {
             "user_id": faculty_user_id,
@@ -570,7 +556,7 @@ def get_faculty_today_attendance_status(
         }
         
     except Exception as e:
-        print(f"Error getting faculty today attendance status: {e}")
+        logger.warning("Error getting faculty today attendance status: %s", e)
         return {
             "success": False,
             "message": f"Error getting today's attendance status: {str(e)}",
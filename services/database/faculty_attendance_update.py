@@ -8,6 +8,9 @@ from sqlalchemy import and_
 from datetime import datetime
 from typing import Dict, Any
 from models import AttendanceLog, Assigned_Course, Faculty, User, Student, Course, Section, Program
+import logging
+
+logger = logging.getLogger(__name__)
 
 def update_attendance_status_record(
     db: Session, 
@@ -30,12 +33,10 @@ def update_attendance_status_record(
         Dict containing update result or error
     """
     try:
-        print(f"=== ATTENDANCE UPDATE DEBUG ===")
-        print(f"Faculty ID: {current_faculty.get('user_id')}")
-        print(f"Assigned Course ID: {assigned_course_id}")
-        print(f"Attendance ID: {attendance_id}")
-        print(f"New Status: {new_status}")
-        print("===============================")
+        logger.debug("Faculty ID: %s", current_faculty.get('user_id'))
+        logger.debug("Assigned Course ID: %s", assigned_course_id)
+        logger.debug("Attendance ID: %s", attendance_id)
+        logger.debug("New Status: %s", new_status)
         
         # 1. Validate new status
         valid_statuses = ["present", "absent", "late"]
@@ -93,7 +94,7 @@ def update_attendance_status_record(
         # 9. Commit the changes
         db.commit()
         
-        print(f"Attendance status updated: {old_status} -> {new_status}")
+        logger.debug("Attendance status updated: %s -> %s", old_status, new_status)
         
         # 10. Prepare response data
         student_info = None
@@ -131,7 +132,7 @@ def update_attendance_status_record(
         }
         
     except Exception as e:
-        print(f"Error in update_attendance_status_record: {str(e)}")
+        logger.warning("Error in update_attendance_status_record: %s", str(e))
         db.rollback()
         return {"error": f"Failed to update attendance status: {str(e)}"}
 
@@ -163,7 +164,7 @@ def validate_faculty_course_permission(
         return assigned_course is not None
         
     except Exception as e:
-        print(f"Error validating faculty course permission: {str(e)}")
+        logger.warning("Error validating faculty course permission: %s", str(e))
         return False
 
 def get_attendance_record_info(
@@ -240,5 +241,5 @@ def get_attendance_record_info(
         }
         
     except Exception as e:
-        print(f"Error getting attendance record info: {str(e)}")
+        logger.warning("Error getting attendance record info: %s", str(e))
         return {"error": f"Failed to get attendance record information: {str(e)}"}
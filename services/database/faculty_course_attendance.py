@@ -6,6 +6,9 @@ from models import (
 )
 from typing import Dict, Any, List, Optional
 from datetime import datetime, date
+import logging
+
+logger = logging.getLogger(__name__)
 
 def get_faculty_course_attendance_records(
     db: Session, 
@@ -30,10 +33,9 @@ def get_faculty_course_attendance_records(
         Dict containing course attendance records and metadata
     """
     try:
-        print(f"=== FACULTY COURSE ATTENDANCE DEBUG ===")
-        print(f"Faculty User ID: {current_faculty.get('user_id')}")
-        print(f"Assigned Course ID: {assigned_course_id}")
-        print(f"Filters - Academic Year: {academic_year}, Month: {month}, Day: {day}")
+        logger.debug("Faculty User ID: %s", current_faculty.get('user_id'))
+        logger.debug("Assigned Course ID: %s", assigned_course_id)
+        logger.debug("Filters - Academic Year: %s, Month: %s, Day: %s", academic_year, month, day)
         
         # Get faculty record
         faculty_query = db.query(Faculty).filter(Faculty.user_id == current_faculty["user_id"]).first()
@@ -74,7 +76,7 @@ def get_faculty_course_attendance_records(
         (assigned_course, course, section, program, 
          faculty_user_id, faculty_first_name, faculty_last_name, faculty_email) = course_query
         
-        print(f"✓ Course found: {course.name}")
+        logger.debug("Course found: %s", course.name)
         
         # Prepare course information
         course_info = {
@@ -161,7 +163,7 @@ def get_faculty_course_attendance_records(
         
         attendance_results = attendance_query.all()
         
-        print(f"✓ Found {len(attendance_results)} attendance records")
+        logger.debug("Found %s attendance records", len(attendance_results))
         
         # Process attendance records
         attendance_records = []
@@ -205,8 +207,8 @@ def get_faculty_course_attendance_records(
         # Get available filter options
         available_filters = get_available_filter_options(db, assigned_course_id)
         
-        print(f"✓ Attendance summary: {attendance_summary}")
-        print(f"✓ Available filters: {available_filters}")
+        logger.debug("Attendance summary: %s", attendance_summary)
+        logger.debug("Available filters: %s", available_filters)
         
         return {
             "success": True,
@@ -224,9 +226,7 @@ def get_faculty_course_attendance_records(
         }
         
     except Exception as e:
-        print(f"ERROR in get_faculty_course_attendance_records: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_faculty_course_attendance_records: %s", e)
         return {"error": f"Database error: {str(e)}"}
 
 def get_available_filter_options(db: Session, assigned_course_id: int) -> Dict[str, List[str]]:
@@ -275,7 +275,7 @@ def get_available_filter_options(db: Session, assigned_course_id: int) -> Dict[s
         }
         
     except Exception as e:
-        print(f"Error getting available filter options: {str(e)}")
+        logger.warning("Error getting available filter options: %s", str(e))
         return {
             "years": [],
             "months": [],
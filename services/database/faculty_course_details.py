@@ -6,6 +6,9 @@ from models import (
 )
 from typing import Dict, Any, List
 from datetime import datetime, date
+import logging
+
+logger = logging.getLogger(__name__)
 
 def get_faculty_course_details(db: Session, current_faculty: Dict[str, Any], assigned_course_id: int) -> Dict[str, Any]:
     """
@@ -20,7 +23,7 @@ def get_faculty_course_details(db: Session, current_faculty: Dict[str, Any], ass
         Dict containing course details, students, and attendance data
     """
     try:
-        print(f"Getting course details for assigned_course_id: {assigned_course_id}")
+        logger.debug("Getting course details for assigned_course_id: %s", assigned_course_id)
         
         # Get faculty record from the current faculty data
         faculty_query = db.query(Faculty).filter(Faculty.user_id == current_faculty["user_id"]).first()
@@ -61,7 +64,7 @@ def get_faculty_course_details(db: Session, current_faculty: Dict[str, Any], ass
         (assigned_course, course, section, program, 
          faculty_user_id, faculty_first_name, faculty_last_name, faculty_email) = course_query
         
-        print(f"Course found: {course.name}")
+        logger.debug("Course found: %s", course.name)
         
         # Prepare course information
         course_info = {
@@ -112,7 +115,7 @@ def get_faculty_course_details(db: Session, current_faculty: Dict[str, Any], ass
             )
         ).all()
         
-        print(f"Processing {len(students_query)} students with formal enrollment records")
+        logger.debug("Processing %s students with formal enrollment records", len(students_query))
         
         # Process students by enrollment status
         enrolled_students = []
@@ -130,35 +133,41 @@ def get_faculty_course_details(db: Session, current_faculty: Dict[str, Any], ass
             "total": 0
         }
         
+        # Attendance counts and latest attendance for every student in one query.
+        # Each user's newest log (row 1 of the window) carries the user's totals.
+        user_partition = AttendanceLog.user_id
+        attendance_windows = db.query(
+            AttendanceLog.user_id.label("user_id"),
+            AttendanceLog.date.label("latest_date"),
+            AttendanceLog.status.label("latest_status"),
+            func.row_number().over(
+                partition_by=user_partition,
+                order_by=(desc(AttendanceLog.date), desc(AttendanceLog.created_at))
+            ).label("row_number"),
+            func.count(AttendanceLog.id).over(partition_by=user_partition).label("total_sessions"),
+            func.sum(case((AttendanceLog.status == "present", 1), else_=0)).over(partition_by=user_partition).label("present_count"),
+            func.sum(case((AttendanceLog.status == "absent", 1), else_=0)).over(partition_by=user_partition).label("absent_count"),
+            func.sum(case((AttendanceLog.status == "late", 1), else_=0)).over(partition_by=user_partition).label("late_count")
+        ).filter(
+            AttendanceLog.assigned_course_id == assigned_course_id,
+            AttendanceLog.user_id.in_([user.id for _, user, _ in students_query])
+        ).subquery()
+        attendance_by_user = {
+            row.user_id: row
+            for row in db.query(attendance_windows).filter(attendance_windows.c.row_number == 1).all()
+        } if students_query else {}
+        
         for student, user, approval in students_query:
-            print(f"Processing student {student.id} ({user.first_name} {user.last_name}) with status: {approval.status}")
-            
-            # Get attendance summary for this student
-            attendance_stats = db.query(
-                func.count(AttendanceLog.id).label("total_sessions"),
-                func.sum(case((AttendanceLog.status == "present", 1), else_=0)).label("present_count"),
-                func.sum(case((AttendanceLog.status == "absent", 1), else_=0)).label("absent_count"),
-                func.sum(case((AttendanceLog.status == "late", 1), else_=0)).label("late_count")
-            ).filter(
-                and_(
-                    AttendanceLog.user_id == user.id,
-                    AttendanceLog.assigned_course_id == assigned_course_id
-                )
-            ).first()
+            logger.debug("Processing student %s (%s %s) with status: %s", student.id, user.first_name, user.last_name, approval.status)
             
-            # Get latest attendance
-            latest_attendance = db.query(AttendanceLog).filter(
-                and_(
-                    AttendanceLog.user_id == user.id,
-                    AttendanceLog.assigned_course_id == assigned_course_id
-                )
-            ).order_by(desc(AttendanceLog.date), desc(AttendanceLog.created_at)).first()
+            # Attendance summary and latest attendance for this student
+            attendance = attendance_by_user.get(user.id)
             
             # Calculate statistics
-            total_sessions = attendance_stats.total_sessions or 0
-            present_count = int(attendance_stats.present_count or 0)
-            absent_count = int(attendance_stats.absent_count or 0)
-            late_count = int(attendance_stats.late_count or 0)
+            total_sessions = attendance.total_sessions if attendance else 0
+            present_count = int(attendance.present_count or 0) if attendance else 0
+            absent_count = int(attendance.absent_count or 0) if attendance else 0
+            late_count = int(attendance.late_count or 0) if attendance else 0
             
             # Calculate attendance percentage
             if total_sessions > 0:
@@ -186,31 +195,31 @@ def get_faculty_course_details(db: Session, current_faculty: Dict[str, Any], ass
                 "late_count": late_count,
                 "failed_count": failed_count,
                 "attendance_percentage": attendance_percentage,
-                "latest_attendance_date": latest_attendance.date.isoformat() if latest_attendance and latest_attendance.date else None,
-                "latest_attendance_status": latest_attendance.status if latest_attendance else None
+                "latest_attendance_date": attendance.latest_date.isoformat() if attendance and attendance.latest_date else None,
+                "latest_attendance_status": attendance.latest_status if attendance else None
             }
             
             # Categorize by enrollment status
             if approval.status == "enrolled":
                 enrolled_students.append(student_info)
                 enrollment_summary["enrolled"] += 1
-                print(f"  -> Added to ENROLLED list")
+                logger.debug("  -> Added to ENROLLED list")
             elif approval.status == "pending":
                 pending_students.append(student_info)
                 enrollment_summary["pending"] += 1
-                print(f"  -> Added to PENDING list")
+                logger.debug("  -> Added to PENDING list")
             elif approval.status == "rejected":
                 rejected_students.append(student_info)
                 enrollment_summary["rejected"] += 1
-                print(f"  -> Added to REJECTED list")
+                logger.debug("  -> Added to REJECTED list")
             elif approval.status == "passed":
                 passed_students.append(student_info)
                 enrollment_summary["passed"] += 1
-                print(f"  -> Added to PASSED list")
+                logger.debug("  -> Added to PASSED list")
             elif approval.status == "failed":
                 failed_students.append(student_info)
                 enrollment_summary["failed"] += 1
-                print(f"  -> Added to FAILED list")
+                logger.debug("  -> Added to FAILED list")
             
             enrollment_summary["total"] += 1
         
@@ -270,8 +279,8 @@ def get_faculty_course_details(db: Session, current_faculty: Dict[str, Any], ass
             "overall_attendance_rate": round((overall_present + overall_late) / total_attendance_records * 100, 2) if total_attendance_records > 0 else 0.0
         }
         
-        print(f"Course details completed successfully")
-        print(f"Final enrollment summary: {enrollment_summary}")
+        logger.debug("Course details completed successfully")
+        logger.debug("Final enrollment summary: %s", enrollment_summary)
         
         return {
             "success": True,
@@ -294,9 +303,7 @@ def get_faculty_course_details(db: Session, current_faculty: Dict[str, Any], ass
         }
         
     except Exception as e:
-        print(f"ERROR in get_faculty_course_details: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_faculty_course_details: %s", e)
         return {"error": f"Database error: {str(e)}"}
         recent_attendance_query = db.query(
             AttendanceLog,
@@ -353,8 +360,8 @@ def get_faculty_course_details(db: Session, current_faculty: Dict[str, Any], ass
             "overall_attendance_rate": round((overall_present + overall_late) / total_attendance_records * 100, 2) if total_attendance_records > 0 else 0.0
         }
         
-        print(f"Course details completed successfully")
-        print(f"Final enrollment summary: {enrollment_summary}")
+        logger.debug("Course details completed successfully")
+        logger.debug("Final enrollment summary: %s", enrollment_summary)
         
         return {
             "success": True,
@@ -378,9 +385,7 @@ def get_faculty_course_details(db: Session, current_faculty: Dict[str, Any], ass
         }
         
     except Exception as e:
-        print(f"ERROR in get_faculty_course_details: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_faculty_course_details: %s", e)
         return {"error": f"Database error: {str(e)}"}
 
 
@@ -6,6 +6,9 @@ from models import (
 )
 from typing import Dict, Any, List
 from datetime import datetime, date
+import logging
+
+logger = logging.getLogger(__name__)
 
 def get_faculty_courses(db: Session, current_faculty: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -19,8 +22,7 @@ def get_faculty_courses(db: Session, current_faculty: Dict[str, Any]) -> Dict[st
         Dict containing faculty courses with student counts and grouping by semester
     """
     try:
-        print(f"=== FACULTY COURSES DEBUG ===")
-        print(f"Faculty User ID: {current_faculty.get('user_id')}")
+        logger.debug("Faculty User ID: %s", current_faculty.get('user_id'))
         
         # Get faculty record
         faculty_query = db.query(Faculty).filter(Faculty.user_id == current_faculty["user_id"]).first()
@@ -28,7 +30,7 @@ def get_faculty_courses(db: Session, current_faculty: Dict[str, Any]) -> Dict[st
             return {"error": "Faculty not found"}
         
         faculty_user_id = current_faculty["user_id"]
-        print(f"Faculty User ID for query: {faculty_user_id}")
+        logger.debug("Faculty User ID for query: %s", faculty_user_id)
         
         # Define semester order (latest to oldest: Summer > 3rd > 2nd > 1st)
         def get_semester_order(semester):
@@ -78,7 +80,7 @@ def get_faculty_courses(db: Session, current_faculty: Dict[str, Any]) -> Dict[st
             -get_semester_order(x[0].semester or "")
         ))
         
-        print(f"Found {len(courses_query)} assigned courses")
+        logger.debug("Found %s assigned courses", len(courses_query))
         
         # Prepare faculty information
         faculty_info = {
@@ -107,10 +109,10 @@ def get_faculty_courses(db: Session, current_faculty: Dict[str, Any]) -> Dict[st
                         if current_year_start > latest_year_start:
                             latest_academic_year = current_year
 
-        print(f"✓ Latest academic year: {latest_academic_year}")
+        logger.debug("Latest academic year: %s", latest_academic_year)
 
         for assigned_course, course, section, program in courses_query:
-            print(f"Processing course: {course.name} - {section.name} ({assigned_course.academic_year}, {assigned_course.semester})")
+            logger.debug("Processing course: %s - %s (%s, %s)", course.name, section.name, assigned_course.academic_year, assigned_course.semester)
             
             # Count students in each enrollment status for this specific course
             enrollment_counts = db.query(
@@ -132,8 +134,8 @@ def get_faculty_courses(db: Session, current_faculty: Dict[str, Any]) -> Dict[st
             # Total should include ALL students regardless of status
             total_students = sum(status_counts.values())  # Sum all status counts
             
-            print(f"  Student counts: {enrollment_count} enrolled, {pending_count} pending, {rejected_count} rejected, {passed_count} passed, {failed_count} failed")
-            print(f"  Total students: {total_students} (all statuses)")
+            logger.debug("  Student counts: %s enrolled, %s pending, %s rejected, %s passed, %s failed", enrollment_count, pending_count, rejected_count, passed_count, failed_count)
+            logger.debug("  Total students: %s (all statuses)", total_students)
             
             course_info = {
                 "assigned_course_id": assigned_course.id,
@@ -164,10 +166,10 @@ def get_faculty_courses(db: Session, current_faculty: Dict[str, Any]) -> Dict[st
             
             if is_current:
                 current_courses.append(course_info)
-                print(f"  -> Added to CURRENT courses")
+                logger.debug("  -> Added to CURRENT courses")
             else:
                 previous_courses.append(course_info)
-                print(f"  -> Added to PREVIOUS courses")
+                logger.debug("  -> Added to PREVIOUS courses")
 
             # Update semester summary with proper ordering
             year_key = assigned_course.academic_year or "Unknown"
@@ -206,9 +208,9 @@ def get_faculty_courses(db: Session, current_faculty: Dict[str, Any]) -> Dict[st
                                  key=lambda x: -semester_summary[year][x]["semester_order"]):
                 sorted_semester_summary[year][semester] = semester_summary[year][semester]
         
-        print(f"✓ Current courses: {len(current_courses)}")
-        print(f"✓ Previous courses: {len(previous_courses)}")
-        print(f"✓ Semester summary (ordered): {sorted_semester_summary}")
+        logger.debug("Current courses: %s", len(current_courses))
+        logger.debug("Previous courses: %s", len(previous_courses))
+        logger.debug("Semester summary (ordered): %s", sorted_semester_summary)
         
         return {
             "success": True,
@@ -222,7 +224,5 @@ def get_faculty_courses(db: Session, current_faculty: Dict[str, Any]) -> Dict[st
         }
         
     except Exception as e:
-        print(f"Error in get_faculty_courses: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_faculty_courses: %s", e)
         return {"error": f"Database error: {str(e)}"}
@@ -1,11 +1,23 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, case
 from datetime import datetime, time, timedelta
 from typing import Dict, Any, List, Optional
 from models import (
     User, Faculty, Assigned_Course, Assigned_Course_Approval, 
     Course, Section, Program, Schedule, AttendanceLog
 )
+from cachetools import TTLCache
+import logging
+import orjson
+import threading
+
+logger = logging.getLogger(__name__)
+
+# The dashboard only changes at class boundaries (minute granularity) or when attendance
+# is recorded, so the encoded response is reused for the rest of the current minute
+DASHBOARD_CACHE_TTL_SECONDS = 60
+_dashboard_cache = TTLCache(maxsize=5000, ttl=DASHBOARD_CACHE_TTL_SECONDS)
+_dashboard_cache_lock = threading.Lock()
 
 def get_semester_priority(semester: str) -> int:
     """
@@ -123,21 +135,28 @@ def get_faculty_dashboard_data(db: Session, current_faculty: Dict[str, Any]) ->
                 return 4
             return 99
 
+        # Courses of that academic year with at least one enrolled student, in one query
+        latest_year_course_ids = [course_id for course_ids in semester_to_course_ids.values() for course_id in course_ids]
+        enrolled_course_ids = set()
+        if latest_year_course_ids:
+            enrolled_course_ids = {
+                row.assigned_course_id
+                for row in db.query(Assigned_Course_Approval.assigned_course_id).filter(
+                    Assigned_Course_Approval.assigned_course_id.in_(latest_year_course_ids),
+                    Assigned_Course_Approval.status == "enrolled"
+                ).distinct().all()
+            }
+
         # Find the lowest semester with at least one enrolled student
         current_semester = None
         for semester in sorted(semester_to_course_ids.keys(), key=semester_order):
-            course_ids = semester_to_course_ids[semester]
-            enrolled_count = db.query(Assigned_Course_Approval).filter(
-                Assigned_Course_Approval.assigned_course_id.in_(course_ids),
-                Assigned_Course_Approval.status == "enrolled"
-            ).count()
-            if enrolled_count > 0:
+            if any(course_id in enrolled_course_ids for course_id in semester_to_course_ids[semester]):
                 current_semester = semester
                 break
 
         current_academic_year = latest_academic_year
 
-        print(f"DEBUG: Determined current academic year: {current_academic_year}, semester: {current_semester}")
+        logger.debug("Determined current academic year: %s, semester: %s", current_academic_year, current_semester)
         
         if not current_academic_year or not current_semester:
             # Return empty dashboard if no courses found
@@ -206,46 +225,38 @@ def get_faculty_dashboard_data(db: Session, current_faculty: Dict[str, Any]) ->
             )
         ).order_by(Course.name).all()
         
-        print(f"DEBUG: Found {len(current_courses_query)} current semester courses for faculty")
+        logger.debug("Found %s current semester courses for faculty", len(current_courses_query))
+        
+        # Enrollment counts for all current courses in one grouped query
+        approval_counts = {}
+        current_course_ids = [course.assigned_course_id for course in current_courses_query]
+        if current_course_ids:
+            approval_counts = {
+                row.assigned_course_id: row
+                for row in db.query(
+                    Assigned_Course_Approval.assigned_course_id,
+                    func.count(Assigned_Course_Approval.id).label("total_count"),
+                    # Enrolled students now includes "enrolled", "passed", and "failed" students
+                    func.sum(case((Assigned_Course_Approval.status.in_(["enrolled", "passed", "failed"]), 1), else_=0)).label("enrolled_count"),
+                    func.sum(case((Assigned_Course_Approval.status == "pending", 1), else_=0)).label("pending_count"),
+                    func.sum(case((Assigned_Course_Approval.status == "rejected", 1), else_=0)).label("rejected_count"),
+                    func.sum(case((Assigned_Course_Approval.status == "passed", 1), else_=0)).label("passed_count")
+                ).filter(
+                    Assigned_Course_Approval.assigned_course_id.in_(current_course_ids)
+                ).group_by(Assigned_Course_Approval.assigned_course_id).all()
+            }
         
         # Process current courses
         current_courses = []
         assigned_course_ids = []
         
         for course in current_courses_query:
-            # Add enrollment counts for each course using separate queries
-            total_count = db.query(func.count(Assigned_Course_Approval.id)).filter(
-                Assigned_Course_Approval.assigned_course_id == course.assigned_course_id
-            ).scalar() or 0
-            
-            # Enrolled students now includes "enrolled", "passed", and "failed" students
-            enrolled_count = db.query(func.count(Assigned_Course_Approval.id)).filter(
-                and_(
-                    Assigned_Course_Approval.assigned_course_id == course.assigned_course_id,
-                    Assigned_Course_Approval.status.in_(["enrolled", "passed", "failed"])
-                )
-            ).scalar() or 0
-            
-            pending_count = db.query(func.count(Assigned_Course_Approval.id)).filter(
-                and_(
-                    Assigned_Course_Approval.assigned_course_id == course.assigned_course_id,
-                    Assigned_Course_Approval.status == "pending"
-                )
-            ).scalar() or 0
-            
-            rejected_count = db.query(func.count(Assigned_Course_Approval.id)).filter(
-                and_(
-                    Assigned_Course_Approval.assigned_course_id == course.assigned_course_id,
-                    Assigned_Course_Approval.status == "rejected"
-                )
-            ).scalar() or 0
-
-            passed_count = db.query(func.count(Assigned_Course_Approval.id)).filter(
-                and_(
-                    Assigned_Course_Approval.assigned_course_id == course.assigned_course_id,
-                    Assigned_Course_Approval.status == "passed"
-                )
-            ).scalar() or 0
+            counts = approval_counts.get(course.assigned_course_id)
+            total_count = counts.total_count if counts else 0
+            enrolled_count = (counts.enrolled_count or 0) if counts else 0
+            pending_count = (counts.pending_count or 0) if counts else 0
+            rejected_count = (counts.rejected_count or 0) if counts else 0
+            passed_count = (counts.passed_count or 0) if counts else 0
 
             course_info = {
                 "assigned_course_id": course.assigned_course_id,
@@ -276,7 +287,7 @@ def get_faculty_dashboard_data(db: Session, current_faculty: Dict[str, Any]) ->
         all_schedules = []
         
         if assigned_course_ids:
-            print(f"DEBUG: Getting schedules for {len(assigned_course_ids)} current courses")
+            logger.debug("Getting schedules for %s current courses", len(assigned_course_ids))
             
             # Get ALL schedules for current courses
             all_schedules_query = db.query(
@@ -302,7 +313,7 @@ def get_faculty_dashboard_data(db: Session, current_faculty: Dict[str, Any]) ->
                 Schedule.assigned_course_id.in_(assigned_course_ids)
             ).order_by(Schedule.day_of_week, Schedule.start_time).all()
             
-            print(f"DEBUG: Found {len(all_schedules_query)} total schedules for current courses")
+            logger.debug("Found %s total schedules for current courses", len(all_schedules_query))
             
             # Process all schedules
             for schedule in all_schedules_query:
@@ -364,7 +375,7 @@ def get_faculty_dashboard_data(db: Session, current_faculty: Dict[str, Any]) ->
                 if is_today:
                     today_schedule.append(schedule_item)
         
-        print(f"DEBUG: Today's schedule has {len(today_schedule)} classes")
+        logger.debug("Today's schedule has %s classes", len(today_schedule))
         
         # Find current and next class from today's schedule
         current_class = None
@@ -480,5 +491,36 @@ def get_faculty_dashboard_data(db: Session, current_faculty: Dict[str, Any]) ->
         return dashboard_data
         
     except Exception as e:
-        print(f"Error getting faculty dashboard data: {e}")
+        logger.warning("Error getting faculty dashboard data: %s", e)
         raise
+
+def get_faculty_dashboard_json(db: Session, current_faculty: Dict[str, Any]) -> bytes:
+    """
+    Get the faculty dashboard as encoded JSON, reusing this minute's response
+    
+    Args:
+        db: Database session
+        current_faculty: Current faculty data from JWT
+        
+    Returns:
+        The get_faculty_dashboard_data payload encoded with orjson
+    """
+    key = (current_faculty["user_id"], datetime.now().replace(second=0, microsecond=0))
+    with _dashboard_cache_lock:
+        cached = _dashboard_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    dashboard_json = orjson.dumps(
+        get_faculty_dashboard_data(db, current_faculty),
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+    with _dashboard_cache_lock:
+        _dashboard_cache[key] = dashboard_json
+    return dashboard_json
+
+def invalidate_faculty_dashboard(faculty_user_id: int) -> None:
+    """Drop a faculty member's cached dashboard after they change attendance or enrollment"""
+    with _dashboard_cache_lock:
+        for key in [key for key in _dashboard_cache.keys() if key[0] == faculty_user_id]:
+            _dashboard_cache.pop(key, None)
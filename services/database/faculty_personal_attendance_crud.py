@@ -13,6 +13,9 @@ from models import (
     AttendanceLog, User, Faculty, Assigned_Course, Course, 
     Section, Program, Student
 )
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def get_faculty_personal_attendance_history(db: Session, current_faculty: Dict[str, Any]) -> Dict[str, Any]:
@@ -83,7 +86,7 @@ def get_faculty_personal_attendance_history(db: Session, current_faculty: Dict[s
         
         attendance_results = attendance_query.all()
         
-        print(f"Found {len(attendance_results)} personal attendance records for faculty user_id: {faculty_user_id}")
+        logger.debug("Found %s personal attendance records for faculty user_id: %s", len(attendance_results), faculty_user_id)
         
         # Process attendance records
         attendance_records = []
@@ -213,9 +216,7 @@ def get_faculty_personal_attendance_history(db: Session, current_faculty: Dict[s
         }
         
     except Exception as e:
-        print(f"Error in get_faculty_personal_attendance_history: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_faculty_personal_attendance_history: %s", e)
         
         return {
             "success": False,
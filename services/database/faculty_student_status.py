@@ -6,6 +6,10 @@ from models import (
 )
 from typing import Dict, Any, Optional
 from datetime import datetime
+from services.auth.jwt_service import JWTService
+import logging
+
+logger = logging.getLogger(__name__)
 
 def update_student_enrollment_status(
     db: Session, 
@@ -30,33 +34,32 @@ def update_student_enrollment_status(
         Dict containing update result and student information
     """
     try:
-        print(f"=== UPDATE STUDENT STATUS DEBUG ===")
-        print(f"Faculty User ID: {current_faculty.get('user_id')}")
-        print(f"Assigned Course ID: {assigned_course_id}")
-        print(f"Student ID: {student_id}")
-        print(f"New Status: {new_status}")
-        print(f"Rejection Reason: {rejection_reason}")
+        logger.debug("Faculty User ID: %s", current_faculty.get('user_id'))
+        logger.debug("Assigned Course ID: %s", assigned_course_id)
+        logger.debug("Student ID: %s", student_id)
+        logger.debug("New Status: %s", new_status)
+        logger.debug("Rejection Reason: %s", rejection_reason)
         
         # Validate status
         valid_statuses = ["pending", "enrolled", "rejected", "passed", "failed"]
         if new_status.lower() not in valid_statuses:
-            print(f"❌ Invalid status validation failed")
+            logger.debug("Invalid status validation failed")
             return {"error": f"Invalid status. Must be one of: {', '.join(valid_statuses)}"}
         
-        print(f"✓ Status validation passed")
+        logger.debug("Status validation passed")
         
         # If status is rejected, rejection_reason is required
         if new_status.lower() == "rejected" and (not rejection_reason or rejection_reason.strip() == ""):
-            print(f"❌ Rejection reason validation failed - rejection_reason: '{rejection_reason}'")
+            logger.debug("Rejection reason validation failed - rejection_reason: '%s'", rejection_reason)
             return {"error": "Rejection reason is required when status is 'rejected'"}
         
-        print(f"✓ Rejection reason validation passed (rejection_reason: '{rejection_reason}')")
+        logger.debug("Rejection reason validation passed (rejection_reason: '%s')", rejection_reason)
         
         # Get faculty user ID
         faculty_user_id = current_faculty["user_id"]
         
         # Verify faculty has permission to modify this course
-        print(f"Checking faculty permission for course {assigned_course_id} and faculty {faculty_user_id}")
+        logger.debug("Checking faculty permission for course %s and faculty %s", assigned_course_id, faculty_user_id)
         course_check = db.query(Assigned_Course).filter(
             and_(
                 Assigned_Course.id == assigned_course_id,
@@ -66,26 +69,27 @@ def update_student_enrollment_status(
         ).first()
         
         if not course_check:
-            print(f"❌ Course permission check failed")
-            # Debug: Check what courses this faculty has
-            faculty_courses = db.query(Assigned_Course).filter(
-                Assigned_Course.faculty_id == faculty_user_id
-            ).all()
-            print(f"Faculty has access to courses: {[c.id for c in faculty_courses]}")
+            logger.debug("Course permission check failed")
+            # Debug: Check what courses this faculty has (only queried when debug logging is on)
+            if logger.isEnabledFor(logging.DEBUG):
+                faculty_courses = db.query(Assigned_Course.id).filter(
+                    Assigned_Course.faculty_id == faculty_user_id
+                ).all()
+                logger.debug("Faculty has access to courses: %s", [c.id for c in faculty_courses])
             return {"error": "Course not found or you don't have permission to modify this course"}
         
-        print(f"✓ Faculty permission verified for course: {course_check.id}")
+        logger.debug("Faculty permission verified for course: %s", course_check.id)
         
         # Debug: Check if student exists
         student_exists = db.query(Student).filter(Student.id == student_id).first()
         if not student_exists:
-            print(f"❌ Student {student_id} does not exist")
+            logger.debug("Student %s does not exist", student_id)
             return {"error": f"Student with ID {student_id} not found"}
         
-        print(f"✓ Student {student_id} exists: {student_exists.student_number}")
+        logger.debug("Student %s exists: %s", student_id, student_exists.student_number)
         
         # Check for existing approval record
-        print(f"Looking for existing approval record...")
+        logger.debug("Looking for existing approval record...")
         approval_record = db.query(Assigned_Course_Approval).filter(
             and_(
                 Assigned_Course_Approval.assigned_course_id == assigned_course_id,
@@ -93,15 +97,15 @@ def update_student_enrollment_status(
             )
         ).first()
         
-        print(f"Approval record query result: {approval_record}")
+        logger.debug("Approval record query result: %s", approval_record)
         
         old_status = "attending"  # Default for students without formal approval
         
         if not approval_record:
-            print(f"❌ No existing approval record found")
+            logger.debug("No existing approval record found")
             
             # Check if student has attendance records for this course
-            print(f"Checking for attendance records...")
+            logger.debug("Checking for attendance records...")
             attendance_check = db.query(AttendanceLog).join(
                 User, User.id == AttendanceLog.user_id
             ).join(
@@ -113,18 +117,18 @@ def update_student_enrollment_status(
                 )
             ).first()
             
-            print(f"Attendance check result: {attendance_check}")
+            logger.debug("Attendance check result: %s", attendance_check)
             
             if not attendance_check:
-                print(f"❌ Student {student_id} has no attendance records for course {assigned_course_id}")
+                logger.debug("Student %s has no attendance records for course %s", student_id, assigned_course_id)
                 return {"error": f"Student has no enrollment or attendance records for this course"}
             
-            print(f"✓ Student has attendance records. Creating new approval record...")
-            print(f"Creating approval record with:")
-            print(f"  - assigned_course_id: {assigned_course_id}")
-            print(f"  - student_id: {student_id}")
-            print(f"  - status: {new_status.lower()}")
-            print(f"  - rejection_reason: {rejection_reason if new_status.lower() == 'rejected' else None}")
+            logger.debug("Student has attendance records. Creating new approval record...")
+            logger.debug("Creating approval record with:")
+            logger.debug("  - assigned_course_id: %s", assigned_course_id)
+            logger.debug("  - student_id: %s", student_id)
+            logger.debug("  - status: %s", new_status.lower())
+            logger.debug("  - rejection_reason: %s", rejection_reason if new_status.lower() == 'rejected' else None)
             
             # Create new approval record for attending student
             approval_record = Assigned_Course_Approval(
@@ -136,19 +140,19 @@ def update_student_enrollment_status(
                 updated_at=datetime.now()
             )
             
-            print(f"New approval record object created: {approval_record}")
-            print(f"Adding to database session...")
+            logger.debug("New approval record object created: %s", approval_record)
+            logger.debug("Adding to database session...")
             db.add(approval_record)
-            print(f"✓ New approval record added to session")
+            logger.debug("New approval record added to session")
             
         else:
-            print(f"✓ Found existing approval record - Current Status: {approval_record.status}")
+            logger.debug("Found existing approval record - Current Status: %s", approval_record.status)
             old_status = approval_record.status
             
             # Update the existing record
-            print(f"Updating existing record:")
-            print(f"  - Old status: {approval_record.status}")
-            print(f"  - New status: {new_status.lower()}")
+            logger.debug("Updating existing record:")
+            logger.debug("  - Old status: %s", approval_record.status)
+            logger.debug("  - New status: %s", new_status.lower())
             
             approval_record.status = new_status.lower()
             approval_record.updated_at = datetime.now()
@@ -156,29 +160,27 @@ def update_student_enrollment_status(
             # Update rejection reason if provided or clear it if not rejected
             if new_status.lower() == "rejected":
                 approval_record.rejection_reason = rejection_reason
-                print(f"  - Set rejection_reason: {rejection_reason}")
+                logger.debug("  - Set rejection_reason: %s", rejection_reason)
             else:
                 approval_record.rejection_reason = None
-                print(f"  - Cleared rejection_reason")
+                logger.debug("  - Cleared rejection_reason")
             
-            print(f"✓ Updated existing approval record")
+            logger.debug("Updated existing approval record")
         
         # Commit the changes
-        print(f"Attempting to commit changes to database...")
+        logger.debug("Attempting to commit changes to database...")
         try:
             db.commit()
-            print(f"✓ Database commit successful")
-            print(f"✓ Status updated from '{old_status}' to '{new_status}'")
+            logger.debug("Database commit successful")
+            logger.debug("Status updated from '%s' to '%s'", old_status, new_status)
         except Exception as commit_error:
-            print(f"❌ Database commit failed: {commit_error}")
+            logger.debug("Database commit failed: %s", commit_error)
             db.rollback()
-            print(f"❌ Error committing changes: {commit_error}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error committing changes: %s", commit_error)
             return {"error": f"Failed to save changes: {str(commit_error)}"}
         
         # Verify the update by querying the record again
-        print(f"Verifying update by re-querying the record...")
+        logger.debug("Verifying update by re-querying the record...")
         verification_record = db.query(Assigned_Course_Approval).filter(
             and_(
                 Assigned_Course_Approval.assigned_course_id == assigned_course_id,
@@ -187,13 +189,13 @@ def update_student_enrollment_status(
         ).first()
         
         if verification_record:
-            print(f"✓ Verification successful - Current status in DB: {verification_record.status}")
-            print(f"✓ Updated at: {verification_record.updated_at}")
+            logger.debug("Verification successful - Current status in DB: %s", verification_record.status)
+            logger.debug("Updated at: %s", verification_record.updated_at)
         else:
-            print(f"❌ Verification failed - Record not found after commit")
+            logger.debug("Verification failed - Record not found after commit")
         
         # Get student information for response
-        print(f"Getting student information for response...")
+        logger.debug("Getting student information for response...")
         student_info = db.query(Student, User).join(
             User, User.id == Student.user_id
         ).filter(Student.id == student_id).first()
@@ -207,10 +209,10 @@ def update_student_enrollment_status(
                 "name": f"{user.first_name} {user.last_name}",
                 "email": user.email
             }
-            print(f"✓ Student data prepared: {student_data}")
+            logger.debug("Student data prepared: %s", student_data)
         else:
             student_data = None
-            print(f"❌ Student data not found")
+            logger.debug("Student data not found")
         
         response_data = {
             "success": True,
@@ -233,26 +235,25 @@ def update_student_enrollment_status(
             Assigned_Course_Approval.status == "pending"
         ).count()
         if enrolled_approvals == 0 and pending_approvals == 0:
-            print(f"No more 'enrolled' or 'pending' approvals for student {student_id}. Setting section to None.")
+            logger.debug("No more 'enrolled' or 'pending' approvals for student %s. Setting section to None.", student_id)
             student_obj = db.query(Student).filter(Student.id == student_id).first()
             if student_obj:
                 student_obj.section = None
                 try:
                     db.commit()
-                    print(f"✓ Student section set to None and committed.")
+                    JWTService.invalidate_cached_user(student_obj.user_id)
+                    logger.debug("Student section set to None and committed.")
                 except Exception as commit_error:
-                    print(f"❌ Error committing section update: {commit_error}")
+                    logger.warning("Error committing section update: %s", commit_error)
                     db.rollback()
         else:
-            print(f"Student {student_id} still has {enrolled_approvals} 'enrolled' or {pending_approvals} 'pending' approvals. Section not changed.")
+            logger.debug("Student %s still has %s 'enrolled' or %s 'pending' approvals. Section not changed.", student_id, enrolled_approvals, pending_approvals)
 
-        print(f"✓ Response data prepared: {response_data}")
+        logger.debug("Response data prepared: %s", response_data)
         return response_data
         
     except Exception as e:
-        print(f"❌ Unexpected error in update_student_enrollment_status: {str(e)}")
+        logger.warning("Unexpected error in update_student_enrollment_status: %s", str(e))
         db.rollback()  # Rollback on error
-        print(f"Error in update_student_enrollment_status: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in update_student_enrollment_status: %s", e)
         return {"error": f"Database error: {str(e)}"}
@@ -2,15 +2,46 @@
 Database query service for AttendanceApp API
 Contains all database operations for different modules
 """
+import logging
+import threading
+from datetime import datetime
+from sqlalchemy import func, case, or_, and_
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Hashable
+from cachetools import TTLCache
 from models import Program, Section, Course, Assigned_Course, User, Student, Assigned_Course_Approval, AttendanceLog
 
+logger = logging.getLogger(__name__)
+
 class DatabaseQueryService:
     """Service class for handling all database queries"""
     
-    @staticmethod
-    def get_active_programs(db: Session) -> List[Dict[str, Any]]:
+    # Onboarding catalog (programs, sections, assigned courses) is maintained from the
+    # desktop app and rarely changes, so it is memoized for a few minutes per process.
+    CATALOG_CACHE_TTL_SECONDS = 300
+    _catalog_cache = TTLCache(maxsize=512, ttl=CATALOG_CACHE_TTL_SECONDS)
+    _catalog_cache_lock = threading.Lock()
+    
+    @classmethod
+    def _get_cached_catalog(cls, key: Hashable, loader: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Return the cached catalog list for key, loading it on a miss"""
+        with cls._catalog_cache_lock:
+            cached = cls._catalog_cache.get(key)
+        if cached is None:
+            cached = loader()
+            with cls._catalog_cache_lock:
+                cls._catalog_cache[key] = cached
+        # Callers get their own list so the cached one is never mutated
+        return list(cached)
+    
+    @classmethod
+    def clear_catalog_cache(cls) -> None:
+        """Drop memoized catalog reads after Program/Section/Assigned_Course writes"""
+        with cls._catalog_cache_lock:
+            cls._catalog_cache.clear()
+    
+    @classmethod
+    def get_active_programs(cls, db: Session) -> List[Dict[str, Any]]:
         """
         Get all active programs where isDeleted = 0
         
@@ -20,6 +51,10 @@ class DatabaseQueryService:
         Returns:
             List of program dictionaries
         """
+        return cls._get_cached_catalog(("programs",), lambda: cls._load_active_programs(db))
+    
+    @staticmethod
+    def _load_active_programs(db: Session) -> List[Dict[str, Any]]:
         try:
             programs = db.query(Program).filter(
                 Program.isDeleted == 0
@@ -42,11 +77,11 @@ class DatabaseQueryService:
             return program_list
             
         except Exception as e:
-            print(f"Error getting active programs: {e}")
+            logger.warning("Error getting active programs: %s", e)
             raise
     
-    @staticmethod
-    def get_sections_by_program(db: Session, program_id: int, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    @classmethod
+    def get_sections_by_program(cls, db: Session, program_id: int, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get all active sections for a specific program where isDeleted = 0
         Optionally filter out sections that the user has previously been assigned to via assigned_course_approval.
@@ -62,27 +97,13 @@ class DatabaseQueryService:
         Raises:
             ValueError: If program not found or deleted
         """
+        # The program's sections are shared by every student; only the exclusion is per user
+        section_list = cls._get_cached_catalog(
+            ("sections", program_id), lambda: cls._load_program_sections(db, program_id)
+        )
+        
         try:
-            # Verify program exists and is active
-            program = db.query(Program).filter(
-                Program.id == program_id,
-                Program.isDeleted == 0
-            ).first()
-            
-            if not program:
-                raise ValueError("Program not found or has been deleted")
-            
-            # Get all active sections for the program
-            sections = db.query(Section, Program).join(
-                Program, Section.program_id == Program.id
-            ).filter(
-                Section.program_id == program_id,
-                Section.isDeleted == 0,
-                Program.isDeleted == 0
-            ).all()
-            
             # Filtering: Exclude sections that the user has previous assigned_course_approval for
-            exclude_section_ids = set()
             exclude_prefixes = set()
             if user_id:
                 from models import Assigned_Course_Approval, Assigned_Course
@@ -104,11 +125,41 @@ class DatabaseQueryService:
                         ).all()
                         # Collect all prefixes (first character) of previous section names
                         exclude_prefixes = set(s.name[0] for s in previous_sections if s.name)
+            if not exclude_prefixes:
+                return section_list
+            # Exclude if section name starts with any of the previous prefixes
+            return [
+                section for section in section_list
+                if not any(section["name"].startswith(prefix) for prefix in exclude_prefixes)
+            ]
+            
+        except Exception as e:
+            logger.warning("Error filtering sections for program %s: %s", program_id, e)
+            raise
+    
+    @staticmethod
+    def _load_program_sections(db: Session, program_id: int) -> List[Dict[str, Any]]:
+        try:
+            # Verify program exists and is active
+            program = db.query(Program).filter(
+                Program.id == program_id,
+                Program.isDeleted == 0
+            ).first()
+            
+            if not program:
+                raise ValueError("Program not found or has been deleted")
+            
+            # Get all active sections for the program
+            sections = db.query(Section, Program).join(
+                Program, Section.program_id == Program.id
+            ).filter(
+                Section.program_id == program_id,
+                Section.isDeleted == 0,
+                Program.isDeleted == 0
+            ).all()
+            
             section_list = []
             for section, program in sections:
-                # Exclude if section name starts with any of the previous prefixes
-                if any(section.name.startswith(prefix) for prefix in exclude_prefixes):
-                    continue
                 section_info = {
                     "id": section.id,
                     "name": section.name,
@@ -124,11 +175,11 @@ class DatabaseQueryService:
             return section_list
             
         except Exception as e:
-            print(f"Error getting sections for program {program_id}: {e}")
+            logger.warning("Error getting sections for program %s: %s", program_id, e)
             raise
     
-    @staticmethod
-    def get_assigned_courses_by_section(db: Session, section_id: int) -> List[Dict[str, Any]]:
+    @classmethod
+    def get_assigned_courses_by_section(cls, db: Session, section_id: int) -> List[Dict[str, Any]]:
         """
         Get all active assigned courses for a specific section where isDeleted = 0
         
@@ -142,6 +193,12 @@ class DatabaseQueryService:
         Raises:
             ValueError: If section not found or deleted
         """
+        return cls._get_cached_catalog(
+            ("courses", section_id), lambda: cls._load_section_assigned_courses(db, section_id)
+        )
+    
+    @staticmethod
+    def _load_section_assigned_courses(db: Session, section_id: int) -> List[Dict[str, Any]]:
         try:
             # Verify section exists and is active
             section = db.query(Section).filter(
@@ -224,7 +281,7 @@ class DatabaseQueryService:
             return course_list
             
         except Exception as e:
-            print(f"Error getting assigned courses for section {section_id}: {e}")
+            logger.warning("Error getting assigned courses for section %s: %s", section_id, e)
             raise
     
     @staticmethod
@@ -260,7 +317,7 @@ class DatabaseQueryService:
             }
             
         except Exception as e:
-            print(f"Error getting program {program_id}: {e}")
+            logger.warning("Error getting program %s: %s", program_id, e)
             raise
     
     @staticmethod
@@ -300,7 +357,7 @@ class DatabaseQueryService:
             }
             
         except Exception as e:
-            print(f"Error getting section {section_id}: {e}")
+            logger.warning("Error getting section %s: %s", section_id, e)
             raise
     
     @staticmethod
@@ -365,7 +422,7 @@ class DatabaseQueryService:
             }
             
         except Exception as e:
-            print(f"Error getting assigned course {assigned_course_id}: {e}")
+            logger.warning("Error getting assigned course %s: %s", assigned_course_id, e)
             raise
     
     @staticmethod
@@ -449,7 +506,7 @@ class DatabaseQueryService:
             
         except Exception as e:
             db.rollback()
-            print(f"Error assigning student to section: {e}")
+            logger.warning("Error assigning student to section: %s", e)
             raise
     
     @staticmethod
@@ -486,7 +543,7 @@ class DatabaseQueryService:
             }
             
         except Exception as e:
-            print(f"Error getting student by user ID {user_id}: {e}")
+            logger.warning("Error getting student by user ID %s: %s", user_id, e)
             raise
     
     @staticmethod
@@ -513,7 +570,7 @@ class DatabaseQueryService:
             
             # If student_id is not in JWT data, fetch it from database
             if not student_id:
-                print(f"Student ID not in JWT, fetching from database for user_id: {user_id}")
+                logger.debug("Student ID not in JWT, fetching from database for user_id: %s", user_id)
                 student_data = DatabaseQueryService.get_student_by_user_id(db, user_id)
                 if not student_data:
                     raise ValueError("Student record not found for this user")
@@ -521,7 +578,7 @@ class DatabaseQueryService:
                 # Update current_section_id if not present
                 if not current_section_id:
                     current_section_id = student_data["section_id"]
-                print(f"Found student_id: {student_id}, section_id: {current_section_id}")
+                logger.debug("Found student_id: %s, section_id: %s", student_id, current_section_id)
             
             # Extract student enrollment year from student number (format: 2023-AAA)
             student_number = current_student.get("student_number", "")
@@ -529,19 +586,22 @@ class DatabaseQueryService:
             if student_number and "-" in student_number:
                 try:
                     student_enrollment_year = int(student_number.split("-")[0])
-                    print(f"Student enrollment year: {student_enrollment_year}")
+                    logger.debug("Student enrollment year: %s", student_enrollment_year)
                 except ValueError:
-                    print(f"Could not parse enrollment year from student number: {student_number}")
+                    logger.debug("Could not parse enrollment year from student number: %s", student_number)
             
             # Check if user has graduated status
             is_graduated = False
-            if user_status:
+            if "status_name" in current_student:
+                # Status name is loaded with the JWT user data
+                is_graduated = (current_student["status_name"] or "").lower() == "graduated"
+            elif user_status:
                 # Query status table to check if user is graduated
                 from models import Status
                 status_record = db.query(Status).filter(Status.id == user_status).first()
-                if status_record and status_record.name.lower() == "graduated":
-                    is_graduated = True
-                    print(f"User has graduated status - no current courses will be shown")
+                is_graduated = bool(status_record and status_record.name.lower() == "graduated")
+            if is_graduated:
+                logger.debug("User has graduated status - no current courses will be shown")
             
             # Helper function to extract start year from academic year format "2023-2024"
             def get_academic_year_start(academic_year_str):
@@ -558,7 +618,7 @@ class DatabaseQueryService:
                     return None
             
             # Get all assigned course approvals for this student - USE THIS AS PRIMARY SOURCE
-            print(f"Fetching all assigned_course_approval records for student_id: {student_id}")
+            logger.debug("Fetching all assigned_course_approval records for student_id: %s", student_id)
             student_approvals_query = db.query(
                 Assigned_Course_Approval,
                 Assigned_Course,
@@ -583,7 +643,7 @@ class DatabaseQueryService:
                 User.isDeleted == 0
             ).all()
             
-            print(f"Found {len(student_approvals_query)} total course approvals for student")
+            logger.debug("Found %s total course approvals for student", len(student_approvals_query))
             
             # Filter by student enrollment year and group courses by academic year
             courses_by_year = {}
@@ -593,7 +653,7 @@ class DatabaseQueryService:
                 
                 # Skip courses that are before the student's enrollment year
                 if student_enrollment_year and academic_year_start and academic_year_start < student_enrollment_year:
-                    print(f"Skipping course {course.name} from academic year {academic_year} (before enrollment year {student_enrollment_year})")
+                    logger.debug("Skipping course %s from academic year %s (before enrollment year %s)", course.name, academic_year, student_enrollment_year)
                     continue
                 
                 if academic_year not in courses_by_year:
@@ -625,8 +685,8 @@ class DatabaseQueryService:
                 }
                 courses_by_year[academic_year].append(course_info)
             
-            print(f"Filtered courses from enrollment year {student_enrollment_year} onwards")
-            print(f"Academic years found: {list(courses_by_year.keys())}")
+            logger.debug("Filtered courses from enrollment year %s onwards", student_enrollment_year)
+            logger.debug("Academic years found: %s", list(courses_by_year.keys()))
             
             # Find the latest academic year based on start year
             latest_academic_year = None
@@ -636,7 +696,7 @@ class DatabaseQueryService:
                 if valid_years:
                     # Sort by start year and get the latest
                     latest_academic_year = max(valid_years, key=lambda x: x[1])[0]
-                    print(f"Latest academic year found: {latest_academic_year}")
+                    logger.debug("Latest academic year found: %s", latest_academic_year)
             
             # 1A. Current courses: Latest academic year courses from assigned_course_approval (if not graduated)
             current_courses = []
@@ -644,12 +704,12 @@ class DatabaseQueryService:
                 current_courses = courses_by_year[latest_academic_year].copy()
                 for course in current_courses:
                     course["course_type"] = "current"
-                print(f"Found {len(current_courses)} current courses for academic year {latest_academic_year}")
+                logger.debug("Found %s current courses for academic year %s", len(current_courses), latest_academic_year)
             else:
                 if is_graduated:
-                    print("User is graduated - no current courses")
+                    logger.debug("User is graduated - no current courses")
                 else:
-                    print("No latest academic year found or no courses for latest year")
+                    logger.debug("No latest academic year found or no courses for latest year")
             
             # 1B. Previous courses: All other academic years from assigned_course_approval (excluding latest)
             previous_courses = []
@@ -661,7 +721,7 @@ class DatabaseQueryService:
             
             # Sort previous courses by academic year start year (most recent first)
             previous_courses.sort(key=lambda x: get_academic_year_start(x["academic_year"]) or 0, reverse=True)
-            print(f"Found {len(previous_courses)} previous courses across {len(courses_by_year) - (1 if latest_academic_year and not is_graduated else 0)} academic years")
+            logger.debug("Found %s previous courses across %s academic years", len(previous_courses), len(courses_by_year) - (1 if latest_academic_year and not is_graduated else 0))
             
             # Create enrollment summary based on assigned_course_approval status
             all_courses = current_courses + previous_courses
@@ -689,7 +749,7 @@ class DatabaseQueryService:
                 "has_section": current_student.get("has_section", False)
             }
             
-            print(f"Successfully retrieved courses from assigned_course_approval - Current: {len(current_courses)}, Previous: {len(previous_courses)}")
+            logger.debug("Successfully retrieved courses from assigned_course_approval - Current: %s, Previous: %s", len(current_courses), len(previous_courses))
             
             return {
                 "success": True,
@@ -704,19 +764,26 @@ class DatabaseQueryService:
             }
             
         except Exception as e:
-            print(f"Error getting student courses: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error getting student courses: %s", e)
             raise
     
     @staticmethod
-    def get_course_students(db: Session, assigned_course_id: int) -> Dict[str, Any]:
+    def get_course_students(
+        db: Session,
+        assigned_course_id: int,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Dict[str, Any]:
         """
         Get all students enrolled in a specific course with attendance summary
         
+        Summaries always cover the whole roster; only the students list is paged.
+        
         Args:
             db: Database session
             assigned_course_id: ID of the assigned course
+            limit: Maximum number of students to return (all students if None)
+            offset: Number of students (sorted by name) to skip
             
         Returns:
             Dictionary with course info, students list, and summaries
@@ -725,7 +792,7 @@ class DatabaseQueryService:
             ValueError: If assigned course not found
         """
         try:
-            print(f"[DEBUG] get_course_students called with assigned_course_id={assigned_course_id}")
+            logger.debug("get_course_students called with assigned_course_id=%s", assigned_course_id)
             # 2A & 2E: Verify assigned course exists and get course information
             course_info_result = db.query(
                 Assigned_Course,
@@ -749,9 +816,9 @@ class DatabaseQueryService:
                 Program.isDeleted == 0,
                 User.isDeleted == 0
             ).first()
-            print(f"[DEBUG] course_info_result: {course_info_result}")
+            logger.debug("course_info_result: %s", course_info_result)
             if not course_info_result:
-                print(f"[DEBUG] Assigned course not found for id={assigned_course_id}")
+                logger.debug("Assigned course not found for id=%s", assigned_course_id)
                 raise ValueError("Assigned course not found or has been deleted")
             assigned_course, course, faculty, section, program = course_info_result
             # Prepare course information
@@ -788,9 +855,9 @@ class DatabaseQueryService:
                 Assigned_Course_Approval.assigned_course_id == assigned_course_id,
                 User.isDeleted == 0
             ).all()
-            print(f"[DEBUG] Found {len(student_enrollments)} student enrollments for course {assigned_course_id}")
+            logger.debug("Found %s student enrollments for course %s", len(student_enrollments), assigned_course_id)
             if not student_enrollments:
-                print(f"[DEBUG] No student enrollments found for assigned_course_id={assigned_course_id}")
+                logger.debug("No student enrollments found for assigned_course_id=%s", assigned_course_id)
             students_list = []
             enrollment_summary = {}
             attendance_stats = {
@@ -798,26 +865,39 @@ class DatabaseQueryService:
                 "students_with_attendance": 0,
                 "average_attendance_percentage": 0.0
             }
+            # 2C & 2D: Latest attendance and per-status counts for every student in one query.
+            # Each user's newest log (row 1 of the window) carries the user's totals.
+            # Note: AttendanceLog uses user_id, not student_id
+            user_partition = AttendanceLog.user_id
+            attendance_windows = db.query(
+                AttendanceLog.user_id.label("user_id"),
+                AttendanceLog.status.label("latest_status"),
+                AttendanceLog.created_at.label("latest_created_at"),
+                func.row_number().over(
+                    partition_by=user_partition,
+                    order_by=(AttendanceLog.created_at.desc(), AttendanceLog.id.desc())
+                ).label("row_number"),
+                func.count().over(partition_by=user_partition).label("total_sessions"),
+                func.sum(case((AttendanceLog.status == "present", 1), else_=0)).over(partition_by=user_partition).label("present_count"),
+                func.sum(case((AttendanceLog.status == "absent", 1), else_=0)).over(partition_by=user_partition).label("absent_count"),
+                func.sum(case((AttendanceLog.status == "late", 1), else_=0)).over(partition_by=user_partition).label("late_count")
+            ).filter(
+                AttendanceLog.assigned_course_id == assigned_course_id,
+                AttendanceLog.user_id.in_([user.id for _, _, user in student_enrollments])
+            ).subquery()
+            attendance_by_user = {
+                row.user_id: row
+                for row in db.query(attendance_windows).filter(attendance_windows.c.row_number == 1).all()
+            } if student_enrollments else {}
+            
             for approval, student, user in student_enrollments:
-                # 2C: Get latest attendance record for this student in this course
-                # Note: AttendanceLog uses user_id, not student_id
-                latest_attendance = db.query(AttendanceLog).filter(
-                    AttendanceLog.user_id == user.id,  # Changed from student.id to user.id
-                    AttendanceLog.assigned_course_id == assigned_course_id
-                ).order_by(AttendanceLog.created_at.desc()).first()
-                
-                # 2D: Get attendance summary for this student in this course
-                # Note: AttendanceLog uses user_id, not student_id
-                attendance_records = db.query(AttendanceLog).filter(
-                    AttendanceLog.user_id == user.id,  # Changed from student.id to user.id
-                    AttendanceLog.assigned_course_id == assigned_course_id
-                ).all()
+                attendance = attendance_by_user.get(user.id)
                 
                 # Calculate attendance statistics
-                total_sessions = len(attendance_records)
-                present_count = len([a for a in attendance_records if a.status == "present"])
-                absent_count = len([a for a in attendance_records if a.status == "absent"])
-                late_count = len([a for a in attendance_records if a.status == "late"])
+                total_sessions = attendance.total_sessions if attendance else 0
+                present_count = attendance.present_count if attendance else 0
+                absent_count = attendance.absent_count if attendance else 0
+                late_count = attendance.late_count if attendance else 0
                 # Add failed_count (set to 0, or add your logic here)
                 failed_count = 0
                 # Calculate attendance percentage
@@ -836,8 +916,8 @@ class DatabaseQueryService:
                     "rejection_reason": approval.rejection_reason,
                     "enrollment_created_at": approval.created_at.isoformat() if approval.created_at else None,
                     "enrollment_updated_at": approval.updated_at.isoformat() if approval.updated_at else None,
-                    "latest_attendance_date": latest_attendance.created_at.isoformat() if latest_attendance else None,
-                    "latest_attendance_status": latest_attendance.status if latest_attendance else None,
+                    "latest_attendance_date": attendance.latest_created_at.isoformat() if attendance else None,
+                    "latest_attendance_status": attendance.latest_status if attendance else None,
                     "total_sessions": total_sessions,
                     "present_count": present_count,
                     "absent_count": absent_count,
@@ -865,38 +945,80 @@ class DatabaseQueryService:
             
             # Sort students by name
             students_list.sort(key=lambda x: x["name"])
-            
-            print(f"[DEBUG] Retrieved {len(students_list)} students for course {course.name}")
-            print(f"[DEBUG] Enrollment summary: {enrollment_summary}")
-            print(f"[DEBUG] Attendance summary: {attendance_stats}")
+            total_students = len(students_list)
+            next_offset = None
+            if limit is not None:
+                if offset + limit < total_students:
+                    next_offset = offset + limit
+                students_list = students_list[offset:offset + limit]
+            elif offset:
+                students_list = students_list[offset:]
+            
+            logger.debug("Retrieved %s students for course %s", len(students_list), course.name)
+            logger.debug("Enrollment summary: %s", enrollment_summary)
+            logger.debug("Attendance summary: %s", attendance_stats)
             
             return {
                 "success": True,
                 "message": f"Retrieved {len(students_list)} students for course {course.name}",
                 "course_info": course_info,
                 "students": students_list,
-                "total_students": len(students_list),
+                "total_students": total_students,
+                "next_offset": next_offset,
                 "enrollment_summary": enrollment_summary,
                 "attendance_summary": attendance_stats
             }
         except Exception as e:
-            print(f"[DEBUG] Error getting course students for assigned_course_id {assigned_course_id}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error getting course students for assigned_course_id %s: %s", assigned_course_id, e)
             raise
     
     @staticmethod
-    def get_student_attendance_history(db: Session, current_student: Dict[str, Any]) -> Dict[str, Any]:
+    def encode_attendance_cursor(attendance: AttendanceLog) -> str:
+        """Keyset cursor pointing just past the given attendance log"""
+        return f"{attendance.date.isoformat()}|{attendance.id}"
+    
+    @staticmethod
+    def decode_attendance_cursor(cursor: str) -> tuple:
+        """
+        Parse a cursor produced by encode_attendance_cursor
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            date_part, id_part = cursor.rsplit("|", 1)
+            return datetime.fromisoformat(date_part), int(id_part)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid attendance cursor") from None
+    
+    @staticmethod
+    def get_student_attendance_history(
+        db: Session,
+        current_student: Dict[str, Any],
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Get all attendance records for a student with course information
+        Get attendance records for a student with course information
+        
+        Summaries always cover the full history; only the record list is paged.
         
         Args:
             db: Database session
             current_student: Current student data from JWT
+            limit: Maximum number of records to return (all records if None)
+            cursor: next_cursor from a previous page, newest records first
             
         Returns:
-            Dictionary with attendance records and summaries
+            Dictionary with attendance records, summaries and next_cursor
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        # Decoded before the catch-all below, so a client's bad cursor is not logged as an error
+        if cursor:
+            cursor_date, cursor_id = DatabaseQueryService.decode_attendance_cursor(cursor)
+        
         try:
             user_id = current_student.get("user_id")
             student_id = current_student.get("student_id")
@@ -906,48 +1028,122 @@ class DatabaseQueryService:
             
             # If student_id is not in JWT data, fetch it from database
             if not student_id:
-                print(f"Student ID not in JWT, fetching from database for user_id: {user_id}")
+                logger.debug("Student ID not in JWT, fetching from database for user_id: %s", user_id)
                 student_data = DatabaseQueryService.get_student_by_user_id(db, user_id)
                 if not student_data:
                     raise ValueError("Student record not found for this user")
                 student_id = student_data["student_id"]
-                print(f"Found student_id: {student_id}")
+                logger.debug("Found student_id: %s", student_id)
+            
+            def joined_attendance_query(*columns):
+                return db.query(*columns).join(
+                    Assigned_Course, AttendanceLog.assigned_course_id == Assigned_Course.id
+                ).join(
+                    Course, Assigned_Course.course_id == Course.id
+                ).join(
+                    User, Assigned_Course.faculty_id == User.id
+                ).join(
+                    Section, Assigned_Course.section_id == Section.id
+                ).join(
+                    Program, Section.program_id == Program.id
+                ).filter(
+                    AttendanceLog.user_id == user_id,
+                    Assigned_Course.isDeleted == 0,
+                    Course.isDeleted == 0,
+                    User.isDeleted == 0
+                )
+            
+            # Summaries are aggregated in SQL so they don't depend on the page size
+            status_groups = joined_attendance_query(
+                Course.name,
+                Course.code,
+                Assigned_Course.academic_year,
+                Assigned_Course.semester,
+                AttendanceLog.status,
+                func.count(AttendanceLog.id)
+            ).group_by(
+                Assigned_Course.id,
+                AttendanceLog.status
+            ).order_by(func.max(AttendanceLog.date).desc()).all()
             
-            # Get all attendance logs for this student with course information
-            print(f"Fetching attendance records for user_id: {user_id}")
-            attendance_query = db.query(
+            course_summary = {}
+            academic_year_summary = {}
+            status_counts = {"present": 0, "absent": 0, "late": 0}
+            total_sessions = 0
+            
+            for course_name, course_code, course_academic_year, semester, status, count in status_groups:
+                total_sessions += count
+                
+                # Update status counts
+                if status in status_counts:
+                    status_counts[status] += count
+                
+                # Update course summary
+                course_key = f"{course_name} ({course_academic_year})"
+                if course_key not in course_summary:
+                    course_summary[course_key] = {
+                        "course_name": course_name,
+                        "course_code": course_code,
+                        "academic_year": course_academic_year,
+                        "semester": semester,
+                        "total_sessions": 0,
+                        "present": 0,
+                        "absent": 0,
+                        "late": 0,
+                        "attendance_percentage": 0.0
+                    }
+                
+                course_summary[course_key]["total_sessions"] += count
+                if status in ["present", "absent", "late"]:
+                    course_summary[course_key][status] += count
+                
+                # Update academic year summary
+                academic_year = course_academic_year or "Unknown"
+                if academic_year not in academic_year_summary:
+                    academic_year_summary[academic_year] = {
+                        "total_sessions": 0,
+                        "present": 0,
+                        "absent": 0,
+                        "late": 0,
+                        "attendance_percentage": 0.0
+                    }
+                
+                academic_year_summary[academic_year]["total_sessions"] += count
+                if status in ["present", "absent", "late"]:
+                    academic_year_summary[academic_year][status] += count
+            
+            # Get the requested page of attendance logs, newest first
+            logger.debug("Fetching attendance records for user_id: %s", user_id)
+            attendance_query = joined_attendance_query(
                 AttendanceLog,
                 Assigned_Course,
                 Course,
                 User,
                 Section,
                 Program
-            ).join(
-                Assigned_Course, AttendanceLog.assigned_course_id == Assigned_Course.id
-            ).join(
-                Course, Assigned_Course.course_id == Course.id
-            ).join(
-                User, Assigned_Course.faculty_id == User.id
-            ).join(
-                Section, Assigned_Course.section_id == Section.id
-            ).join(
-                Program, Section.program_id == Program.id
-            ).filter(
-                AttendanceLog.user_id == user_id,
-                Assigned_Course.isDeleted == 0,
-                Course.isDeleted == 0,
-                User.isDeleted == 0
-            ).order_by(AttendanceLog.date.desc()).all()
+            )
+            if cursor:
+                attendance_query = attendance_query.filter(
+                    or_(
+                        AttendanceLog.date < cursor_date,
+                        and_(AttendanceLog.date == cursor_date, AttendanceLog.id < cursor_id)
+                    )
+                )
+            attendance_query = attendance_query.order_by(AttendanceLog.date.desc(), AttendanceLog.id.desc())
+            if limit is not None:
+                # Fetch one extra row to know whether another page exists
+                attendance_page = attendance_query.limit(limit + 1).all()
+                has_more = len(attendance_page) > limit
+                attendance_page = attendance_page[:limit]
+            else:
+                attendance_page = attendance_query.all()
+                has_more = False
             
-            print(f"Found {len(attendance_query)} attendance records for student")
+            logger.debug("Found %s attendance records for student", len(attendance_page))
             
             # Process attendance records
             attendance_records = []
-            course_summary = {}
-            academic_year_summary = {}
-            status_counts = {"present": 0, "absent": 0, "late": 0}
-            
-            for attendance, assigned_course, course, faculty, section, program in attendance_query:
+            for attendance, assigned_course, course, faculty, section, program in attendance_page:
                 # Check if attendance has an image
                 has_image = attendance.image is not None and len(attendance.image) > 0
                 
@@ -973,44 +1169,10 @@ class DatabaseQueryService:
                 }
                 
                 attendance_records.append(attendance_record)
-                
-                # Update status counts
-                if attendance.status in status_counts:
-                    status_counts[attendance.status] += 1
-                
-                # Update course summary
-                course_key = f"{course.name} ({assigned_course.academic_year})"
-                if course_key not in course_summary:
-                    course_summary[course_key] = {
-                        "course_name": course.name,
-                        "course_code": course.code,
-                        "academic_year": assigned_course.academic_year,
-                        "semester": assigned_course.semester,
-                        "total_sessions": 0,
-                        "present": 0,
-                        "absent": 0,
-                        "late": 0,
-                        "attendance_percentage": 0.0
-                    }
-                
-                course_summary[course_key]["total_sessions"] += 1
-                if attendance.status in ["present", "absent", "late"]:
-                    course_summary[course_key][attendance.status] += 1
-                
-                # Update academic year summary
-                academic_year = assigned_course.academic_year or "Unknown"
-                if academic_year not in academic_year_summary:
-                    academic_year_summary[academic_year] = {
-                        "total_sessions": 0,
-                        "present": 0,
-                        "absent": 0,
-                        "late": 0,
-                        "attendance_percentage": 0.0
-                    }
-                
-                academic_year_summary[academic_year]["total_sessions"] += 1
-                if attendance.status in ["present", "absent", "late"]:
-                    academic_year_summary[academic_year][attendance.status] += 1
+            
+            next_cursor = None
+            if has_more:
+                next_cursor = DatabaseQueryService.encode_attendance_cursor(attendance_page[-1][0])
             
             # Calculate attendance percentages for course summary
             for course_key in course_summary:
@@ -1029,7 +1191,6 @@ class DatabaseQueryService:
                     year_data["attendance_percentage"] = round((attended / total) * 100, 2)
             
             # Calculate overall attendance statistics
-            total_sessions = len(attendance_records)
             overall_attendance_percentage = 0.0
             if total_sessions > 0:
                 attended_sessions = status_counts["present"] + status_counts["late"]
@@ -1057,7 +1218,7 @@ class DatabaseQueryService:
                 "has_section": current_student.get("has_section", False)
             }
             
-            print(f"Successfully retrieved {total_sessions} attendance records across {len(course_summary)} courses")
+            logger.debug("Successfully retrieved %s attendance records across %s courses", total_sessions, len(course_summary))
             
             return {
                 "success": True,
@@ -1065,15 +1226,14 @@ class DatabaseQueryService:
                 "student_info": student_info,
                 "attendance_records": attendance_records,
                 "total_records": total_sessions,
+                "next_cursor": next_cursor,
                 "attendance_summary": attendance_summary,
                 "course_summary": course_summary,
                 "academic_year_summary": academic_year_summary
             }
             
         except Exception as e:
-            print(f"Error getting student attendance history: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error getting student attendance history: %s", e)
             raise
 
 # Create a singleton instance for easy import
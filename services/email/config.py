@@ -18,3 +18,6 @@ APP_NAME = "AttendanceApp"
 
 # OTP settings
 OTP_EXPIRY_MINUTES = int(os.getenv("OTP_EXPIRY_MINUTES", "15"))
+# Registrations whose face image is held until OTP verification; size it for the
+# peak number of sign-ups expected within OTP_EXPIRY_MINUTES
+PENDING_FACE_IMAGES_MAX = int(os.getenv("PENDING_FACE_IMAGES_MAX", "4096"))
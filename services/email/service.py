@@ -1,5 +1,8 @@
+import logging
 import smtplib
 import ssl
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -18,7 +21,17 @@ from .config import (
     APP_NAME
 )
 
+logger = logging.getLogger(__name__)
+
 class EmailService:
+    # One SMTP session is shared by every instance, so a burst of OTP emails pays for
+    # the TLS handshake and login once instead of per message. Sends are serialized on
+    # the lock, and a session idle for longer than SMTP_IDLE_SECONDS is replaced.
+    SMTP_IDLE_SECONDS = 60
+    _smtp_server = None
+    _smtp_last_used = 0.0
+    _smtp_lock = threading.Lock()
+    
     def __init__(self):
         self.smtp_server = EMAIL_SMTP_SERVER
         self.smtp_port = EMAIL_SMTP_PORT
@@ -42,9 +55,33 @@ class EmailService:
             
             return server
         except Exception as e:
-            print(f"Error creating SMTP connection: {e}")
+            logger.warning("Error creating SMTP connection: %s", e)
             raise
     
+    def _get_smtp_connection(self):
+        """Return the shared SMTP session, reconnecting if it is idle or closed; call with _smtp_lock held"""
+        cls = EmailService
+        server = cls._smtp_server
+        if server is not None and time.monotonic() - cls._smtp_last_used < cls.SMTP_IDLE_SECONDS:
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except smtplib.SMTPException:
+                pass
+        self._close_smtp_connection()
+        cls._smtp_server = self._create_smtp_connection()
+        return cls._smtp_server
+    
+    @staticmethod
+    def _close_smtp_connection():
+        """Close the shared SMTP session, if any; call with _smtp_lock held"""
+        server, EmailService._smtp_server = EmailService._smtp_server, None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+    
     def send_email(self, to_email, subject, body_text, body_html=None, attachments=None):
         """
         Send an email
@@ -79,18 +116,23 @@ class EmailService:
                 html_part = MIMEText(body_html, "html")
                 message.attach(html_part)
             
-            # Send email
-            server = self._create_smtp_connection()
+            # Send email over the shared session, retrying once on a fresh one if the
+            # server dropped it between the liveness check and the send
             text = message.as_string()
-            server.sendmail(self.email, to_email, text)
-            server.quit()
-            
-            print(f"Email sent successfully to {to_email}")
+            with EmailService._smtp_lock:
+                try:
+                    self._get_smtp_connection().sendmail(self.email, to_email, text)
+                except smtplib.SMTPServerDisconnected:
+                    self._close_smtp_connection()
+                    self._get_smtp_connection().sendmail(self.email, to_email, text)
+                EmailService._smtp_last_used = time.monotonic()
+            
+            logger.debug("Email sent successfully to %s", to_email)
             return True, "Email sent successfully"
             
         except Exception as e:
             error_msg = f"Failed to send email: {str(e)}"
-            print(error_msg)
+            logger.warning("%s", error_msg)
             return False, error_msg
     
     def send_registration_otp_email(self, to_email, first_name, otp_code):
@@ -178,7 +220,7 @@ Best regards,
             
         except Exception as e:
             error_msg = f"Failed to send registration OTP email: {str(e)}"
-            print(error_msg)
+            logger.warning("%s", error_msg)
             return False, error_msg
 
     def send_welcome_email(self, to_email, first_name):
@@ -264,7 +306,7 @@ AttendanceApp Team
             
         except Exception as e:
             error_msg = f"Failed to send welcome email: {str(e)}"
-            print(error_msg)
+            logger.warning("%s", error_msg)
             return False, error_msg
 
     def send_login_otp_email(self, to_email, first_name, otp_code):
@@ -349,7 +391,7 @@ Best regards,
             
         except Exception as e:
             error_msg = f"Failed to send login OTP email: {str(e)}"
-            print(error_msg)
+            logger.warning("%s", error_msg)
             return False, error_msg
 
     def send_password_reset_otp_email(self, to_email, first_name, otp_code):
@@ -443,7 +485,7 @@ Best regards,
             
         except Exception as e:
             error_msg = f"Failed to send password reset OTP email: {str(e)}"
-            print(error_msg)
+            logger.warning("%s", error_msg)
             return False, error_msg
 
     def send_password_reset_success_email(self, to_email, first_name):
@@ -536,7 +578,7 @@ Best regards,
             
         except Exception as e:
             error_msg = f"Failed to send password reset success email: {str(e)}"
-            print(error_msg)
+            logger.warning("%s", error_msg)
             return False, error_msg
 
     # Add placeholder methods for other OTP types to avoid errors
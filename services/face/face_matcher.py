@@ -19,113 +19,59 @@ The anti-spoofing algorithms use multiple detection techniques to identify fake
 """
 
 import cv2
+import hashlib
+import logging
+import threading
 import numpy as np
-import base64  # Move base64 import to module level
-from typing import Tuple, Optional
+import pybase64
+from cachetools import TTLCache
+from typing import Tuple, Optional, Union
 import face_recognition
 
-def detect_face_spoofing(image: np.ndarray) -> Tuple[bool, str]:
+# detect_face_spoofing lives in validator so the pool workers can run it without loading dlib
+from services.face.validator import decode_base64_image, detect_face_spoofing
+
+logger = logging.getLogger(__name__)
+
+# PROFILE ENCODING CACHE: The stored profile image only changes when the user re-uploads it,
+# so its 128-d encoding is kept in memory, keyed by a digest of the image bytes. A new
+# profile picture has a new digest, so stale encodings are never used.
+PROFILE_ENCODING_CACHE_TTL_SECONDS = 3600
+_profile_encoding_cache = TTLCache(maxsize=2048, ttl=PROFILE_ENCODING_CACHE_TTL_SECONDS)
+_profile_encoding_cache_lock = threading.Lock()
+
+def profile_encoding_key(stored_face_image: bytes) -> bytes:
+    """Cache key for a stored profile image (digest of its bytes)"""
+    return hashlib.blake2b(stored_face_image, digest_size=16).digest()
+
+def get_cached_profile_encoding(key: bytes) -> Optional[np.ndarray]:
+    """Return the cached face encoding for a profile image key, or None"""
+    with _profile_encoding_cache_lock:
+        return _profile_encoding_cache.get(key)
+
+def cache_profile_encoding(key: bytes, encoding: np.ndarray) -> None:
     """
-    CRITICAL SECURITY FUNCTION: Multi-layered spoofing detection system
-    
-    This function implements 6 different anti-spoofing techniques to detect fake submissions:
+    Remember the face encoding computed for a profile image key
     
-    1. SHARPNESS ANALYSIS: Blurry images often indicate photos of photos
-    2. SCREEN REFLECTION DETECTION: Identifies phone/computer screen displays
-    3. COLOR DISTRIBUTION ANALYSIS: Detects artificial digital displays
-    4. EDGE DETECTION: Finds rectangular screen borders in submissions
-    5. LIGHTING CONSISTENCY: Identifies artificial or uniform lighting
-    6. JPEG ARTIFACT DETECTION: Recognizes digital photo compression patterns
+    Stored as float32, half the size of face_recognition's float64 output; the rounding
+    is far below what moves a face distance across the matching tolerance.
+    """
+    with _profile_encoding_cache_lock:
+        _profile_encoding_cache[key] = np.asarray(encoding, dtype=np.float32)
+
+def warmup_face_model() -> None:
+    """
+    Run one detection and one encoding on a blank frame
     
-    Args:
-        image (np.ndarray): The submitted face image to analyze
-        
-    Returns:
-        Tuple[bool, str]: (is_live_face, detection_message)
-        - True: Live face detected, safe to proceed
-        - False: Spoofing attempt detected, block submission
-        
-    SECURITY CRITICAL: This function is the first line of defense against attendance fraud
+    dlib maps the model weights lazily, so without this the first attendance submission
+    after a restart pays for it. Called from the app lifespan; face matching only runs in
+    the API process, so the validation pool workers skip it.
     """
-    try:
-        # Convert to grayscale for computational analysis
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # TECHNIQUE 1: SHARPNESS ANALYSIS
-        # Real faces have natural texture and sharpness variations
-        # Photos of photos tend to be blurry due to double compression
-        laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-        laplacian_var = float(np.var(laplacian.astype(np.float64)))
-        if laplacian_var < 100:  # Threshold determined through testing
-            return False, "Image too blurry"
-        
-        # TECHNIQUE 2: SCREEN REFLECTION & MOIRÉ PATTERN DETECTION
-        # Phone/computer screens create high-frequency artifacts and patterns
-        # These patterns are visible when photographing a screen
-        kernel = np.array([[-1,-1,-1], [-1,8,-1], [-1,-1,-1]])  # High-pass filter
-        high_freq = cv2.filter2D(gray, -1, kernel)
-        # Fix: Explicit type conversion for variance calculation
-        high_freq_var = float(np.var(high_freq.astype(np.float64)))
-        
-        if high_freq_var > 2000:  # High variance indicates screen artifacts
-            return False, "Screen display detected"
-        
-        # TECHNIQUE 3: COLOR DISTRIBUTION ANALYSIS
-        # Real faces have natural color variation across hue spectrum
-        # Digital displays have limited color peaks and artificial distribution
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        hist_h = cv2.calcHist([hsv], [0], None, [180], [0, 180])
-        
-        # Fix: Explicit type conversion for mean calculation
-        hist_mean = float(np.mean(hist_h.astype(np.float64)))
-        color_peaks = np.sum(hist_h > hist_mean * 3)
-        if color_peaks < 5:  # Too few color peaks indicates digital display
-            return False, "Digital display detected"
-        
-        # TECHNIQUE 4: RECTANGULAR EDGE DETECTION (SCREEN BORDER DETECTION)
-        # Phones/tablets/computers have rectangular screens with sharp edges
-        # Real environments don't have large rectangular shapes
-        edges = cv2.Canny(gray, 50, 150)
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        for contour in contours:
-            # Check if contour covers significant portion of image (likely screen border)
-            if cv2.contourArea(contour) > image.shape[0] * image.shape[1] * 0.3:
-                # Approximate contour to check if it's rectangular
-                approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
-                if len(approx) == 4:  # Rectangle detected
-                    return False, "Screen border detected"
-        
-        # TECHNIQUE 5: LIGHTING CONSISTENCY ANALYSIS
-        # Real faces have natural lighting variations and shadows
-        # Artificial/uniform lighting indicates digital display or printed photo
-        # Fix: Explicit type conversion for std calculation
-        brightness_std = float(np.std(gray.astype(np.float64)))
-        if brightness_std < 20:  # Too uniform lighting
-            return False, "Artificial lighting detected"
-        
-        # TECHNIQUE 6: JPEG COMPRESSION ARTIFACT DETECTION
-        # Digital photos have specific frequency domain patterns from JPEG compression
-        # These patterns form block structures that can be detected
-        f_transform = np.fft.fft2(gray.astype(np.float64))  # Fix: Explicit type conversion for FFT
-        f_shift = np.fft.fftshift(f_transform)  # Shift zero frequency to center
-        magnitude = np.abs(f_shift)
-        
-        # Check for 8x8 block patterns typical of JPEG compression
-        block_pattern = np.sum(magnitude[::8, ::8])  # Sample every 8th pixel
-        total_magnitude = np.sum(magnitude)
-        
-        if block_pattern / total_magnitude > 0.1:  # Too much block structure
-            return False, "Digital photo detected"
-        
-        # ALL TESTS PASSED: This appears to be a live face
-        return True, "Live face detected"
-        
-    except Exception as e:
-        # If any analysis fails, err on the side of caution and block submission
-        return False, "Liveness check failed"
+    blank = np.zeros((150, 150, 3), np.uint8)
+    face_recognition.face_locations(blank)
+    face_recognition.face_encodings(blank, known_face_locations=[(0, 150, 150, 0)])
 
-def enhanced_face_comparison(stored_face_image: bytes, submitted_face_image: str, tolerance: float = 0.3) -> Tuple[bool, str]:
+def enhanced_face_comparison(stored_face_image: bytes, submitted_face_image: Union[str, bytes], tolerance: float = 0.3) -> Tuple[bool, str]:
     """
     ADVANCED FACE VERIFICATION with integrated anti-spoofing protection
     
@@ -136,7 +82,7 @@ def enhanced_face_comparison(stored_face_image: bytes, submitted_face_image: str
     4. Calculates confidence scores for verification accuracy
     
     PROCESS FLOW:
-    stored_image (from DB) → decode → face_encoding
+    stored_image (from DB) → decode → face_encoding (cached per profile image)
                                          ↓
     submitted_image → decode → anti_spoof_check → face_encoding → COMPARE → result
     
@@ -156,8 +102,8 @@ def enhanced_face_comparison(stored_face_image: bytes, submitted_face_image: str
     """
     try:
         # STEP 1: DECODE STORED FACE IMAGE FROM DATABASE WITH BETTER FORMAT DETECTION
-        print(f"DEBUG: Stored face image type: {type(stored_face_image)}")
-        print(f"DEBUG: Stored face image length: {len(stored_face_image) if stored_face_image else 'None'}")
+        logger.debug("Stored face image type: %s", type(stored_face_image))
+        logger.debug("Stored face image length: %s", len(stored_face_image) if stored_face_image else 'None')
         
         # Check if stored face image is None or empty
         if not stored_face_image:
@@ -167,158 +113,163 @@ def enhanced_face_comparison(stored_face_image: bytes, submitted_face_image: str
         if len(stored_face_image) < 100:  # Minimum size for a valid image
             return False, "Stored face image appears to be corrupted (too small)"
         
-        try:
-            # ENHANCED FORMAT DETECTION: Check image headers more thoroughly
-            header_bytes = stored_face_image[:20]
-            print(f"DEBUG: Image header bytes: {[hex(b) for b in header_bytes[:10]]}")
+        # Reuse the profile encoding computed for this exact image on an earlier submission
+        profile_key = profile_encoding_key(stored_face_image)
+        stored_encoding = get_cached_profile_encoding(profile_key)
+        
+        if stored_encoding is None:
+            try:
+                # ENHANCED FORMAT DETECTION: Check image headers more thoroughly
+                header_bytes = stored_face_image[:20]
+                logger.debug("Image header bytes: %s", header_bytes[:10].hex())
             
-            # Detect image format more accurately
-            image_format = "unknown"
-            if stored_face_image[:2] == b'\xff\xd8':
-                image_format = "JPEG"
-                print("DEBUG: Detected JPEG image format (starts with FF D8)")
-            elif stored_face_image[:8] == b'\x89PNG\r\n\x1a\n':
-                image_format = "PNG"
-                print("DEBUG: Detected PNG image format")
-            elif stored_face_image[:6] in [b'GIF87a', b'GIF89a']:
-                image_format = "GIF"
-                print("DEBUG: Detected GIF image format")
-            elif stored_face_image[:4] == b'RIFF' and stored_face_image[8:12] == b'WEBP':
-                image_format = "WEBP"
-                print("DEBUG: Detected WEBP image format")
-            else:
-                print("DEBUG: Unknown image format detected")
-                print(f"DEBUG: First 20 bytes as hex: {stored_face_image[:20].hex()}")
-                print(f"DEBUG: First 20 bytes as text (ignore errors): {repr(stored_face_image[:20])}")
+                # Detect image format more accurately
+                image_format = "unknown"
+                if stored_face_image[:2] == b'\xff\xd8':
+                    image_format = "JPEG"
+                    logger.debug("Detected JPEG image format (starts with FF D8)")
+                elif stored_face_image[:8] == b'\x89PNG\r\n\x1a\n':
+                    image_format = "PNG"
+                    logger.debug("Detected PNG image format")
+                elif stored_face_image[:6] in [b'GIF87a', b'GIF89a']:
+                    image_format = "GIF"
+                    logger.debug("Detected GIF image format")
+                elif stored_face_image[:4] == b'RIFF' and stored_face_image[8:12] == b'WEBP':
+                    image_format = "WEBP"
+                    logger.debug("Detected WEBP image format")
+                else:
+                    logger.debug("Unknown image format detected")
+                    logger.debug("First 20 bytes as hex: %s", stored_face_image[:20].hex())
+                    logger.debug("First 20 bytes as text (ignore errors): %s", repr(stored_face_image[:20]))
             
-            # Try multiple decode approaches with format-specific handling
-            stored_np_array = np.frombuffer(stored_face_image, np.uint8)
-            print(f"DEBUG: Numpy array shape: {stored_np_array.shape}")
-            print(f"DEBUG: Numpy array dtype: {stored_np_array.dtype}")
+                # Try multiple decode approaches with format-specific handling
+                stored_np_array = np.frombuffer(stored_face_image, np.uint8)
+                logger.debug("Numpy array shape: %s", stored_np_array.shape)
+                logger.debug("Numpy array dtype: %s", stored_np_array.dtype)
             
-            # Primary decode attempt - this should work for most formats
-            stored_image = cv2.imdecode(stored_np_array, cv2.IMREAD_COLOR)
+                # Primary decode attempt - this should work for most formats
+                stored_image = cv2.imdecode(stored_np_array, cv2.IMREAD_COLOR)
             
-            if stored_image is None:
-                print(f"DEBUG: Primary cv2.imdecode failed for {image_format} format, trying alternatives...")
+                if stored_image is None:
+                    logger.debug("Primary cv2.imdecode failed for %s format, trying alternatives...", image_format)
                 
-                # Alternative 1: Try with IMREAD_UNCHANGED (preserves alpha channel)
-                stored_image = cv2.imdecode(stored_np_array, cv2.IMREAD_UNCHANGED)
-                if stored_image is not None:
-                    print(f"DEBUG: Alternative decode with IMREAD_UNCHANGED succeeded for {image_format}")
-                    # Handle different channel configurations
-                    if len(stored_image.shape) == 3:
-                        if stored_image.shape[2] == 4:
-                            # RGBA to BGR
-                            print("DEBUG: Converting RGBA to BGR")
-                            stored_image = cv2.cvtColor(stored_image, cv2.COLOR_RGBA2BGR)
-                        elif stored_image.shape[2] == 3:
-                            # Might be RGB instead of BGR, check if conversion needed
-                            print(f"DEBUG: 3-channel image detected, assuming BGR")
-                            # stored_image = cv2.cvtColor(stored_image, cv2.COLOR_RGB2BGR)  # Uncomment if needed
-                    elif len(stored_image.shape) == 2:
-                        # Grayscale to BGR
-                        print("DEBUG: Converting grayscale to BGR")
-                        stored_image = cv2.cvtColor(stored_image, cv2.COLOR_GRAY2BGR)
-                else:
-                    print("DEBUG: Alternative decode with IMREAD_UNCHANGED also failed")
+                    # Alternative 1: Try with IMREAD_UNCHANGED (preserves alpha channel)
+                    stored_image = cv2.imdecode(stored_np_array, cv2.IMREAD_UNCHANGED)
+                    if stored_image is not None:
+                        logger.debug("Alternative decode with IMREAD_UNCHANGED succeeded for %s", image_format)
+                        # Handle different channel configurations
+                        if len(stored_image.shape) == 3:
+                            if stored_image.shape[2] == 4:
+                                # RGBA to BGR
+                                logger.debug("Converting RGBA to BGR")
+                                stored_image = cv2.cvtColor(stored_image, cv2.COLOR_RGBA2BGR)
+                            elif stored_image.shape[2] == 3:
+                                # Might be RGB instead of BGR, check if conversion needed
+                                logger.debug("3-channel image detected, assuming BGR")
+                                # stored_image = cv2.cvtColor(stored_image, cv2.COLOR_RGB2BGR)  # Uncomment if needed
+                        elif len(stored_image.shape) == 2:
+                            # Grayscale to BGR
+                            logger.debug("Converting grayscale to BGR")
+                            stored_image = cv2.cvtColor(stored_image, cv2.COLOR_GRAY2BGR)
+                    else:
+                        logger.debug("Alternative decode with IMREAD_UNCHANGED also failed")
                     
-                    # Alternative 2: Maybe it's base64 encoded in the database
-                    if stored_image is None:
-                        try:
-                            print("DEBUG: Trying base64 decode (double-encoded scenario)")
-                            # Use the module-level imported base64, don't import again
-                            decoded_bytes = base64.b64decode(stored_face_image)
-                            test_array = np.frombuffer(decoded_bytes, np.uint8)
-                            stored_image = cv2.imdecode(test_array, cv2.IMREAD_COLOR)
-                            if stored_image is not None:
-                                print("DEBUG: Image was base64 encoded in database!")
-                            else:
-                                print("DEBUG: Base64 decode attempt also failed")
-                        except Exception as b64_error:
-                            print(f"DEBUG: Base64 decode attempt failed with exception: {b64_error}")
+                        # Alternative 2: Maybe it's base64 encoded in the database
+                        if stored_image is None:
+                            try:
+                                logger.debug("Trying base64 decode (double-encoded scenario)")
+                                # Use the module-level imported pybase64, don't import again
+                                decoded_bytes = pybase64.b64decode(stored_face_image)
+                                test_array = np.frombuffer(decoded_bytes, np.uint8)
+                                stored_image = cv2.imdecode(test_array, cv2.IMREAD_COLOR)
+                                if stored_image is not None:
+                                    logger.debug("Image was base64 encoded in database!")
+                                else:
+                                    logger.debug("Base64 decode attempt also failed")
+                            except Exception as b64_error:
+                                logger.warning("Base64 decode attempt failed with exception: %s", b64_error)
                     
-                    # Alternative 3: Try different image libraries (if available)
-                    if stored_image is None:
-                        try:
-                            print("DEBUG: Trying PIL/Pillow as fallback")
-                            from PIL import Image
-                            import io
+                        # Alternative 3: Try different image libraries (if available)
+                        if stored_image is None:
+                            try:
+                                logger.debug("Trying PIL/Pillow as fallback")
+                                from PIL import Image
+                                import io
                             
-                            # Convert bytes to PIL Image
-                            pil_image = Image.open(io.BytesIO(stored_face_image))
-                            # Convert PIL to numpy array
-                            stored_image = np.array(pil_image)
-                            # Convert RGB to BGR for OpenCV
-                            if len(stored_image.shape) == 3 and stored_image.shape[2] == 3:
-                                stored_image = cv2.cvtColor(stored_image, cv2.COLOR_RGB2BGR)
-                            print(f"DEBUG: PIL decode successful, shape: {stored_image.shape}")
-                        except Exception as pil_error:
-                            print(f"DEBUG: PIL decode failed: {pil_error}")
+                                # Convert bytes to PIL Image
+                                pil_image = Image.open(io.BytesIO(stored_face_image))
+                                # Convert PIL to numpy array
+                                stored_image = np.array(pil_image)
+                                # Convert RGB to BGR for OpenCV
+                                if len(stored_image.shape) == 3 and stored_image.shape[2] == 3:
+                                    stored_image = cv2.cvtColor(stored_image, cv2.COLOR_RGB2BGR)
+                                logger.debug("PIL decode successful, shape: %s", stored_image.shape)
+                            except Exception as pil_error:
+                                logger.debug("PIL decode failed: %s", pil_error)
             
-            if stored_image is None:
-                print(f"DEBUG: All decode attempts failed for {image_format} format")
-                print(f"DEBUG: Image size: {len(stored_face_image)} bytes")
-                print(f"DEBUG: Image header: {stored_face_image[:50].hex()}")
-                return False, f"Could not decode stored face image - unsupported {image_format} format or corrupted data"
+                if stored_image is None:
+                    logger.debug("All decode attempts failed for %s format", image_format)
+                    logger.debug("Image size: %s bytes", len(stored_face_image))
+                    logger.debug("Image header: %s", stored_face_image[:50].hex())
+                    return False, f"Could not decode stored face image - unsupported {image_format} format or corrupted data"
             
-            print(f"DEBUG: Successfully decoded stored {image_format} image, shape: {stored_image.shape}")
+                logger.debug("Successfully decoded stored %s image, shape: %s", image_format, stored_image.shape)
             
-        except Exception as decode_error:
-            print(f"DEBUG: Exception during stored image decode: {str(decode_error)}")
-            import traceback
-            traceback.print_exc()
-            return False, f"Error decoding stored face image: {str(decode_error)}"
+            except Exception as decode_error:
+                logger.exception("Exception during stored image decode: %s", decode_error)
+                return False, f"Error decoding stored face image: {str(decode_error)}"
         
         # STEP 2: DECODE SUBMITTED FACE IMAGE FROM BASE64
-        # Handle data URI format (data:image/jpeg;base64,xxxxx)
-        if submitted_face_image.startswith('data:image'):
-            submitted_face_image = submitted_face_image.split(',')[1]
-        
+        # Handles data URI format (data:image/jpeg;base64,xxxxx) and raw uploaded bytes
         try:
-            submitted_image_data = base64.b64decode(submitted_face_image)
+            submitted_image_data = decode_base64_image(submitted_face_image)
             submitted_np_array = np.frombuffer(submitted_image_data, np.uint8)
             submitted_image = cv2.imdecode(submitted_np_array, cv2.IMREAD_COLOR)
             
             if submitted_image is None:
                 return False, "Could not decode submitted face image"
             
-            print(f"DEBUG: Submitted image shape: {submitted_image.shape}")
+            logger.debug("Submitted image shape: %s", submitted_image.shape)
             
         except Exception as decode_error:
-            print(f"DEBUG: Error decoding submitted image: {str(decode_error)}")
+            logger.warning("Error decoding submitted image: %s", str(decode_error))
             return False, f"Error decoding submitted face image: {str(decode_error)}"
         
         # STEP 3: CRITICAL SECURITY CHECK - ANTI-SPOOFING DETECTION
         # This is the most important security step - MUST pass before face comparison
-        print("Checking face liveness...")
+        logger.debug("Checking face liveness...")
         is_live, liveness_message = detect_face_spoofing(submitted_image)
         if not is_live:
-            print(f"Liveness check failed: {liveness_message}")
+            logger.debug("Liveness check failed: %s", liveness_message)
             # SECURITY BLOCK: Spoofing detected, immediately reject submission
             return False, f"Spoofing detected: {liveness_message}"
         
-        print("Liveness check passed")
+        logger.debug("Liveness check passed")
         
         # STEP 4: PREPARE IMAGES FOR FACE RECOGNITION
         # Convert BGR (OpenCV) to RGB (face_recognition library requirement)
-        stored_rgb = cv2.cvtColor(stored_image, cv2.COLOR_BGR2RGB)
         submitted_rgb = cv2.cvtColor(submitted_image, cv2.COLOR_BGR2RGB)
         
         # STEP 5: EXTRACT FACE ENCODINGS (DEEP LEARNING FEATURE EXTRACTION)
-        # This uses advanced CNN models to extract unique facial features
-        stored_encodings = face_recognition.face_encodings(stored_rgb)
-        submitted_encodings = face_recognition.face_encodings(submitted_rgb)
+        # This uses advanced CNN models to extract unique facial features.
+        # The stored profile is only encoded on a cache miss.
+        if stored_encoding is None:
+            stored_rgb = cv2.cvtColor(stored_image, cv2.COLOR_BGR2RGB)
+            stored_encodings = face_recognition.face_encodings(stored_rgb)
+            
+            # Validate that a face was detected in the stored image
+            if len(stored_encodings) == 0:
+                return False, "No face detected in stored image"
+            
+            # Use the first (and should be only) face found in the image
+            stored_encoding = stored_encodings[0]
+            cache_profile_encoding(profile_key, stored_encoding)
         
-        # Validate that faces were detected in both images
-        if len(stored_encodings) == 0:
-            return False, "No face detected in stored image"
+        submitted_encodings = face_recognition.face_encodings(submitted_rgb)
         
         if len(submitted_encodings) == 0:
             return False, "No face detected in submitted image"
         
-        # Use the first (and should be only) face found in each image
-        stored_encoding = stored_encodings[0]
         submitted_encoding = submitted_encodings[0]
         
         # STEP 6: FACE COMPARISON USING EUCLIDEAN DISTANCE
@@ -331,20 +282,18 @@ def enhanced_face_comparison(stored_face_image: bytes, submitted_face_image: str
         
         # STEP 7: FINAL VERIFICATION DECISION
         if matches[0]:
-            print(f"Face verification successful - Confidence: {confidence}%")
+            logger.debug("Face verification successful - Confidence: %s%%", confidence)
             return True, f"Face verified (confidence: {confidence}%)"
         else:
-            print(f"Face verification failed - Confidence: {confidence}%")
+            logger.debug("Face verification failed - Confidence: %s%%", confidence)
             return False, f"Face does not match (confidence: {confidence}%)"
         
     except Exception as e:
         # Log error and block submission for security
-        print(f"DEBUG: Enhanced face comparison error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Enhanced face comparison error: %s", e)
         return False, f"Face comparison error: {str(e)}"
 
-def simple_face_comparison_with_liveness(stored_face_image: bytes, submitted_face_image: str) -> Tuple[bool, str]:
+def simple_face_comparison_with_liveness(stored_face_image: bytes, submitted_face_image: Union[str, bytes]) -> Tuple[bool, str]:
     """
     FALLBACK FACE VERIFICATION with anti-spoofing protection
     
@@ -372,8 +321,8 @@ def simple_face_comparison_with_liveness(stored_face_image: bytes, submitted_fac
     """
     try:
         # DECODE STORED IMAGE WITH ENHANCED FORMAT DETECTION
-        print(f"DEBUG: (Simple) Stored face image type: {type(stored_face_image)}")
-        print(f"DEBUG: (Simple) Stored face image length: {len(stored_face_image) if stored_face_image else 'None'}")
+        logger.debug("(Simple) Stored face image type: %s", type(stored_face_image))
+        logger.debug("(Simple) Stored face image length: %s", len(stored_face_image) if stored_face_image else 'None')
         
         # Check if stored face image is None or empty
         if not stored_face_image:
@@ -386,23 +335,23 @@ def simple_face_comparison_with_liveness(stored_face_image: bytes, submitted_fac
         try:
             # Enhanced format detection for simple method
             header_bytes = stored_face_image[:10]
-            print(f"DEBUG: (Simple) Image header: {[hex(b) for b in header_bytes]}")
+            logger.debug("(Simple) Image header: %s", header_bytes.hex())
             
             image_format = "unknown"
             if stored_face_image[:2] == b'\xff\xd8':
                 image_format = "JPEG"
-                print("DEBUG: (Simple) JPEG format detected")
+                logger.debug("(Simple) JPEG format detected")
             elif stored_face_image[:8] == b'\x89PNG\r\n\x1a\n':
                 image_format = "PNG"
-                print("DEBUG: (Simple) PNG format detected")
+                logger.debug("(Simple) PNG format detected")
             else:
-                print(f"DEBUG: (Simple) Unknown format, header: {stored_face_image[:10].hex()}")
+                logger.debug("(Simple) Unknown format, header: %s", stored_face_image[:10].hex())
             
             stored_np_array = np.frombuffer(stored_face_image, np.uint8)
             stored_image = cv2.imdecode(stored_np_array, cv2.IMREAD_COLOR)
             
             if stored_image is None:
-                print(f"DEBUG: (Simple) Primary decode failed for {image_format}, trying alternatives...")
+                logger.debug("(Simple) Primary decode failed for %s, trying alternatives...", image_format)
                 
                 # Try with IMREAD_UNCHANGED
                 stored_image = cv2.imdecode(stored_np_array, cv2.IMREAD_UNCHANGED)
@@ -410,22 +359,22 @@ def simple_face_comparison_with_liveness(stored_face_image: bytes, submitted_fac
                     if len(stored_image.shape) == 3:
                         if stored_image.shape[2] == 4:  # RGBA
                             stored_image = cv2.cvtColor(stored_image, cv2.COLOR_RGBA2BGR)
-                            print("DEBUG: (Simple) RGBA to BGR conversion successful")
+                            logger.debug("(Simple) RGBA to BGR conversion successful")
                         elif stored_image.shape[2] == 3:
-                            print("DEBUG: (Simple) 3-channel image, assuming BGR")
+                            logger.debug("(Simple) 3-channel image, assuming BGR")
                     elif len(stored_image.shape) == 2:  # Grayscale
                         stored_image = cv2.cvtColor(stored_image, cv2.COLOR_GRAY2BGR)
-                        print("DEBUG: (Simple) Grayscale to BGR conversion successful")
-                    print("DEBUG: (Simple) Alternative decode succeeded")
+                        logger.debug("(Simple) Grayscale to BGR conversion successful")
+                    logger.debug("(Simple) Alternative decode succeeded")
                 else:
                     # Try base64 decode
                     try:
-                        # Use the module-level imported base64, don't import again
-                        decoded_bytes = base64.b64decode(stored_face_image)
+                        # Use the module-level imported pybase64, don't import again
+                        decoded_bytes = pybase64.b64decode(stored_face_image)
                         test_array = np.frombuffer(decoded_bytes, np.uint8)
                         stored_image = cv2.imdecode(test_array, cv2.IMREAD_COLOR)
                         if stored_image is not None:
-                            print("DEBUG: (Simple) Base64 decode succeeded")
+                            logger.debug("(Simple) Base64 decode succeeded")
                     except:
                         pass
                     
@@ -438,46 +387,43 @@ def simple_face_comparison_with_liveness(stored_face_image: bytes, submitted_fac
                             stored_image = np.array(pil_image)
                             if len(stored_image.shape) == 3 and stored_image.shape[2] == 3:
                                 stored_image = cv2.cvtColor(stored_image, cv2.COLOR_RGB2BGR)
-                            print("DEBUG: (Simple) PIL decode succeeded")
+                            logger.debug("(Simple) PIL decode succeeded")
                         except Exception as pil_error:
-                            print(f"DEBUG: (Simple) PIL decode failed: {pil_error}")
+                            logger.debug("(Simple) PIL decode failed: %s", pil_error)
             
             if stored_image is None:
-                print(f"DEBUG: (Simple) All decode attempts failed for {image_format}")
+                logger.debug("(Simple) All decode attempts failed for %s", image_format)
                 return False, f"Could not decode stored face image - invalid {image_format} format"
             
-            print(f"DEBUG: (Simple) Successfully decoded {image_format}, shape: {stored_image.shape}")
+            logger.debug("(Simple) Successfully decoded %s, shape: %s", image_format, stored_image.shape)
             
         except Exception as decode_error:
-            print(f"DEBUG: (Simple) Decode error: {str(decode_error)}")
+            logger.warning("(Simple) Decode error: %s", str(decode_error))
             return False, f"Error decoding stored face image: {str(decode_error)}"
         
-        # DECODE SUBMITTED IMAGE
-        if submitted_face_image.startswith('data:image'):
-            submitted_face_image = submitted_face_image.split(',')[1]
-        
+        # DECODE SUBMITTED IMAGE (base64 text, data URI or raw uploaded bytes)
         try:
-            submitted_image_data = base64.b64decode(submitted_face_image)
+            submitted_image_data = decode_base64_image(submitted_face_image)
             submitted_np_array = np.frombuffer(submitted_image_data, np.uint8)
             submitted_image = cv2.imdecode(submitted_np_array, cv2.IMREAD_COLOR)
             
             if submitted_image is None:
                 return False, "Could not decode submitted face image"
             
-            print(f"DEBUG: (Simple) Submitted image shape: {submitted_image.shape}")
+            logger.debug("(Simple) Submitted image shape: %s", submitted_image.shape)
             
         except Exception as decode_error:
-            print(f"DEBUG: (Simple) Error decoding submitted image: {str(decode_error)}")
+            logger.warning("(Simple) Error decoding submitted image: %s", str(decode_error))
             return False, f"Error decoding submitted face image: {str(decode_error)}"
         
         # CRITICAL: ANTI-SPOOFING CHECK (same as advanced method)
-        print("Checking face liveness (simple)...")
+        logger.debug("Checking face liveness (simple)...")
         is_live, liveness_message = detect_face_spoofing(submitted_image)
         if not is_live:
-            print(f"Liveness check failed: {liveness_message}")
+            logger.debug("Liveness check failed: %s", liveness_message)
             return False, f"Spoofing detected: {liveness_message}"
         
-        print("Liveness check passed")
+        logger.debug("Liveness check passed")
         
         # SIMPLE FACE COMPARISON USING HISTOGRAMS
         # Convert to grayscale for histogram analysis
@@ -499,21 +445,19 @@ def simple_face_comparison_with_liveness(stored_face_image: bytes, submitted_fac
         
         # Verification threshold (70% correlation required)
         if correlation > 0.7:
-            print(f"Face verification successful - Confidence: {confidence}%")
+            logger.debug("Face verification successful - Confidence: %s%%", confidence)
             return True, f"Face verified (confidence: {confidence}%)"
         else:
-            print(f"Face verification failed - Confidence: {confidence}%")
+            logger.debug("Face verification failed - Confidence: %s%%", confidence)
             return False, f"Face does not match (confidence: {confidence}%)"
         
     except Exception as e:
-        print(f"DEBUG: Simple face comparison error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Simple face comparison error: %s", e)
         return False, f"Face comparison error: {str(e)}"
 
 # MAIN API FUNCTIONS - These are called by the attendance submission endpoint
 
-def compare_faces(stored_face_image: bytes, submitted_face_image: str, tolerance: float = 0.3) -> Tuple[bool, str]:
+def compare_faces(stored_face_image: bytes, submitted_face_image: Union[str, bytes], tolerance: float = 0.3) -> Tuple[bool, str]:
     """
     PRIMARY FACE VERIFICATION FUNCTION with maximum security
     
@@ -524,7 +468,7 @@ def compare_faces(stored_face_image: bytes, submitted_face_image: str, tolerance
     """
     return enhanced_face_comparison(stored_face_image, submitted_face_image, tolerance)
 
-def simple_face_comparison(stored_face_image: bytes, submitted_face_image: str) -> Tuple[bool, str]:
+def simple_face_comparison(stored_face_image: bytes, submitted_face_image: Union[str, bytes]) -> Tuple[bool, str]:
     """
     FALLBACK FACE VERIFICATION FUNCTION with maintained security
     
@@ -533,7 +477,7 @@ def simple_face_comparison(stored_face_image: bytes, submitted_face_image: str)
     """
     return simple_face_comparison_with_liveness(stored_face_image, submitted_face_image)
 
-def verify_face_against_profile(stored_face_image: bytes, submitted_face_image: str) -> Tuple[bool, str]:
+def verify_face_against_profile(stored_face_image: bytes, submitted_face_image: Union[str, bytes]) -> Tuple[bool, str]:
     """
     MAIN ENTRY POINT for all face verification in the attendance system
     
@@ -572,11 +516,11 @@ def verify_face_against_profile(stored_face_image: bytes, submitted_face_image:
             return is_match, message
         except ImportError:
             # face_recognition library not available, use fallback
-            print("Using simple face comparison")
+            logger.debug("Using simple face comparison")
             return simple_face_comparison_with_liveness(stored_face_image, submitted_face_image)
         except Exception as e:
             # Advanced method failed, use fallback but log the issue
-            print(f"Advanced face recognition failed, using simple comparison")
+            logger.debug("Advanced face recognition failed, using simple comparison")
             return simple_face_comparison_with_liveness(stored_face_image, submitted_face_image)
             
     except Exception as e:
@@ -0,0 +1,227 @@
+"""
+FACE VALIDATION WORKER POOL: Runs CPU-bound face validation outside the API process
+
+Decoding a JPEG and running the Haar cascades takes hundreds of milliseconds and holds
+the GIL for much of it. Running validate_face_image in a process pool keeps the event
+loop and the sync-endpoint threadpool free, and lets several validations use separate
+cores at the same time.
+
+Concurrent requests are micro-batched: images that arrive within a short window are
+grouped and sent to the workers as a few batches instead of one task per image, which
+cuts the per-task pickling and dispatch overhead under load.
+
+The pool is started and stopped from the app lifespan, like the OTP cleanup service.
+Only the decoded image bytes are sent to the workers, which is smaller to pickle than
+the Base64 text.
+
+Identical images that are validated at the same time (e.g. a double-tapped submit
+button) share one validation instead of each running the cascades, and results are
+kept briefly so a retry or the validate-then-register flow reuses them.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+from starlette.concurrency import run_in_threadpool
+
+from services.face.validator import validate_face_image, validate_face_images, preload_face_detector
+
+logger = logging.getLogger(__name__)
+
+# Defaults to one worker per CPU
+FACE_POOL_WORKERS = int(os.getenv("FACE_POOL_WORKERS", "0")) or os.cpu_count() or 1
+FACE_BATCH_MAX_SIZE = int(os.getenv("FACE_BATCH_MAX_SIZE", "16"))
+FACE_BATCH_MAX_WAIT_MS = int(os.getenv("FACE_BATCH_MAX_WAIT_MS", "15"))
+FACE_VALIDATION_CACHE_TTL_SECONDS = 60
+
+class FaceValidatorBatcher:
+    """Coalesces concurrent validation requests into batches for the process pool"""
+
+    def __init__(self, executor_factory: Callable[[], ProcessPoolExecutor], max_batch: int, max_wait_ms: int):
+        self.executor_factory = executor_factory
+        self.executor = executor_factory()
+        # Held while a broken executor is replaced, so concurrent batches restart it once
+        self.restart_lock = asyncio.Lock()
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.batch_task: Optional[asyncio.Task] = None
+        self.dispatch_tasks = set()
+        # Every future a caller is awaiting, whether queued, being batched or dispatched
+        self.pending_futures = set()
+
+    def start(self):
+        """Start collecting batches on the running event loop"""
+        self.batch_task = asyncio.create_task(self._collect_batches())
+
+    async def stop(self):
+        """Stop collecting batches and fail any requests still waiting"""
+        if self.batch_task and not self.batch_task.done():
+            self.batch_task.cancel()
+            try:
+                await self.batch_task
+            except asyncio.CancelledError:
+                pass
+        for task in list(self.dispatch_tasks):
+            task.cancel()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        
+        # Cancelling the tasks drops the batch being collected and the ones in flight, so
+        # fail their futures here or the requests awaiting them would hang
+        shutdown_error = RuntimeError("Face validation pool is shutting down")
+        for future in list(self.pending_futures):
+            if not future.done():
+                future.set_exception(shutdown_error)
+        self.pending_futures.clear()
+
+    async def submit(self, image_data) -> Tuple[bool, str]:
+        """Queue one image and wait for its (is_valid, message) result"""
+        future = asyncio.get_running_loop().create_future()
+        self.pending_futures.add(future)
+        future.add_done_callback(self.pending_futures.discard)
+        await self.queue.put((image_data, future))
+        return await future
+
+    async def _collect_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch without waiting so the next batch can fill in the meantime
+            task = asyncio.create_task(self._dispatch(batch))
+            self.dispatch_tasks.add(task)
+            task.add_done_callback(self.dispatch_tasks.discard)
+
+    async def _dispatch(self, batch: List[tuple]):
+        loop = asyncio.get_running_loop()
+        # Spread the batch over the workers so it still uses every core
+        chunk_count = min(len(batch), FACE_POOL_WORKERS)
+        chunks = [batch[i::chunk_count] for i in range(chunk_count)]
+        results = await asyncio.gather(
+            *(self._run_chunk([image for image, _ in chunk]) for chunk in chunks),
+            return_exceptions=True
+        )
+        for chunk, chunk_results in zip(chunks, results):
+            for index, (_, future) in enumerate(chunk):
+                if future.done():
+                    continue
+                if isinstance(chunk_results, BaseException):
+                    future.set_exception(chunk_results)
+                else:
+                    future.set_result(chunk_results[index])
+
+    async def _run_chunk(self, images: list) -> List[Tuple[bool, str]]:
+        """Validate one chunk in the pool, restarting the pool once if a worker died"""
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, validate_face_images, images)
+        except BrokenProcessPool:
+            # A worker crashed (e.g. out of memory or a native OpenCV fault); without a new
+            # executor every later validation would fail until the API restarts
+            await self._restart_executor(executor)
+            return await loop.run_in_executor(self.executor, validate_face_images, images)
+
+    async def _restart_executor(self, broken: ProcessPoolExecutor):
+        async with self.restart_lock:
+            # Another chunk from the same broken pool may have replaced it already
+            if self.executor is not broken:
+                return
+            logger.warning("Face validation pool broke; starting a new one")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = self.executor_factory()
+
+    def shutdown(self):
+        """Shut down the current executor, cancelling queued work"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+# Global batcher instance, which owns the process pool
+_face_batcher: Optional[FaceValidatorBatcher] = None
+
+# In-flight validations keyed by a digest of the image, shared by concurrent duplicates
+_inflight_validations: Dict[bytes, asyncio.Future] = {}
+
+# Recent results under the same digest. Only touched from the event loop, so no lock.
+_validation_results = TTLCache(maxsize=512, ttl=FACE_VALIDATION_CACHE_TTL_SECONDS)
+
+def _create_face_pool() -> ProcessPoolExecutor:
+    # Each worker loads the detectors as it starts rather than on its first image
+    return ProcessPoolExecutor(max_workers=FACE_POOL_WORKERS, initializer=preload_face_detector)
+
+async def start_face_pool() -> ProcessPoolExecutor:
+    """Start the global face validation pool and its batcher"""
+    global _face_batcher
+    if _face_batcher is None:
+        _face_batcher = FaceValidatorBatcher(_create_face_pool, FACE_BATCH_MAX_SIZE, FACE_BATCH_MAX_WAIT_MS)
+        _face_batcher.start()
+        logger.info("Face validation pool started with %s workers", FACE_POOL_WORKERS)
+    return _face_batcher.executor
+
+async def stop_face_pool():
+    """Stop the global face validation pool, cancelling queued work"""
+    global _face_batcher
+    if _face_batcher is not None:
+        await _face_batcher.stop()
+        _face_batcher.shutdown()
+        _face_batcher = None
+        logger.info("Face validation pool stopped")
+
+async def validate_face_image_async(image_data) -> Tuple[bool, str]:
+    """
+    Awaitable validate_face_image
+
+    Goes through the batcher when the pool is started, otherwise (e.g. the app was
+    created without its lifespan) falls back to the threadpool so callers never block
+    the loop.
+    
+    A request for an image that is already being validated waits for that result
+    instead of starting a second validation, and an image validated within the last
+    FACE_VALIDATION_CACHE_TTL_SECONDS returns its cached result.
+
+    Args:
+        image_data (str or bytes): Base64 string or decoded image bytes
+
+    Returns:
+        Tuple[bool, str]: (is_valid, validation_message)
+    """
+    image_bytes = image_data.encode() if isinstance(image_data, str) else image_data
+    key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+    
+    cached = _validation_results.get(key)
+    if cached is not None:
+        return cached
+    
+    validation = _inflight_validations.get(key)
+    if validation is None:
+        validation = asyncio.ensure_future(_validate_face_image(image_data))
+        _inflight_validations[key] = validation
+        validation.add_done_callback(lambda done: _finish_validation(key, done))
+    
+    # Shielded so one caller disconnecting does not cancel the validation for the others
+    return await asyncio.shield(validation)
+
+def _finish_validation(key: bytes, validation: asyncio.Future):
+    _inflight_validations.pop(key, None)
+    if not validation.cancelled() and validation.exception() is None:
+        _validation_results[key] = validation.result()
+
+async def _validate_face_image(image_data) -> Tuple[bool, str]:
+    if _face_batcher is None:
+        return await run_in_threadpool(validate_face_image, image_data)
+    return await _face_batcher.submit(image_data)
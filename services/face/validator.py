@@ -16,13 +16,69 @@ ROLE IN ATTENDANCE SYSTEM:
 
 This validation happens BEFORE the security checks in face_matcher.py, providing
 a clean pipeline: Image Validation → Anti-Spoofing → Face Verification
+
+The anti-spoofing check (detect_face_spoofing) is plain OpenCV/NumPy and lives here
+rather than in face_matcher.py, so the validation pool workers never import dlib.
 """
 
 import cv2
 import numpy as np
 import os
+import io
+import binascii
+import logging
+import threading
 from fastapi import HTTPException
-import base64
+from pydantic import BeforeValidator, WithJsonSchema
+from typing import Annotated, Tuple
+import pybase64
+from PIL import Image, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+def decode_base64_image(image_data):
+    """
+    BASE64 DECODING: Converts a client-submitted Base64 image into raw bytes
+    
+    Used as a request-model validator so the Base64 text is decoded once, while the
+    request body is parsed, instead of inside each handler. Already-decoded bytes are
+    passed through unchanged (e.g. registration data restored from OTP storage).
+    
+    Args:
+        image_data (str or bytes): Base64 string, possibly with data URI prefix
+        
+    Returns:
+        bytes: Decoded image bytes
+        
+    Raises:
+        ValueError: If the value is not valid Base64
+    """
+    if isinstance(image_data, (bytes, bytearray)):
+        return bytes(image_data)
+    if not isinstance(image_data, str):
+        raise ValueError("Image must be a Base64 encoded string")
+    
+    # Remove "data:image/jpeg;base64," prefix if present
+    if image_data.startswith('data:image'):
+        image_data = image_data.split(',', 1)[1]
+    
+    # Base64 requires length to be multiple of 4, add padding if needed
+    padding = len(image_data) % 4
+    if padding > 0:
+        image_data += '=' * (4 - padding)
+    
+    try:
+        return pybase64.b64decode(image_data)
+    except binascii.Error as e:
+        raise ValueError(f"Invalid Base64 image: {str(e)}")
+
+# Request field type for Base64 images: accepts the same formats as decode_image
+# (data URI prefix, missing padding) and hands the handler decoded bytes
+Base64Image = Annotated[
+    bytes,
+    BeforeValidator(decode_base64_image),
+    WithJsonSchema({"type": "string", "format": "base64"}),
+]
 
 def decode_image(image_data):
     """
@@ -43,7 +99,8 @@ def decode_image(image_data):
     - Prevents processing of non-image data
     
     Args:
-        image_data (str): Base64 encoded image string, possibly with data URI prefix
+        image_data (str or bytes): Base64 encoded image string, possibly with data URI
+            prefix, or image bytes already decoded by the request model
         
     Returns:
         np.ndarray: OpenCV image array (BGR format)
@@ -55,20 +112,9 @@ def decode_image(image_data):
     Raw Base64 → Remove URI prefix → Add padding → Decode → Numpy array → OpenCV image
     """
     try:
-        # STEP 1: HANDLE BASE64 PADDING ISSUES
-        # Base64 requires length to be multiple of 4, add padding if needed
-        padding = len(image_data) % 4
-        if padding > 0:
-            image_data += '=' * (4 - padding)
-        
-        # STEP 2: HANDLE DATA URI PREFIX
-        # Remove "data:image/jpeg;base64," prefix if present
-        if image_data.startswith('data:image'):
-            # Split on comma and take the Base64 part
-            image_data = image_data.split(',', 1)[1]
-        
-        # STEP 3: DECODE BASE64 TO BINARY DATA
-        image_bytes = base64.b64decode(image_data)
+        # STEPS 1-3: STRIP URI PREFIX, FIX PADDING AND DECODE BASE64
+        # Skipped when the request model already decoded the image
+        image_bytes = decode_base64_image(image_data)
         
         # STEP 4: CONVERT BINARY TO NUMPY ARRAY
         nparr = np.frombuffer(image_bytes, np.uint8)
@@ -85,6 +131,230 @@ def decode_image(image_data):
         # Provide clear error message for debugging
         raise ValueError(f"Invalid image format: {str(e)}")
 
+# Limits for the cheap prechecks run before any full decode or detection
+MAX_FACE_IMAGE_BYTES = 10 * 1024 * 1024
+MIN_FACE_IMAGE_BYTES = 100
+MAX_FACE_IMAGE_DIMENSION = 8192
+# Base64 text is 4/3 the size of the bytes, plus room for a data URI prefix
+MAX_FACE_IMAGE_BASE64_LENGTH = MAX_FACE_IMAGE_BYTES * 4 // 3 + 64
+
+JPEG_MAGIC = b'\xff\xd8\xff'
+PNG_MAGIC = b'\x89PNG\r\n\x1a\n'
+
+def precheck_image_bytes(image_bytes):
+    """
+    IMAGE PRECHECK: Rejects obviously bad uploads before decoding them
+    
+    Checks the size, the JPEG/PNG signature and the dimensions read from the image
+    header. None of this decodes pixels, so malformed or oversized uploads are turned
+    away without paying for cv2.imdecode and the face detectors.
+    
+    Args:
+        image_bytes (bytes): Decoded image bytes
+        
+    Returns:
+        str or None: Reason the image was rejected, or None if it passed
+    """
+    if len(image_bytes) < MIN_FACE_IMAGE_BYTES:
+        return "Image is empty or too small"
+    if len(image_bytes) > MAX_FACE_IMAGE_BYTES:
+        return f"Image is too large (maximum {MAX_FACE_IMAGE_BYTES // (1024 * 1024)} MB)"
+    if not (image_bytes.startswith(JPEG_MAGIC) or image_bytes.startswith(PNG_MAGIC)):
+        return "Unsupported image format. Please submit a JPEG or PNG image."
+    
+    # Image.open only parses the header; pixels are not loaded
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as header:
+            width, height = header.size
+    except (UnidentifiedImageError, OSError, SyntaxError):
+        return "Image is corrupted or could not be read"
+    if max(width, height) > MAX_FACE_IMAGE_DIMENSION:
+        return f"Image dimensions are too large (maximum {MAX_FACE_IMAGE_DIMENSION}px per side)"
+    
+    return None
+
+# Submitted attendance images are scaled down to this longest side before anything else
+# uses them; detection, matching and storage all work on the smaller image
+FACE_IMAGE_MAX_SIDE = int(os.getenv("FACE_IMAGE_MAX_SIDE", "640"))
+FACE_IMAGE_JPEG_QUALITY = 85
+
+def downscale_face_image(image_bytes, max_side=FACE_IMAGE_MAX_SIDE):
+    """
+    INGRESS DOWNSCALE: Shrinks a submitted image to the resolution the detectors need
+    
+    Images already within max_side, and images that fail the prechecks or cannot be
+    decoded, are returned unchanged so validation reports them as usual.
+    
+    Args:
+        image_bytes (bytes): Decoded JPEG/PNG bytes
+        max_side (int): Longest side of the result, in pixels
+        
+    Returns:
+        bytes: JPEG bytes of the scaled image, or the original bytes
+    """
+    if precheck_image_bytes(image_bytes):
+        return image_bytes
+    
+    # The header gives the size without decoding the pixels. EXIF rotation swaps width
+    # and height but not the longest side, so this is enough to skip small images
+    with Image.open(io.BytesIO(image_bytes)) as header:
+        width, height = header.size
+    if max(width, height) <= max_side:
+        return image_bytes
+    
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return image_bytes
+    
+    # imdecode applies the EXIF orientation, so scale by the decoded shape rather than
+    # the header size or rotated phone photos come out squashed
+    height, width = image.shape[:2]
+    scale = max_side / max(width, height)
+    resized = cv2.resize(
+        image,
+        (max(1, round(width * scale)), max(1, round(height * scale))),
+        interpolation=cv2.INTER_AREA
+    )
+    ok, encoded = cv2.imencode('.jpg', resized, [cv2.IMWRITE_JPEG_QUALITY, FACE_IMAGE_JPEG_QUALITY])
+    return encoded.tobytes() if ok else image_bytes
+
+# Haar cascades are loaded once per thread and reused. A classifier is not safe to share
+# across threads, and sync endpoints validate from several threadpool threads at once.
+_cascade_cache = threading.local()
+
+def get_face_cascades():
+    """
+    CASCADE LOADER: Returns this thread's (face_cascade, eye_cascade) classifiers
+    
+    Returns:
+        Tuple[cv2.CascadeClassifier, cv2.CascadeClassifier] or None if the cascade
+        files are missing
+    """
+    cascades = getattr(_cascade_cache, "cascades", False)
+    if cascades is False:
+        face_cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        eye_cascade_path = cv2.data.haarcascades + 'haarcascade_eye.xml'
+        if os.path.exists(face_cascade_path) and os.path.exists(eye_cascade_path):
+            cascades = (cv2.CascadeClassifier(face_cascade_path), cv2.CascadeClassifier(eye_cascade_path))
+        else:
+            cascades = None
+        _cascade_cache.cascades = cascades
+    return cascades
+
+def preload_face_detector():
+    """
+    WARM-UP: Loads the detectors before the first request needs them
+    
+    Loads this thread's cascades and runs one detection on a blank frame, so the first
+    validation does not pay for it. Used as the face pool's worker initializer and at
+    app startup. Validation never uses dlib, so the face_recognition models are warmed
+    separately, in the API process only, by face_matcher.warmup_face_model.
+    """
+    cascades = get_face_cascades()
+    if cascades:
+        cascades[0].detectMultiScale(np.zeros((128, 128), np.uint8))
+
+def detect_face_spoofing(image: np.ndarray) -> Tuple[bool, str]:
+    """
+    CRITICAL SECURITY FUNCTION: Multi-layered spoofing detection system
+    
+    This function implements 6 different anti-spoofing techniques to detect fake submissions:
+    
+    1. SHARPNESS ANALYSIS: Blurry images often indicate photos of photos
+    2. SCREEN REFLECTION DETECTION: Identifies phone/computer screen displays
+    3. COLOR DISTRIBUTION ANALYSIS: Detects artificial digital displays
+    4. EDGE DETECTION: Finds rectangular screen borders in submissions
+    5. LIGHTING CONSISTENCY: Identifies artificial or uniform lighting
+    6. JPEG ARTIFACT DETECTION: Recognizes digital photo compression patterns
+    
+    Args:
+        image (np.ndarray): The submitted face image to analyze
+        
+    Returns:
+        Tuple[bool, str]: (is_live_face, detection_message)
+        - True: Live face detected, safe to proceed
+        - False: Spoofing attempt detected, block submission
+        
+    SECURITY CRITICAL: This function is the first line of defense against attendance fraud
+    """
+    try:
+        # Convert to grayscale for computational analysis
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        
+        # TECHNIQUE 1: SHARPNESS ANALYSIS
+        # Real faces have natural texture and sharpness variations
+        # Photos of photos tend to be blurry due to double compression
+        laplacian = cv2.Laplacian(gray, cv2.CV_64F)
+        laplacian_var = float(np.var(laplacian.astype(np.float64)))
+        if laplacian_var < 100:  # Threshold determined through testing
+            return False, "Image too blurry"
+        
+        # TECHNIQUE 2: SCREEN REFLECTION & MOIRÉ PATTERN DETECTION
+        # Phone/computer screens create high-frequency artifacts and patterns
+        # These patterns are visible when photographing a screen
+        kernel = np.array([[-1,-1,-1], [-1,8,-1], [-1,-1,-1]])  # High-pass filter
+        high_freq = cv2.filter2D(gray, -1, kernel)
+        # Fix: Explicit type conversion for variance calculation
+        high_freq_var = float(np.var(high_freq.astype(np.float64)))
+        
+        if high_freq_var > 2000:  # High variance indicates screen artifacts
+            return False, "Screen display detected"
+        
+        # TECHNIQUE 3: COLOR DISTRIBUTION ANALYSIS
+        # Real faces have natural color variation across hue spectrum
+        # Digital displays have limited color peaks and artificial distribution
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        hist_h = cv2.calcHist([hsv], [0], None, [180], [0, 180])
+        
+        # Fix: Explicit type conversion for mean calculation
+        hist_mean = float(np.mean(hist_h.astype(np.float64)))
+        color_peaks = np.sum(hist_h > hist_mean * 3)
+        if color_peaks < 5:  # Too few color peaks indicates digital display
+            return False, "Digital display detected"
+        
+        # TECHNIQUE 4: RECTANGULAR EDGE DETECTION (SCREEN BORDER DETECTION)
+        # Phones/tablets/computers have rectangular screens with sharp edges
+        # Real environments don't have large rectangular shapes
+        edges = cv2.Canny(gray, 50, 150)
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        for contour in contours:
+            # Check if contour covers significant portion of image (likely screen border)
+            if cv2.contourArea(contour) > image.shape[0] * image.shape[1] * 0.3:
+                # Approximate contour to check if it's rectangular
+                approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+                if len(approx) == 4:  # Rectangle detected
+                    return False, "Screen border detected"
+        
+        # TECHNIQUE 5: LIGHTING CONSISTENCY ANALYSIS
+        # Real faces have natural lighting variations and shadows
+        # Artificial/uniform lighting indicates digital display or printed photo
+        # Fix: Explicit type conversion for std calculation
+        brightness_std = float(np.std(gray.astype(np.float64)))
+        if brightness_std < 20:  # Too uniform lighting
+            return False, "Artificial lighting detected"
+        
+        # TECHNIQUE 6: JPEG COMPRESSION ARTIFACT DETECTION
+        # Digital photos have specific frequency domain patterns from JPEG compression
+        # These patterns form block structures that can be detected
+        f_transform = np.fft.fft2(gray.astype(np.float64))  # Fix: Explicit type conversion for FFT
+        f_shift = np.fft.fftshift(f_transform)  # Shift zero frequency to center
+        magnitude = np.abs(f_shift)
+        
+        # Check for 8x8 block patterns typical of JPEG compression
+        block_pattern = np.sum(magnitude[::8, ::8])  # Sample every 8th pixel
+        total_magnitude = np.sum(magnitude)
+        
+        if block_pattern / total_magnitude > 0.1:  # Too much block structure
+            return False, "Digital photo detected"
+        
+        # ALL TESTS PASSED: This appears to be a live face
+        return True, "Live face detected"
+        
+    except Exception as e:
+        # If any analysis fails, err on the side of caution and block submission
+        return False, "Liveness check failed"
+
 def validate_face_image(image_data):
     """
     COMPREHENSIVE FACE VALIDATION SYSTEM
@@ -93,6 +363,7 @@ def validate_face_image(image_data):
     the requirements for face recognition and attendance submission:
     
     VALIDATION STAGES:
+    0. PRECHECKS: Size, JPEG/PNG signature and header dimensions (no pixel decode)
     1. IMAGE DECODING: Convert and validate image format
     2. FACE DETECTION: Locate faces using Haar cascade classifiers
     3. FACE COUNT: Ensure exactly one face is present
@@ -101,7 +372,7 @@ def validate_face_image(image_data):
     
     TECHNICAL IMPLEMENTATION:
     - Uses OpenCV Haar Cascade Classifiers for robust face/eye detection
-    - Handles both string (Base64) and numpy array inputs
+    - Handles string (Base64), bytes and numpy array inputs
     - Provides detailed error messages for user guidance
     - Graceful fallback if cascade files are missing
     
@@ -117,7 +388,7 @@ def validate_face_image(image_data):
     ✓ Face is reasonably sized (minimum 30x30 pixels)
     
     Args:
-        image_data (str or np.ndarray): Image to validate (Base64 string or numpy array)
+        image_data (str, bytes or np.ndarray): Image to validate (Base64 string, image bytes or numpy array)
         
     Returns:
         Tuple[bool, str]: (is_valid, validation_message)
@@ -130,26 +401,30 @@ def validate_face_image(image_data):
     """
     try:
         # STEP 1: IMAGE PREPARATION
-        # Handle both string (Base64) and numpy array inputs
-        if isinstance(image_data, str):
-            image = decode_image(image_data)
+        # Handle string (Base64), raw bytes and numpy array inputs
+        if isinstance(image_data, (str, bytes)):
+            # Cheap prechecks first so bad uploads never reach the detectors
+            if isinstance(image_data, str) and len(image_data) > MAX_FACE_IMAGE_BASE64_LENGTH:
+                return (False, f"Image is too large (maximum {MAX_FACE_IMAGE_BYTES // (1024 * 1024)} MB)")
+            image_bytes = decode_base64_image(image_data)
+            precheck_error = precheck_image_bytes(image_bytes)
+            if precheck_error:
+                return (False, precheck_error)
+            image = decode_image(image_bytes)
         else:
             # Assume it's already a numpy array (for internal processing)
             image = image_data
         
-        # STEP 2: LOAD HAAR CASCADE CLASSIFIERS
-        # These are pre-trained models for face and eye detection
-        face_cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        eye_cascade_path = cv2.data.haarcascades + 'haarcascade_eye.xml'
+        # STEP 2: GET HAAR CASCADE CLASSIFIERS
+        # These are pre-trained models for face and eye detection, loaded once per thread
+        cascades = get_face_cascades()
 
         # SAFETY CHECK: Verify cascade files exist
-        if not os.path.exists(face_cascade_path) or not os.path.exists(eye_cascade_path):
-            print("Warning: Face detection cascades not found. Skipping face validation.")
+        if cascades is None:
+            logger.debug("Warning: Face detection cascades not found. Skipping face validation.")
             return (True, "Face validation skipped")
 
-        # LOAD THE CLASSIFIERS
-        face_cascade = cv2.CascadeClassifier(face_cascade_path)
-        eye_cascade = cv2.CascadeClassifier(eye_cascade_path)
+        face_cascade, eye_cascade = cascades
 
         # STEP 3: PREPARE IMAGE FOR DETECTION
         # Convert to grayscale as Haar cascades work on grayscale images
@@ -192,14 +467,13 @@ def validate_face_image(image_data):
             return (False, "Eyes not clearly visible. Please remove sunglasses or any accessories covering your face.")
 
         # ALL VALIDATIONS PASSED (face and eyes)
-        # --- ANTI-SPOOFING CHECK (import from face_matcher.py) ---
+        # --- ANTI-SPOOFING CHECK ---
         try:
-            from services.face.face_matcher import detect_face_spoofing
             is_live, spoof_message = detect_face_spoofing(image)
             if not is_live:
                 return (False, f"Anti-spoofing failed: {spoof_message}")
         except Exception as spoof_error:
-            print(f"Anti-spoofing check error: {spoof_error}")
+            logger.warning("Anti-spoofing check error: %s", spoof_error)
             # If spoofing check fails, still allow registration but log the error
             pass
         # If all checks pass
@@ -207,5 +481,20 @@ def validate_face_image(image_data):
         
     except Exception as e:
         # LOG ERROR AND PROVIDE USER-FRIENDLY MESSAGE
-        print(f"Face validation error: {str(e)}")
+        logger.warning("Face validation error: %s", str(e))
         return (False, f"Face validation failed: {str(e)}")
+
+def validate_face_images(images):
+    """
+    BATCH FACE VALIDATION: Validates several images in one call
+    
+    Used by the face validation pool so a batch of concurrent requests costs a single
+    worker round-trip instead of one per image.
+    
+    Args:
+        images (list): Images accepted by validate_face_image
+        
+    Returns:
+        List[Tuple[bool, str]]: (is_valid, validation_message) for each image, in order
+    """
+    return [validate_face_image(image) for image in images]
@@ -1,26 +1,102 @@
 from sqlalchemy.orm import Session
+import logging
 import random
 import json
+import threading
+import uuid
 from datetime import datetime, timedelta
-from fastapi import HTTPException
+from typing import Optional
+from fastapi import HTTPException, BackgroundTasks
+from pydantic import BaseModel
+from cachetools import TTLCache
 
 # Import OTP_Request directly from models
 from models import OTP_Request
-from services.email.config import OTP_EXPIRY_MINUTES
+from services.email.config import OTP_EXPIRY_MINUTES, PENDING_FACE_IMAGES_MAX
 from services.email.service import EmailService
 
+logger = logging.getLogger(__name__)
+
+class _PendingFaceImageCache(TTLCache):
+    """TTLCache that logs and remembers images evicted for space before they expired"""
+    
+    def __init__(self, maxsize, ttl):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        # Only the keys are kept, so this costs far less than the images themselves
+        self.evicted_keys = TTLCache(maxsize=maxsize * 4, ttl=ttl)
+    
+    def popitem(self):
+        # Only called when the cache is full; expired entries are dropped by expire()
+        key, value = super().popitem()
+        self.evicted_keys[key] = True
+        logger.warning("Pending face image cache full (%s entries); evicted %s before its OTP expired",
+                       self.maxsize, key)
+        return key, value
+
 class OTPService:
+    # Face images of pending registrations are kept apart from the OTP data, keyed by a
+    # random id, and expire with the OTP so abandoned registrations don't pin them
+    _pending_face_images = _PendingFaceImageCache(maxsize=PENDING_FACE_IMAGES_MAX, ttl=OTP_EXPIRY_MINUTES * 60)
+    _pending_face_images_lock = threading.Lock()
+    
+    @classmethod
+    def stash_face_image(cls, face_image: bytes) -> str:
+        """Store a pending registration's face image and return its key"""
+        key = f"reg/{uuid.uuid4().hex}"
+        with cls._pending_face_images_lock:
+            cls._pending_face_images[key] = face_image
+        return key
+    
+    @classmethod
+    def pop_face_image(cls, key: str) -> Optional[bytes]:
+        """Take a stashed face image, or None if it expired"""
+        with cls._pending_face_images_lock:
+            return cls._pending_face_images.pop(key, None)
+    
+    @classmethod
+    def face_image_was_evicted(cls, key: str) -> bool:
+        """Whether a stashed face image was dropped because the cache was full rather than expired"""
+        with cls._pending_face_images_lock:
+            return key in cls._pending_face_images.evicted_keys
+    
     @staticmethod
     def generate_otp(length=6):
         """Generate a random numeric OTP of specified length"""
         return ''.join([str(random.randint(0, 9)) for _ in range(length)])
     
     @staticmethod
-    def create_otp(email: str, first_name: str, otp_type: str, db: Session, additional_data: dict = None):
+    def create_otp(email: str, first_name: str, otp_type: str, db: Session, additional_data: dict = None,
+                   background_tasks: Optional[BackgroundTasks] = None):
         """
         Generic method to create an OTP for any purpose
         Uses user_id=0 for registration OTPs since user doesn't exist yet
         Stores email and other data in a temporary way
+        
+        When background_tasks is given, the OTP email is sent after the response
+        is returned instead of blocking the request on SMTP.
+        """
+        try:
+            otp_id, otp_code = OTPService.persist_otp(email, first_name, otp_type, db, additional_data)
+        except Exception as e:
+            db.rollback()
+            logger.exception("Error creating OTP: %s", e)
+            return False, f"Error creating OTP: {str(e)}", None
+        
+        if background_tasks is not None:
+            background_tasks.add_task(OTPService.deliver_otp_email, email, first_name, otp_code, otp_type)
+            return True, "OTP sent successfully", otp_id
+        
+        success, message = OTPService.deliver_otp_email(email, first_name, otp_code, otp_type)
+        if not success:
+            return False, f"Failed to send OTP email: {message}", otp_id
+            
+        return True, "OTP sent successfully", otp_id
+    
+    @staticmethod
+    def persist_otp(email: str, first_name: str, otp_type: str, db: Session, additional_data: dict = None):
+        """
+        Insert the OTP row and keep any additional data for verification
+        Returns (otp_id, otp_code)
         """
         # Generate OTP code
         otp_code = OTPService.generate_otp()
@@ -28,39 +104,44 @@ class OTPService:
         # Set expiry time
         expires_at = datetime.now() + timedelta(minutes=OTP_EXPIRY_MINUTES)
         
+        # Create OTP record with your model structure
+        # user_id=0 for registration OTPs (since user doesn't exist yet)
+        # We'll store the email and registration data in a way that can be retrieved later
+        otp_request = OTP_Request(
+            user_id=0,  # Set to 0 for registration OTPs
+            otp_code=otp_code,
+            type=otp_type,
+            created_at=datetime.now(),
+            expires_at=expires_at
+        )
+        
+        db.add(otp_request)
+        db.commit()
+        db.refresh(otp_request)
+        
+        logger.debug("OTP created successfully: ID=%s, Type=%s", otp_request.id, otp_type)
+        
+        # Store email and registration data in a separate way since your OTP_Request doesn't have these fields
+        # We'll create a mapping using the OTP ID
+        if additional_data:
+            additional_data['email'] = email
+            additional_data['first_name'] = first_name
+            # Store this data temporarily using the OTP ID as key
+            # You could use Redis, a cache, or another table for this
+            # For now, we'll pass it to the email service and handle storage in verify
+            OTPService._temp_storage = getattr(OTPService, '_temp_storage', {})
+            OTPService._temp_storage[otp_request.id] = additional_data
+        
+        return otp_request.id, otp_code
+    
+    @staticmethod
+    def deliver_otp_email(email: str, first_name: str, otp_code: str, otp_type: str):
+        """
+        Send the OTP email for the given OTP type
+        Returns (success, message)
+        """
         try:
-            # Create OTP record with your model structure
-            # user_id=0 for registration OTPs (since user doesn't exist yet)
-            # We'll store the email and registration data in a way that can be retrieved later
-            otp_request = OTP_Request(
-                user_id=0,  # Set to 0 for registration OTPs
-                otp_code=otp_code,
-                type=otp_type,
-                created_at=datetime.now(),
-                expires_at=expires_at
-            )
-            
-            db.add(otp_request)
-            db.commit()
-            db.refresh(otp_request)
-            
-            print(f"OTP created successfully: ID={otp_request.id}, Type={otp_type}, Code={otp_code}")
-            
-            # Store email and registration data in a separate way since your OTP_Request doesn't have these fields
-            # We'll create a mapping using the OTP ID
-            if additional_data:
-                additional_data['email'] = email
-                additional_data['first_name'] = first_name
-                # Store this data temporarily using the OTP ID as key
-                # You could use Redis, a cache, or another table for this
-                # For now, we'll pass it to the email service and handle storage in verify
-                OTPService._temp_storage = getattr(OTPService, '_temp_storage', {})
-                OTPService._temp_storage[otp_request.id] = additional_data
-            
-            # Send appropriate email based on OTP type
             email_service = EmailService()
-            success = False
-            message = ""
             
             if otp_type == "registration":
                 success, message = email_service.send_registration_otp_email(
@@ -94,34 +175,42 @@ class OTPService:
                     otp_code=otp_code,
                     purpose=otp_type
                 )
-            
-            if not success:
-                return False, f"Failed to send OTP email: {message}", otp_request.id
-                
-            return True, "OTP sent successfully", otp_request.id
-            
         except Exception as e:
-            db.rollback()
-            print(f"Error creating OTP: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return False, f"Error creating OTP: {str(e)}", None
+            success, message = False, str(e)
+        
+        if not success:
+            logger.warning("Error sending %s OTP email to %s: %s", otp_type, email, message)
+        
+        return success, message
     
     @staticmethod
-    def create_registration_otp(email: str, first_name: str, registration_data: dict, db: Session):
+    def create_registration_otp(email: str, first_name: str, registration_data: BaseModel, db: Session,
+                                background_tasks: Optional[BackgroundTasks] = None):
         """
         Create a registration OTP and send it via email
+        
+        The already-validated registration model is kept as-is under "registration",
+        so verification can register it without dumping and re-validating the payload.
+        Its face image is stashed separately and referenced by "face_image_key"; fetch
+        it with pop_face_image only once registration proceeds.
         """
+        face_image_key = None
+        if getattr(registration_data, "face_image", None):
+            face_image_key = OTPService.stash_face_image(registration_data.face_image)
+            registration_data = registration_data.model_copy(update={"face_image": None})
+        
         return OTPService.create_otp(
             email=email,
             first_name=first_name,
             otp_type="registration",
             db=db,
-            additional_data=registration_data
+            additional_data={"registration": registration_data, "face_image_key": face_image_key},
+            background_tasks=background_tasks
         )
     
     @staticmethod
-    def create_login_otp(email: str, first_name: str, login_data: dict, db: Session):
+    def create_login_otp(email: str, first_name: str, login_data: dict, db: Session,
+                         background_tasks: Optional[BackgroundTasks] = None):
         """
         Create a login OTP and send it via email
         """
@@ -130,11 +219,13 @@ class OTPService:
             first_name=first_name,
             otp_type="login",
             db=db,
-            additional_data=login_data
+            additional_data=login_data,
+            background_tasks=background_tasks
         )
     
     @staticmethod
-    def create_password_reset_otp(email: str, first_name: str, password_reset_data: dict, db: Session):
+    def create_password_reset_otp(email: str, first_name: str, password_reset_data: dict, db: Session,
+                                  background_tasks: Optional[BackgroundTasks] = None):
         """
         Create a password reset OTP and send it via email
         """
@@ -143,7 +234,8 @@ class OTPService:
             first_name=first_name,
             otp_type="password_reset",
             db=db,
-            additional_data=password_reset_data
+            additional_data=password_reset_data,
+            background_tasks=background_tasks
         )
 
     @staticmethod
@@ -180,5 +272,5 @@ class OTPService:
             return True, "OTP verified successfully", registration_data
             
         except Exception as e:
-            print(f"Error verifying OTP: {str(e)}")
+            logger.warning("Error verifying OTP: %s", e)
             return False, f"Error verifying OTP: {str(e)}", None
@@ -11,7 +11,14 @@ load_dotenv(override=True)
 API_KEY = os.getenv("API_KEY")
 API_KEY_NAME = os.getenv("API_KEY_NAME", "AttendanceApp-API-Key")
 
-if not API_KEY:
+# Accepted keys, built once at import: API_KEY plus optional comma-separated API_KEYS
+VALID_API_KEYS = frozenset(
+    key.strip()
+    for key in [API_KEY or "", *os.getenv("API_KEYS", "").split(",")]
+    if key.strip()
+)
+
+if not VALID_API_KEYS:
     print("Warning: API_KEY environment variable not set. API endpoints won't be protected!")
 
 # Create API key header requirement
@@ -21,7 +28,7 @@ async def get_api_key(
     api_key_header: str = Security(api_key_header),
 ) -> Optional[str]:
     """Validate the API key provided in the header."""
-    if not API_KEY:
+    if not VALID_API_KEYS:
         return None
         
     if not api_key_header:
@@ -31,7 +38,7 @@ async def get_api_key(
             headers={"WWW-Authenticate": API_KEY_NAME},
         )
         
-    if api_key_header != API_KEY:
+    if api_key_header not in VALID_API_KEYS:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key. The provided key is not recognized.",
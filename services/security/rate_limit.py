@@ -0,0 +1,57 @@
+from fastapi import HTTPException, Request, status
+from cachetools import TTLCache
+import threading
+import time
+from typing import Callable, Optional
+
+class RateLimiter:
+    """Fixed-window request counter, kept in memory per process"""
+
+    def __init__(self, limit: int, window_seconds: int, maxsize: int = 10_000):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        # Entries outlive their window by at most one window, then drop out of the cache
+        self._windows = TTLCache(maxsize=maxsize, ttl=window_seconds)
+        self._lock = threading.Lock()
+
+    def hit(self, key: str) -> Optional[int]:
+        """
+        Count one request for key
+
+        Returns:
+            None if the request is allowed, otherwise the seconds until the window resets
+        """
+        now = time.monotonic()
+        with self._lock:
+            window_start, count = self._windows.get(key, (now, 0))
+            if now - window_start >= self.window_seconds:
+                window_start, count = now, 0
+            if count >= self.limit:
+                return max(1, int(window_start + self.window_seconds - now + 1))
+            self._windows[key] = (window_start, count + 1)
+        return None
+
+# OTP sends trigger an email and a database write, so each email address gets a few per
+# minute. Per-client limits are looser because a campus network puts many students behind
+# one IP. Verification attempts are capped so codes cannot be guessed quickly.
+otp_send_limiter = RateLimiter(limit=3, window_seconds=60)
+otp_client_limiter = RateLimiter(limit=20, window_seconds=60)
+otp_verify_limiter = RateLimiter(limit=30, window_seconds=60)
+
+def enforce_rate_limit(limiter: RateLimiter, key: str) -> None:
+    """Raise 429 if key has used up its requests for the current window"""
+    retry_after = limiter.hit(key)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many requests. Please try again in {retry_after} seconds.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+def limit_by_client(limiter: RateLimiter, scope: str) -> Callable[[Request], None]:
+    """Create a dependency that rate limits an endpoint per client IP"""
+    def client_rate_limit(request: Request) -> None:
+        client_host = request.client.host if request.client else "unknown"
+        enforce_rate_limit(limiter, f"{scope}:ip:{client_host}")
+
+    return client_rate_limit
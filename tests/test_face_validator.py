@@ -0,0 +1,35 @@
+import io
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from services.face.validator import downscale_face_image
+
+
+def exif_rotated_jpeg(width, height, orientation):
+    """JPEG stored as width x height with an EXIF orientation tag"""
+    image = Image.fromarray(np.random.default_rng(0).integers(0, 255, (height, width, 3), np.uint8))
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+def decoded_shape(image_bytes):
+    return cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR).shape
+
+
+def test_downscale_keeps_aspect_ratio_of_exif_rotated_image():
+    # Stored landscape, displayed (and decoded by OpenCV) as an 800x1600 portrait
+    image_bytes = exif_rotated_jpeg(1600, 800, orientation=6)
+    assert decoded_shape(image_bytes) == (1600, 800, 3)
+
+    assert decoded_shape(downscale_face_image(image_bytes, max_side=640)) == (640, 320, 3)
+
+
+def test_downscale_leaves_small_images_unchanged():
+    image_bytes = exif_rotated_jpeg(400, 200, orientation=6)
+
+    assert downscale_face_image(image_bytes, max_side=640) is image_bytes